@@ -0,0 +1,216 @@
+#!/usr/bin/env python3
+"""
+🔔 ALERT PIPELINE - Fingerprints, Deduplizierung und Sturm-Unterdrückung
+Jeder Alert bekommt einen Fingerprint aus Typ, Betreff und Schweregrad. Ein
+Vorfall feuert einmal (firing), Wiederholungen werden unterdrückt, lang
+anhaltende Vorfälle melden sich in Abständen erneut (still_firing). Erledigt
+(resolved) ist ein Vorfall erst, wenn der Check, der ihn gemeldet hat, wieder
+gelaufen ist, ohne ihn zu melden - und er seit mindestens einem Fenster nicht
+mehr gesehen wurde. Einmal-Events ohne Check (source=None) werden nie als
+erledigt gemeldet, sondern nach dem Fenster still vergessen, damit eine
+Wiederholung erneut feuert. Sinks (Log, Report, Slack) sehen nur diese
+Übergänge; der Verlauf liegt in einem Ring-Buffer fester Größe.
+"""
+
+import sys
+import json
+import time
+import hashlib
+import threading
+import urllib.request
+from collections import deque, Counter
+
+FIRING = 'firing'
+STILL_FIRING = 'still_firing'
+RESOLVED = 'resolved'
+
+# Felder, die den Betreff eines Alerts bestimmen (erstes vorhandenes gewinnt)
+SUBJECT_FIELDS = ('subject', 'pid', 'file', 'ip', 'resource', 'path')
+
+
+def fingerprint(alert):
+    """Stabiler Schlüssel aus Typ, Betreff und Schweregrad (Messwerte zählen nicht)"""
+    subject = ''
+    for field in SUBJECT_FIELDS:
+        if alert.get(field) is not None:
+            subject = f"{field}={alert[field]}"
+            if field == 'pid' and alert.get('cmd'):
+                subject += f"|{alert['cmd'][:100]}"  # PID-Wiederverwendung: anderer Prozess, neuer Vorfall
+            break
+    key = f"{alert.get('type', 'UNKNOWN')}|{subject}|{alert.get('severity', '')}"
+    return hashlib.sha1(key.encode('utf-8', 'replace')).hexdigest()[:16]
+
+
+class Incident:
+    """Zustand eines Fingerprints, solange er aktiv ist"""
+
+    __slots__ = ('fingerprint', 'alert', 'source', 'first_seen', 'last_seen', 'last_emitted', 'count',
+                 'suppressed')
+
+    def __init__(self, fp, alert, now, source=None):
+        self.fingerprint = fp
+        self.alert = alert
+        self.source = source
+        self.first_seen = now
+        self.last_seen = now
+        self.last_emitted = now
+        self.count = 1
+        self.suppressed = 0
+
+    def event(self, state, now):
+        return dict(self.alert, fingerprint=self.fingerprint, state=state, count=self.count,
+                    suppressed=self.suppressed, first_seen=self.first_seen, last_seen=self.last_seen,
+                    duration=round(now - self.first_seen, 1), timestamp=now)
+
+
+class AlertPipeline:
+    """Alerts rein, Übergänge raus; sinks: callable(events) pro Stapel mit mindestens einem Übergang
+
+    window: Mindestzeit in Sekunden seit der letzten Sichtung, bevor ein Vorfall
+    aufgelöst (Check lief ohne ihn) bzw. ein Einmal-Event vergessen wird.
+    reminder_interval: Abstand der still_firing-Erinnerungen (None = keine).
+    """
+
+    def __init__(self, window=300, reminder_interval=3600, history=1000, sinks=None, clock=time.time):
+        self.window = window
+        self.reminder_interval = reminder_interval
+        self.sinks = list(sinks or [])
+        self.clock = clock
+        self.active = {}
+        self.history = deque(maxlen=history)
+        self.counts = Counter()
+        self._lock = threading.Lock()
+
+    def _forget_oneshots(self, now):
+        """Einmal-Events nach dem Fenster still entfernen (kein resolved: niemand prüft sie erneut)"""
+        for fp, incident in list(self.active.items()):
+            if incident.source is None and now - incident.last_seen >= self.window:
+                del self.active[fp]
+                self.counts['forgotten'] += 1
+
+    def process(self, alerts, source=None, now=None):
+        """Alerts eines Check-Laufs verarbeiten; Rückgabe: ausgelöste Übergänge (leer = alles unterdrückt)
+
+        source: Name des Checks - seine aktiven Vorfälle, die in diesem Lauf fehlen,
+        werden aufgelöst (nach mindestens `window` Sekunden). None = Einmal-Events.
+        """
+        return self.process_runs({source: alerts}, now)
+
+    def process_runs(self, runs, now=None):
+        """Mehrere Check-Läufe ({source: alerts}) als ein Stapel - ein Sink-Aufruf, ein Report"""
+        now = self.clock() if now is None else now
+        with self._lock:
+            self._forget_oneshots(now)
+            events = []
+            for source, alerts in runs.items():
+                self._run(source, alerts, now, events)
+            self._record(events)
+        self._dispatch(events)
+        return events
+
+    def _run(self, source, alerts, now, events):
+        seen = set()
+        for alert in alerts:
+            fp = fingerprint(alert)
+            seen.add(fp)
+            incident = self.active.get(fp)
+            if incident is None:
+                incident = self.active[fp] = Incident(fp, alert, now, source)
+                events.append(incident.event(FIRING, now))
+                continue
+            incident.count += 1
+            incident.last_seen = now
+            incident.alert = alert  # aktuelle Messwerte für Erinnerung/Auflösung
+            if self.reminder_interval is not None and now - incident.last_emitted >= self.reminder_interval:
+                incident.last_emitted = now
+                events.append(incident.event(STILL_FIRING, now))
+            else:
+                incident.suppressed += 1
+                self.counts['suppressed'] += 1
+        if source is not None:
+            # Der Check ist gelaufen: was er nicht mehr meldet, ist erledigt
+            for fp, incident in list(self.active.items()):
+                if incident.source == source and fp not in seen and now - incident.last_seen >= self.window:
+                    del self.active[fp]
+                    events.append(incident.event(RESOLVED, now))
+
+    def expire(self, now=None):
+        """Einmal-Events nach dem Fenster vergessen (z.B. einmal pro Zyklus); löst nichts auf"""
+        now = self.clock() if now is None else now
+        with self._lock:
+            self._forget_oneshots(now)
+
+    def _record(self, events):
+        for event in events:
+            self.history.append(event)
+            self.counts[event['state']] += 1
+
+    def _dispatch(self, events):
+        if not events:
+            return
+        for sink in self.sinks:
+            try:
+                sink(events)
+            except Exception as e:
+                print(f"⚠️  Alert-Sink fehlgeschlagen: {e}", file=sys.stderr)
+
+    def recent(self, limit=100):
+        """Letzte Übergänge (älteste zuerst)"""
+        with self._lock:
+            return list(self.history)[-limit:] if limit else list(self.history)
+
+    def stats(self):
+        with self._lock:
+            return {
+                'active': len(self.active),
+                'firing': self.counts[FIRING],
+                'still_firing': self.counts[STILL_FIRING],
+                'resolved': self.counts[RESOLVED],
+                'suppressed': self.counts['suppressed'],
+                'forgotten': self.counts['forgotten'],
+            }
+
+
+def format_event(event):
+    """Eine Zeile für Log/Konsole mit Zustand und Dauer"""
+    message = event.get('message', 'Unbekannter Alert')
+    if event['state'] == FIRING:
+        return message
+    if event['state'] == STILL_FIRING:
+        return f"Weiterhin aktiv seit {event['duration']:.0f}s ({event['count']}x): {message}"
+    return f"Erledigt nach {event['duration']:.0f}s ({event['count']}x): {message}"
+
+
+def webhook_sink(url, timeout=5):
+    """Sink für Slack-kompatible Webhooks: eine Nachricht pro Stapel von Übergängen"""
+    icons = {FIRING: '🚨', STILL_FIRING: '⏳', RESOLVED: '✅'}
+
+    def send(events):
+        text = '\n'.join(f"{icons[e['state']]} {format_event(e)}" for e in events)
+        request = urllib.request.Request(url, data=json.dumps({'text': text}).encode('utf-8'),
+                                         headers={'Content-Type': 'application/json'})
+        urllib.request.urlopen(request, timeout=timeout).close()
+    return send
+
+
+def benchmark(cycles=2880, processes=5):
+    """Ein Tag mit 30-s-Zyklen und dauerhaft auffälligen Prozessen: Übergänge statt Alerts"""
+    clock = [0.0]
+    pipeline = AlertPipeline(clock=lambda: clock[0])
+    alerts = [{'type': 'SUSPICIOUS_PROCESS', 'severity': 'ALERT', 'pid': str(1000 + i),
+               'cmd': f'/tmp/miner{i}', 'message': f'Verdächtiger Prozess {i}'} for i in range(processes)]
+    start = time.perf_counter()
+    transitions = 0
+    for cycle in range(cycles):
+        clock[0] = cycle * 30.0
+        transitions += len(pipeline.process(alerts, source='processes'))
+    elapsed = time.perf_counter() - start
+    print(f"🔔 {cycles * processes:,} Alerts in {cycles} Zyklen -> {transitions} Übergänge "
+          f"({elapsed / (cycles * processes) * 1e6:.1f} µs pro Alert), {pipeline.stats()}")
+
+
+if __name__ == "__main__":
+    if len(sys.argv) > 1 and sys.argv[1] == 'bench':
+        benchmark()
+    else:
+        print("Usage: python3 alert_pipeline.py bench")
@@ -0,0 +1,192 @@
+#!/usr/bin/env python3
+"""
+📏 CHECK OVERHEAD - Eigenverbrauch der Monitore pro Check
+Wall-Zeit, CPU-Zeit (inkl. beendeter Kindprozesse), Forks (Audit-Hook),
+Syscalls (/proc/self/io, sonst Kontextwechsel) und RSS-Delta pro Check;
+CPU-Anteil des eigenen Prozesses an einem Kern über ein gleitendes Fenster
+(Grundlage für den Budget-Modus im CheckScheduler)
+"""
+
+import os
+import sys
+import json
+import time
+import resource
+import threading
+from collections import deque
+from contextlib import contextmanager
+
+_FORK_EVENTS = frozenset({
+    'subprocess.Popen', 'os.fork', 'os.forkpty', 'os.posix_spawn', 'os.posix_spawnp',
+    'os.system', 'os.spawn'
+})
+_forks = [0]
+_hook_lock = threading.Lock()
+_hook_installed = False
+_PAGE_KB = os.sysconf('SC_PAGE_SIZE') // 1024 if hasattr(os, 'sysconf') else 4
+
+
+def _audit(event, args):
+    if event in _FORK_EVENTS:
+        _forks[0] += 1
+
+
+def install_fork_counter():
+    """Audit-Hook einmal pro Prozess registrieren (lässt sich nicht wieder entfernen)"""
+    global _hook_installed
+    with _hook_lock:
+        if not _hook_installed:
+            sys.addaudithook(_audit)
+            _hook_installed = True
+
+
+def fork_count():
+    return _forks[0]
+
+
+def cpu_seconds():
+    """CPU-Zeit des Prozesses inkl. gewarteter Kindprozesse (subprocess.run & Co.)"""
+    t = os.times()
+    return t.user + t.system + t.children_user + t.children_system
+
+
+def syscall_count():
+    """read/write-Syscalls (Linux) bzw. Kontextwechsel als Näherung"""
+    try:
+        with open('/proc/self/io', 'rb') as f:
+            fields = dict(line.split(b':') for line in f.read().splitlines())
+        return int(fields[b'syscr']) + int(fields[b'syscw'])
+    except (OSError, KeyError, ValueError):
+        usage = resource.getrusage(resource.RUSAGE_SELF)
+        return usage.ru_nvcsw + usage.ru_nivcsw
+
+
+def rss_kb():
+    """Aktueller RSS (Linux) bzw. Spitzen-RSS (macOS: ru_maxrss in Bytes)"""
+    try:
+        with open('/proc/self/statm', 'rb') as f:
+            return int(f.read().split()[1]) * _PAGE_KB
+    except (OSError, IndexError, ValueError):
+        peak = resource.getrusage(resource.RUSAGE_SELF).ru_maxrss
+        return peak // 1024 if sys.platform == 'darwin' else peak
+
+
+def _snapshot():
+    return time.perf_counter(), cpu_seconds(), fork_count(), syscall_count(), rss_kb()
+
+
+class OverheadMeter:
+    """Misst Checks (measure) und den CPU-Anteil des Prozesses (usage_percent)"""
+
+    def __init__(self, window=60.0, min_elapsed=5.0):
+        install_fork_counter()
+        self.window = window
+        self.min_elapsed = min_elapsed
+        self.checks = {}
+        self._lock = threading.Lock()
+        self._started = (time.monotonic(), cpu_seconds())
+        self._usage = deque()
+
+    def _entry(self, name):
+        entry = self.checks.get(name)
+        if entry is None:
+            entry = self.checks[name] = {
+                'runs': 0, 'skipped': 0, 'degraded': 0, 'wall': 0.0, 'cpu': 0.0, 'forks': 0,
+                'syscalls': 0, 'rss_delta_kb': 0, 'rss_max_delta_kb': 0, 'last_wall': None, 'last_cpu': None
+            }
+        return entry
+
+    @contextmanager
+    def measure(self, name):
+        before = _snapshot()
+        try:
+            yield
+        finally:
+            after = _snapshot()
+            wall, cpu, forks, syscalls, rss = (a - b for a, b in zip(after, before))
+            with self._lock:
+                entry = self._entry(name)
+                entry['runs'] += 1
+                entry['wall'] += wall
+                entry['cpu'] += cpu
+                entry['forks'] += forks
+                entry['syscalls'] += syscalls
+                entry['rss_delta_kb'] = rss
+                entry['rss_max_delta_kb'] = max(entry['rss_max_delta_kb'], rss)
+                entry['last_wall'] = wall
+                entry['last_cpu'] = cpu
+
+    def note(self, name, field):
+        """'skipped' oder 'degraded' für einen Check zählen (Budget-Modus)"""
+        with self._lock:
+            self._entry(name)[field] += 1
+
+    def usage_percent(self):
+        """CPU des eigenen Prozesses in % eines Kerns über die letzten `window` Sekunden
+        (bis das Fenster gefüllt ist: seit Start; vor `min_elapsed` Sekunden: 0.0)"""
+        now = time.monotonic()
+        cpu = cpu_seconds()
+        with self._lock:
+            self._usage.append((now, cpu))
+            while len(self._usage) > 2 and now - self._usage[1][0] >= self.window:
+                self._usage.popleft()
+            then, cpu_then = self._usage[0]
+            if now - then < self.window:
+                then, cpu_then = self._started
+        elapsed = now - then
+        if elapsed < self.min_elapsed or elapsed <= 0:
+            return 0.0
+        return (cpu - cpu_then) / elapsed * 100
+
+    def stats(self):
+        """Stats-Oberfläche: Prozess-Gesamtwerte und pro Check Summen/Mittelwerte"""
+        usage = self.usage_percent()
+        uptime = time.monotonic() - self._started[0]
+        with self._lock:
+            checks = {}
+            for name, entry in self.checks.items():
+                runs = entry['runs'] or 1
+                checks[name] = dict(entry, wall=round(entry['wall'], 4), cpu=round(entry['cpu'], 4),
+                                    avg_wall=round(entry['wall'] / runs, 4), avg_cpu=round(entry['cpu'] / runs, 4),
+                                    cpu_share=round(entry['cpu'] / max(uptime, 1e-9) * 100, 3))
+        return {
+            'process': {
+                'pid': os.getpid(),
+                'uptime': round(uptime, 1),
+                'cpu_percent': round(usage, 2),
+                'cpu_percent_total': round((cpu_seconds() - self._started[1]) / max(uptime, 1e-9) * 100, 2),
+                'rss_kb': rss_kb(),
+                'forks': fork_count()
+            },
+            'checks': checks
+        }
+
+    def write(self, path):
+        """Stats atomar als JSON schreiben (für externe Abfrage)"""
+        tmp = f'{path}.tmp'
+        with open(tmp, 'w') as f:
+            json.dump(self.stats(), f, indent=2)
+        os.replace(tmp, path)
+
+
+def format_stats(stats):
+    """Textblock für Konsole und Reports"""
+    process = stats['process']
+    lines = [f"Eigener Overhead: {process['cpu_percent']}% CPU (Fenster), "
+             f"{process['cpu_percent_total']}% seit Start, RSS {process['rss_kb'] / 1024:.1f} MB, "
+             f"{process['forks']} Forks"]
+    for name, entry in sorted(stats['checks'].items(), key=lambda item: -item[1]['cpu']):
+        lines.append(f"  {name:<14} {entry['runs']:>5} Läufe  Ø {entry['avg_wall'] * 1000:>8.1f} ms wall  "
+                     f"Ø {entry['avg_cpu'] * 1000:>8.1f} ms CPU  {entry['forks']:>4} Forks  "
+                     f"{entry['syscalls']:>7} Syscalls  RSS Δ {entry['rss_delta_kb']:>+6} KB"
+                     + (f"  ({entry['skipped']} übersprungen, {entry['degraded']} gedrosselt)"
+                        if entry['skipped'] or entry['degraded'] else ''))
+    return '\n'.join(lines)
+
+
+if __name__ == "__main__":
+    if len(sys.argv) < 2:
+        print("Usage: python3 check_overhead.py <stats.json>")
+        sys.exit(1)
+    with open(sys.argv[1], 'r') as f:
+        print(format_stats(json.load(f)))
@@ -0,0 +1,223 @@
+#!/usr/bin/env python3
+"""
+⏱️ CHECK SCHEDULER - Adaptiver Zeitplan pro Check
+Jeder Check hat eigene Kadenz, Jitter und Priorität; ein Heap (Fälligkeit,
+Priorität) bestimmt den nächsten Lauf. Nach einem Alert wird die Kadenz enger,
+ohne Alerts kehrt sie schrittweise zur Basis zurück; unter Last (Load pro CPU)
+werden niedrig priorisierte Checks seltener ausgeführt. Mit OverheadMeter
+und CPU-Budget: übersteigt der Eigenverbrauch das Budget, werden Checks mit
+niedriger Priorität übersprungen und normale gedrosselt.
+"""
+
+import os
+import sys
+import time
+import heapq
+import random
+import threading
+from contextlib import nullcontext
+
+PRIORITY_CRITICAL = 0  # wird unter Last nicht gebremst
+PRIORITY_NORMAL = 5
+PRIORITY_LOW = 9
+
+
+def host_load():
+    """Load-Average (1 min) pro CPU-Kern; None, wenn nicht verfügbar"""
+    try:
+        return os.getloadavg()[0] / (os.cpu_count() or 1)
+    except OSError:
+        return None
+
+
+class ScheduledCheck:
+    """Zustand eines Checks; interval ist die aktuelle (angepasste) Basis-Kadenz"""
+
+    __slots__ = ('name', 'func', 'base_interval', 'interval', 'min_interval', 'max_interval',
+                 'jitter', 'priority', 'due', 'generation', 'runs', 'alerts', 'errors', 'last_run',
+                 'last_duration')
+
+    def __init__(self, name, func, interval, priority, jitter, min_interval, max_interval):
+        self.name = name
+        self.func = func
+        self.base_interval = interval
+        self.interval = interval
+        self.min_interval = min_interval if min_interval is not None else interval / 4
+        self.max_interval = max_interval if max_interval is not None else interval * 8
+        self.jitter = jitter
+        self.priority = priority
+        self.due = 0.0
+        self.generation = 0
+        self.runs = 0
+        self.alerts = 0
+        self.errors = 0
+        self.last_run = None
+        self.last_duration = None
+
+
+class CheckScheduler:
+    """Führt fällige Checks aus; run() wartet per Event (stop() weckt sofort)
+
+    Ein Check liefert eine Liste von Alerts (oder eine Anzahl); nicht leer
+    heißt: Kadenz um tighten_factor verkürzen (bis min_interval). Ohne Alerts
+    wächst sie um relax_factor zurück bis zur Basis. Zusätzlich wird die
+    Wartezeit mit dem Last-Faktor multipliziert (nur Priorität > 0).
+
+    cpu_budget: Prozent eines Kerns (meter.usage_percent()); darüber werden
+    Checks ab PRIORITY_LOW übersprungen, die übrigen nicht-kritischen laufen
+    mit doppeltem Abstand.
+    """
+
+    def __init__(self, load_probe=host_load, load_threshold=1.0, max_backoff=4.0,
+                 tighten_factor=0.5, relax_factor=1.5, on_error=None, clock=time.monotonic,
+                 meter=None, cpu_budget=None):
+        self.checks = {}
+        self.load_probe = load_probe
+        self.load_threshold = load_threshold
+        self.max_backoff = max_backoff
+        self.tighten_factor = tighten_factor
+        self.relax_factor = relax_factor
+        self.on_error = on_error
+        self.clock = clock
+        self.meter = meter
+        self.cpu_budget = cpu_budget
+        self._heap = []
+        self._seq = 0
+        self._stop = threading.Event()
+        self._random = random.Random()
+
+    def add(self, name, func, interval, priority=PRIORITY_NORMAL, jitter=0.1,
+            min_interval=None, max_interval=None, run_now=True):
+        """Check registrieren; run_now=False: erster Lauf nach einem Intervall"""
+        check = ScheduledCheck(name, func, interval, priority, jitter, min_interval, max_interval)
+        self.checks[name] = check
+        self._schedule(check, 0 if run_now else self._delay(check))
+        return check
+
+    def _schedule(self, check, delay):
+        check.generation += 1
+        check.due = self.clock() + delay
+        self._seq += 1
+        heapq.heappush(self._heap, (check.due, check.priority, self._seq, check.name, check.generation))
+
+    def backoff(self):
+        """Multiplikator aus der Host-Last (1.0 = keine Bremse)"""
+        load = self.load_probe() if self.load_probe else None
+        if load is None or load <= self.load_threshold:
+            return 1.0
+        return min(self.max_backoff, load / self.load_threshold)
+
+    def _delay(self, check):
+        delay = check.interval
+        if check.priority > PRIORITY_CRITICAL:
+            delay *= self.backoff()
+        delay = min(delay, check.max_interval)
+        return delay * (1 + self._random.uniform(-check.jitter, check.jitter))
+
+    def trigger(self, name):
+        """Check sofort fällig machen (z.B. nach einem Alert eines anderen Checks)"""
+        self._schedule(self.checks[name], 0)
+
+    def next_due(self):
+        """Zeitpunkt (clock) des nächsten gültigen Eintrags oder None"""
+        while self._heap:
+            due, _, _, name, generation = self._heap[0]
+            if self.checks.get(name) is not None and self.checks[name].generation == generation:
+                return due
+            heapq.heappop(self._heap)
+        return None
+
+    def _adapt(self, check, alerts):
+        if alerts:
+            check.alerts += alerts
+            check.interval = max(check.min_interval, check.interval * self.tighten_factor)
+        elif check.interval < check.base_interval:
+            check.interval = min(check.base_interval, check.interval * self.relax_factor)
+
+    def over_budget(self):
+        return (self.cpu_budget is not None and self.meter is not None
+                and self.meter.usage_percent() > self.cpu_budget)
+
+    def run_pending(self):
+        """Alle fälligen Checks (nach Priorität) ausführen; Anzahl der Läufe"""
+        ran = 0
+        while True:
+            due = self.next_due()
+            if due is None or due > self.clock():
+                return ran
+            _, _, _, name, _ = heapq.heappop(self._heap)
+            check = self.checks[name]
+            throttled = check.priority > PRIORITY_CRITICAL and self.over_budget()
+            if throttled and check.priority >= PRIORITY_LOW:
+                self.meter.note(name, 'skipped')
+                self._schedule(check, self._delay(check) * 2)
+                continue
+
+            start = self.clock()
+            try:
+                with self.meter.measure(name) if self.meter else nullcontext():
+                    result = check.func()
+                alerts = result if isinstance(result, int) else len(result or ())
+            except Exception as e:
+                check.errors += 1
+                alerts = 0
+                if self.on_error:
+                    self.on_error(check.name, e)
+            check.runs += 1
+            check.last_run = time.time()
+            check.last_duration = self.clock() - start
+            self._adapt(check, alerts)
+            delay = self._delay(check)
+            if throttled:
+                self.meter.note(name, 'degraded')
+                delay *= 2
+            self._schedule(check, delay)
+            ran += 1
+
+    def run(self, should_run=lambda: True):
+        """Schleife bis stop() oder should_run() False liefert"""
+        self._stop.clear()
+        while should_run() and not self._stop.is_set():
+            self.run_pending()
+            due = self.next_due()
+            timeout = None if due is None else max(0.0, due - self.clock())
+            self._stop.wait(timeout)
+
+    def stop(self):
+        """Aus Signal-Handlern oder anderen Threads aufrufbar"""
+        self._stop.set()
+
+    def stats(self):
+        """Pro Check: aktuelle Kadenz, Läufe, Alerts, Fehler, letzte Dauer"""
+        now = self.clock()
+        return {
+            name: {
+                'interval': round(check.interval, 3),
+                'base_interval': check.base_interval,
+                'priority': check.priority,
+                'runs': check.runs,
+                'alerts': check.alerts,
+                'errors': check.errors,
+                'last_run': check.last_run,
+                'last_duration': None if check.last_duration is None else round(check.last_duration, 4),
+                'next_in': round(max(0.0, check.due - now), 3)
+            }
+            for name, check in self.checks.items()
+        }
+
+
+if __name__ == "__main__":
+    # Demo: ein Check meldet ab dem 3. Lauf Alerts, die Kadenz zieht an
+    scheduler = CheckScheduler()
+    calls = {'count': 0}
+
+    def flaky():
+        calls['count'] += 1
+        return ['alert'] if 3 <= calls['count'] <= 5 else []
+
+    scheduler.add('flaky', flaky, 0.4, jitter=0.05)
+    scheduler.add('cheap', lambda: [], 0.2, priority=PRIORITY_CRITICAL, jitter=0.0)
+    deadline = time.monotonic() + float(sys.argv[1] if len(sys.argv) > 1 else 4)
+    scheduler.run(lambda: time.monotonic() < deadline)
+    for name, info in scheduler.stats().items():
+        print(f"⏱️  {name:<6} {info['runs']:>3} Läufe, {info['alerts']} Alerts, Kadenz {info['interval']}s")
@@ -0,0 +1,468 @@
+#!/usr/bin/env python3
+"""
+🔬 CONTENT SCANNER - Inhalts-Signaturen (YARA-artig) mit mmap und Ergebnis-Cache
+Regeln aus content_rules.json (literal / hex mit ?? / regex), alle Muster in
+einem gemeinsamen Matcher; Dateien werden per mmap bis zu einer Größengrenze
+durchsucht. Ergebnisse pro (dev, inode, size, mtime_ns, Regelwerk-Version) in
+SQLite - unveränderte Dateien werden nie erneut gelesen. CPU-Budget pro Lauf:
+was nicht mehr passt, bleibt ungecacht und kommt im nächsten Lauf dran.
+Optional: SHA-256 gegen den Index bekannter Schad-Hashes (hash_index.py).
+"""
+
+import os
+import re
+import sys
+import json
+import mmap
+import stat
+import time
+import sqlite3
+import hashlib
+import threading
+
+from fs_walker import ParallelWalker, DEFAULT_EXCLUDES
+from log_signatures import required_literals
+from hash_index import open_index
+
+DEFAULT_RULES_FILE = os.path.join(os.path.dirname(os.path.abspath(__file__)), 'content_rules.json')
+DEFAULT_CACHE_FILE = 'content_scan_cache.sqlite'
+
+# Pseudo-Regel für Treffer im Hash-Index (nicht im Cache gespeichert: der Index
+# ändert sich unabhängig vom Regelwerk, der Digest wird gecacht)
+KNOWN_BAD_HASH = 'known_bad_hash'
+
+SEVERITY_ORDER = {'LOW': 0, 'MEDIUM': 1, 'HIGH': 2, 'CRITICAL': 3}
+
+_SCHEMA = """
+CREATE TABLE IF NOT EXISTS content_cache (
+    dev       INTEGER NOT NULL,
+    ino       INTEGER NOT NULL,
+    size      INTEGER NOT NULL,
+    mtime_ns  INTEGER NOT NULL,
+    version   TEXT NOT NULL,
+    matches   TEXT NOT NULL,
+    seen_at   REAL NOT NULL,
+    sha256    TEXT,
+    PRIMARY KEY (dev, ino)
+) WITHOUT ROWID
+"""
+
+
+def _parse_hex(value):
+    """'4D 5A ?? 00' -> (bytes, None) ohne Wildcards, sonst (Byte-Regex, längste feste Folge)"""
+    digits = value.replace('{', '').replace('}', '').replace(' ', '')
+    if not digits or len(digits) % 2:
+        raise ValueError(f'Ungültiger Hex-String: {value}')
+    tokens = [digits[i:i + 2] for i in range(0, len(digits), 2)]
+    if '??' not in tokens:
+        return bytes.fromhex(digits), None
+    body = b''.join(b'.' if t == '??' else re.escape(bytes.fromhex(t)) for t in tokens)
+    fixed = max((bytes.fromhex(run) for run in ''.join(tokens).split('??')), key=len)
+    return re.compile(body, re.DOTALL), fixed
+
+
+class MultiPatternMatcher:
+    """Alle Muster des Regelwerks, dedupliziert; Suche pro Datei lazy und memoisiert
+
+    Feste Byte-Folgen laufen über mmap.find (memchr-basiert, ohne Kopie).
+    Regexe haben Pflicht-Literale (abgeleitet wie bei den Log-Signaturen oder
+    per "prefilter" in der Regel), die selbst als feste Muster im Matcher
+    stehen - die Regex läuft nur, wenn eines davon in der Datei vorkommt.
+    Jedes Muster wird pro Datei höchstens einmal gesucht, auch wenn mehrere
+    Regeln es verwenden.
+    """
+
+    def __init__(self):
+        self.patterns = []
+        self.requires = []
+        self._index = {}
+
+    def _add(self, key, pattern, requires=None):
+        if key not in self._index:
+            self._index[key] = len(self.patterns)
+            self.patterns.append(pattern)
+            self.requires.append(requires)
+        return self._index[key]
+
+    def add(self, kind, value, nocase=False, prefilter=None):
+        if kind == 'literal':
+            needle = value.encode('utf-8')
+            if not nocase:
+                return self._add(('bytes', needle), needle)
+            return self._add(('literal', value, True), re.compile(re.escape(needle), re.IGNORECASE))
+        if kind == 'hex':
+            pattern, fixed = _parse_hex(value)
+            if fixed is None:
+                return self._add(('bytes', pattern), pattern)
+            requires = [self._add(('bytes', fixed), fixed)] if len(fixed) >= 2 else None
+            return self._add(('hex', value), pattern, requires)
+        if kind == 'regex':
+            if prefilter is None and not nocase:
+                prefilter = required_literals(value, lower=False)
+            requires = [self._add(('bytes', p.encode('utf-8')), p.encode('utf-8'))
+                        for p in prefilter] if prefilter else None
+            pattern = re.compile(value.encode('utf-8'), re.DOTALL | (re.IGNORECASE if nocase else 0))
+            return self._add(('regex', value, nocase), pattern, requires)
+        raise ValueError(f'Unbekannter Muster-Typ: {kind}')
+
+    def is_literal(self, index):
+        return isinstance(self.patterns[index], bytes)
+
+    def search(self, index, buf, end, found):
+        """found(index) liefert (memoisiert) die Treffer der Vorfilter-Literale"""
+        pattern = self.patterns[index]
+        if isinstance(pattern, bytes):
+            return buf.find(pattern, 0, end) != -1
+        requires = self.requires[index]
+        if requires and not any(found(i) for i in requires):
+            return False
+        return pattern.search(buf, 0, end) is not None
+
+
+class ContentRule:
+    __slots__ = ('name', 'severity', 'condition', 'patterns')
+
+    def __init__(self, name, severity, condition, patterns):
+        if severity not in SEVERITY_ORDER:
+            raise ValueError(f'Regel {name}: unbekannter Schweregrad {severity}')
+        if condition not in ('any', 'all') and not (isinstance(condition, int) and 0 < condition <= len(patterns)):
+            raise ValueError(f'Regel {name}: ungültige Bedingung {condition}')
+        if not patterns:
+            raise ValueError(f'Regel {name}: keine Strings definiert')
+        self.name = name
+        self.severity = severity
+        self.condition = condition
+        self.patterns = patterns
+
+    def evaluate(self, found):
+        """found(index) -> bool (memoisiert); kurzschließend"""
+        if self.condition == 'any':
+            return any(found(i) for i in self.patterns)
+        if self.condition == 'all':
+            return all(found(i) for i in self.patterns)
+        needed = self.condition
+        remaining = len(self.patterns)
+        for i in self.patterns:
+            remaining -= 1
+            if found(i):
+                needed -= 1
+                if not needed:
+                    return True
+            elif needed > remaining:
+                return False
+        return False
+
+
+class ContentRuleSet:
+    """Kompiliertes Regelwerk; version = Hash des Regel-Inhalts (Cache-Schlüssel)"""
+
+    def __init__(self, rules_data):
+        self.matcher = MultiPatternMatcher()
+        self.rules = []
+        names = set()
+        for rule in rules_data:
+            name = rule['name']
+            if name in names:
+                raise ValueError(f'Regel doppelt: {name}')
+            names.add(name)
+            patterns = [self.matcher.add(s.get('type', 'literal'), s['value'], s.get('nocase', False),
+                                         s.get('prefilter'))
+                        for s in rule.get('strings', [])]
+            # Günstige Byte-Suchen zuerst, Regexe nur falls noch nötig
+            patterns.sort(key=lambda i: not self.matcher.is_literal(i))
+            self.rules.append(ContentRule(name, rule.get('severity', 'MEDIUM'),
+                                          rule.get('condition', 'any'), patterns))
+        self.by_name = {rule.name: rule for rule in self.rules}
+        canonical = json.dumps(rules_data, sort_keys=True, separators=(',', ':'))
+        self.version = hashlib.sha256(canonical.encode('utf-8')).hexdigest()[:16]
+
+    @classmethod
+    def from_file(cls, path=DEFAULT_RULES_FILE):
+        with open(path, 'r') as f:
+            return cls(json.load(f).get('rules', []))
+
+    def match(self, buf, end):
+        """Namen aller Regeln, die auf buf[:end] zutreffen"""
+        memo = {}
+        matcher = self.matcher
+
+        def found(index):
+            if index not in memo:
+                memo[index] = matcher.search(index, buf, end, found)
+            return memo[index]
+
+        return [rule.name for rule in self.rules if rule.evaluate(found)]
+
+
+class ContentScanCache:
+    """(dev, inode) -> Treffer, gültig solange size, mtime_ns und Regelwerk-Version passen"""
+
+    def __init__(self, path=DEFAULT_CACHE_FILE, batch_size=500):
+        self.path = path
+        self.batch_size = batch_size
+        self._lock = threading.Lock()
+        self._pending = 0
+        self._seen = []
+        self.conn = sqlite3.connect(path, check_same_thread=False)
+        self.conn.execute('PRAGMA journal_mode=WAL')
+        self.conn.execute('PRAGMA synchronous=NORMAL')
+        self.conn.execute(_SCHEMA)
+        try:
+            self.conn.execute('ALTER TABLE content_cache ADD COLUMN sha256 TEXT')  # Caches ohne Digest
+        except sqlite3.OperationalError:
+            pass
+        self.conn.commit()
+
+    def lookup(self, st, version):
+        """(Treffer, sha256 oder None) oder None, wenn nicht (mehr) gültig"""
+        with self._lock:
+            row = self.conn.execute(
+                'SELECT size, mtime_ns, version, matches, sha256 FROM content_cache WHERE dev = ? AND ino = ?',
+                (st.st_dev, st.st_ino)).fetchone()
+            if row is None or row[:3] != (st.st_size, st.st_mtime_ns, version):
+                return None
+            self._seen.append((st.st_dev, st.st_ino))
+            return json.loads(row[3]), row[4]
+
+    def store(self, st, version, matches, sha256=None):
+        with self._lock:
+            self.conn.execute(
+                'INSERT OR REPLACE INTO content_cache (dev, ino, size, mtime_ns, version, matches, seen_at, sha256) '
+                'VALUES (?, ?, ?, ?, ?, ?, ?, ?)',
+                (st.st_dev, st.st_ino, st.st_size, st.st_mtime_ns, version, json.dumps(matches), time.time(),
+                 sha256))
+            self._pending += 1
+            if self._pending >= self.batch_size:
+                self._commit()
+
+    def _commit(self):
+        now = time.time()
+        self.conn.executemany('UPDATE content_cache SET seen_at = ? WHERE dev = ? AND ino = ?',
+                              [(now, dev, ino) for dev, ino in self._seen])
+        self.conn.commit()
+        self._seen = []
+        self._pending = 0
+
+    def prune(self, max_age=30 * 86400):
+        """Einträge gelöschter Dateien: länger als max_age nicht mehr gesehen"""
+        with self._lock:
+            self._commit()
+            removed = self.conn.execute('DELETE FROM content_cache WHERE seen_at < ?',
+                                        (time.time() - max_age,)).rowcount
+            self.conn.commit()
+            return removed
+
+    def close(self):
+        with self._lock:
+            self._commit()
+            self.conn.close()
+
+
+class ContentScanner:
+    """Dateien gegen das Regelwerk prüfen; thread-sicher (für ParallelWalker)
+
+    max_scan_bytes: nur der Anfang größerer Dateien wird durchsucht;
+    max_file_size: größere Dateien werden ganz übersprungen;
+    cpu_budget: CPU-Sekunden des Scanners für diesen Lauf (None = unbegrenzt),
+    summiert aus time.thread_time() pro Datei - parallel laufende Scan-Stufen
+    zählen nicht mit; danach werden nur noch Cache-Treffer geliefert, der Rest
+    gilt als vertagt;
+    hash_index: Dateien bis max_hash_size werden komplett gehasht und gegen
+    den Index bekannter Schad-Hashes geprüft.
+    """
+
+    def __init__(self, ruleset, cache=None, max_scan_bytes=16 * 1024 * 1024,
+                 max_file_size=512 * 1024 * 1024, cpu_budget=None, hash_index=None,
+                 max_hash_size=64 * 1024 * 1024):
+        self.ruleset = ruleset
+        self.cache = cache
+        self.hash_index = hash_index
+        self.max_hash_size = max_hash_size
+        self.max_scan_bytes = max_scan_bytes
+        self.max_file_size = max_file_size
+        self.cpu_budget = cpu_budget
+        self.cpu_used = 0.0  # eigene CPU-Zeit (Summe der Worker-Threads)
+        self._lock = threading.Lock()
+        self.stats = {'files': 0, 'scanned': 0, 'cached': 0, 'deferred': 0, 'too_large': 0,
+                      'truncated': 0, 'errors': 0, 'matched': 0, 'bytes': 0, 'known_bad': 0}
+
+    def _count(self, **deltas):
+        with self._lock:
+            for key, value in deltas.items():
+                self.stats[key] += value
+
+    def budget_exhausted(self):
+        return self.cpu_budget is not None and self.cpu_used >= self.cpu_budget
+
+    def _wants_digest(self, size):
+        return self.hash_index is not None and size <= self.max_hash_size
+
+    def _scan(self, path, size):
+        """(Treffer, sha256 oder None, gelesene Bytes)"""
+        end = min(size, self.max_scan_bytes)
+        with open(path, 'rb') as f:
+            with mmap.mmap(f.fileno(), 0, access=mmap.ACCESS_READ) as mm:
+                sha256 = hashlib.sha256(mm).hexdigest() if self._wants_digest(size) else None
+                return self.ruleset.match(mm, end), sha256, end
+
+    def _with_hash(self, matches, sha256):
+        if sha256 and self.hash_index is not None and sha256 in self.hash_index:
+            self._count(known_bad=1)
+            return matches + [KNOWN_BAD_HASH]
+        return matches
+
+    def scan_file(self, path):
+        """Treffer (Regel-Namen) einer Datei; [] bei nichts, None wenn nicht geprüft"""
+        cpu_start = time.thread_time()
+        try:
+            return self._scan_file(path)
+        finally:
+            elapsed = time.thread_time() - cpu_start
+            with self._lock:
+                self.cpu_used += elapsed
+
+    def _scan_file(self, path):
+        try:
+            st = os.lstat(path)
+        except OSError:
+            self._count(errors=1)
+            return None
+        if not stat.S_ISREG(st.st_mode) or not st.st_size:
+            return None
+        self._count(files=1)
+        if st.st_size > self.max_file_size:
+            self._count(too_large=1)
+            return None
+
+        version = self.ruleset.version
+        if self.cache:
+            cached = self.cache.lookup(st, version)
+            # Ohne gespeicherten Digest neu lesen, sobald ein Hash-Index aktiv ist
+            if cached is not None and (cached[1] or not self._wants_digest(st.st_size)):
+                matches = self._with_hash(cached[0], cached[1])
+                self._count(cached=1, matched=bool(matches))
+                return matches
+        if self.budget_exhausted():
+            self._count(deferred=1)
+            return None
+
+        try:
+            matches, sha256, scanned = self._scan(path, st.st_size)
+        except (OSError, ValueError):
+            self._count(errors=1)
+            return None
+        if self.cache:
+            self.cache.store(st, version, matches, sha256)
+        matches = self._with_hash(matches, sha256)
+        self._count(scanned=1, bytes=scanned, truncated=scanned < st.st_size, matched=bool(matches))
+        return matches
+
+    def indicator(self, path, matches):
+        """Treffer als Malware-Indikator (Format von SecurityScanner)"""
+        rules = [self.ruleset.by_name[name] for name in matches if name in self.ruleset.by_name]
+        severity = max((r.severity for r in rules), key=SEVERITY_ORDER.get, default='MEDIUM')
+        reasons = []
+        if KNOWN_BAD_HASH in matches:
+            severity = 'CRITICAL'
+            reasons.append('Bekannter Schad-Hash')
+        if rules:
+            reasons.append(f"Verdächtiger Inhalt: {', '.join(r.name for r in rules)}")
+        return {'file': path, 'reason': ' + '.join(reasons), 'severity': severity, 'rules': matches}
+
+    def summary(self):
+        stats = dict(self.stats)
+        stats['cpu_seconds'] = round(self.cpu_used, 3)
+        stats['rules_version'] = self.ruleset.version
+        stats['hash_index'] = len(self.hash_index) if self.hash_index is not None else None
+        return stats
+
+
+_rulesets = {}
+
+
+def load_ruleset(path=DEFAULT_RULES_FILE):
+    """Regelwerk pro Datei cachen; neu kompilieren, wenn sich die Datei ändert"""
+    st = os.stat(path)
+    key = (st.st_ino, st.st_size, st.st_mtime_ns)
+    cached = _rulesets.get(path)
+    if cached is None or cached[0] != key:
+        cached = _rulesets[path] = (key, ContentRuleSet.from_file(path))
+    return cached[1]
+
+
+def scan_tree(roots, cpu_budget=None, cache_file=DEFAULT_CACHE_FILE, excludes=None, rules_file=DEFAULT_RULES_FILE,
+              hash_index=None):
+    """Alle Dateien unter den Wurzeln prüfen (ohne Verzeichnis-Cache: jede Datei
+    wird per stat gegen den Inhalts-Cache geprüft, auch in-place geänderte)"""
+    cache = ContentScanCache(cache_file)
+    scanner = ContentScanner(load_ruleset(rules_file), cache, cpu_budget=cpu_budget, hash_index=hash_index)
+
+    def match(directory, name):
+        path = os.path.join(directory, name)
+        matches = scanner.scan_file(path)
+        return scanner.indicator(path, matches) if matches else None
+
+    walker = ParallelWalker(match, excludes=DEFAULT_EXCLUDES if excludes is None else excludes)
+    try:
+        indicators = walker.walk(roots)
+        cache.prune()
+    finally:
+        cache.close()
+    return indicators, scanner.summary(), walker.stats
+
+
+def benchmark(size_mb=64, files=64):
+    """MB/s: ein Durchlauf ohne Cache, ein zweiter komplett aus dem Cache"""
+    import tempfile
+    ruleset = load_ruleset()
+    with tempfile.TemporaryDirectory() as tmp:
+        chunk = os.urandom(1024 * 1024)
+        per_file = max(1, size_mb // files)
+        for i in range(files):
+            with open(os.path.join(tmp, f'blob{i}.bin'), 'wb') as f:
+                for _ in range(per_file):
+                    f.write(chunk)
+        with open(os.path.join(tmp, 'miner.conf'), 'w') as f:
+            f.write('{"url": "stratum+tcp://pool.example:3333", "donate-level": 1}\n')
+
+        cache_file = os.path.join(tmp, 'cache.sqlite')
+        for label in ('kalt', 'Cache'):
+            start = time.perf_counter()
+            indicators, stats, _ = scan_tree([tmp], cache_file=cache_file)
+            elapsed = time.perf_counter() - start
+            print(f"  {label:<6} {stats['bytes'] / 1e6 / max(elapsed, 1e-9):>9,.0f} MB/s gelesen, "
+                  f"{stats['files'] / max(elapsed, 1e-9):>9,.0f} Dateien/s  "
+                  f"{stats['scanned']} gelesen, {stats['cached']} aus Cache, {len(indicators)} Treffer "
+                  f"in {elapsed:.2f}s (CPU {stats['cpu_seconds']}s)")
+    print(f"🔬 {len(ruleset.rules)} Regeln, {len(ruleset.matcher.patterns)} Muster, "
+          f"{files} Dateien à {per_file} MB")
+
+
+if __name__ == "__main__":
+    args = sys.argv[1:]
+    if args and args[0] == 'bench':
+        benchmark(int(args[1]) if len(args) > 1 else 64)
+        sys.exit(0)
+    if not args or args[0] not in ('scan', 'nightly'):
+        print("Usage: python3 content_scanner.py scan <verzeichnis>... [--budget CPU_SEKUNDEN]")
+        print("       python3 content_scanner.py nightly [--budget CPU_SEKUNDEN]   (/tmp, /var/tmp, ~)")
+        print("       python3 content_scanner.py bench [MB]")
+        sys.exit(1)
+
+    mode, args = args[0], args[1:]
+    budget = None
+    if '--budget' in args:
+        index = args.index('--budget')
+        budget = float(args[index + 1])
+        args = args[:index] + args[index + 2:]
+    if mode == 'nightly':
+        os.nice(10)  # Hintergrund-Lauf: anderen Prozessen den Vortritt lassen
+        args = ['/tmp', '/var/tmp', '~']
+        budget = 300 if budget is None else budget
+
+    indicators, stats, walk = scan_tree(args, cpu_budget=budget, hash_index=open_index())
+    for item in indicators:
+        print(f"  [{item['severity']:<8}] {item['file']}  ({', '.join(item['rules'])})")
+    print(f"🔬 {stats['files']} Dateien: {stats['scanned']} gelesen ({stats['bytes'] / 1e6:.1f} MB), "
+          f"{stats['cached']} aus Cache, {stats['deferred']} vertagt (Budget), {stats['too_large']} zu groß, "
+          f"{stats['matched']} Treffer ({stats['known_bad']} bekannte Schad-Hashes) - CPU {stats['cpu_seconds']}s, {walk['seconds']}s")
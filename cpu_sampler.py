@@ -0,0 +1,150 @@
+#!/usr/bin/env python3
+"""
+📈 CPU SAMPLER - Echte Intervall-CPU% aus Jiffy-Deltas
+`ps aux` liefert nur den Lebenszeit-Durchschnitt; hier zählt nur das letzte Intervall
+"""
+
+import sys
+import time
+
+from proc_sampler import ProcessSnapshot, ProcessSampler
+
+try:
+    import numpy as np
+except ImportError:  # NumPy ist optional, reiner Python-Pfad als Fallback
+    np = None
+
+# (pid << 41) | start_time passt in int64 (start_time < 2^41 Jiffies)
+_KEY_SHIFT = 41
+
+CPU_MODE_LIFETIME = 'lifetime'
+CPU_MODE_INTERVAL = 'interval'
+
+
+class IntervalCpuSampler:
+    """Merkt utime+stime pro (pid, start_time) und rechnet CPU% über das Intervall"""
+
+    def __init__(self, use_numpy=True):
+        self.use_numpy = use_numpy and np is not None
+        self._prev_time = None
+        # NumPy-Pfad: sortierte Schlüssel + Jiffies; Python-Pfad: Dict
+        self._prev_keys = None
+        self._prev_totals = None
+        self._prev = {}
+
+    def reset(self):
+        self._prev_time = None
+        self._prev_keys = None
+        self._prev_totals = None
+        self._prev = {}
+
+    def update(self, snapshot):
+        """Neuer Snapshot mit Intervall-CPU% im Feld `cpu`
+
+        Prozesse ohne Vorgängerwert (erster Zyklus, neu gestartet) behalten
+        ihren Lebenszeit-Wert. ps-Snapshots ohne Jiffies bleiben unverändert.
+        """
+        if snapshot.source != 'proc':
+            return snapshot
+
+        now = snapshot.timestamp
+        interval = now - self._prev_time if self._prev_time is not None else 0.0
+        self._prev_time = now
+
+        if self.use_numpy:
+            cpu = self._update_numpy(snapshot, interval)
+        else:
+            cpu = self._update_python(snapshot, interval)
+
+        if cpu is None:
+            return snapshot
+        return ProcessSnapshot(
+            [p._replace(cpu=c) for p, c in zip(snapshot.processes, cpu)],
+            snapshot.timestamp, snapshot.clk_tck, snapshot.mem_total_kb, snapshot.source
+        )
+
+    def _update_numpy(self, snapshot, interval):
+        procs = snapshot.processes
+        count = len(procs)
+        pids = np.fromiter((p.pid for p in procs), dtype=np.int64, count=count)
+        starts = np.fromiter((p.start_time for p in procs), dtype=np.int64, count=count)
+        totals = np.fromiter((p.utime + p.stime for p in procs), dtype=np.int64, count=count)
+        keys = (pids << _KEY_SHIFT) | starts
+
+        prev_keys = self._prev_keys
+        prev_totals = self._prev_totals
+        order = np.argsort(keys)
+        self._prev_keys = keys[order]
+        self._prev_totals = totals[order]
+
+        if prev_keys is None or interval <= 0 or not len(prev_keys):
+            return None
+
+        idx = np.searchsorted(prev_keys, keys)
+        idx_clipped = np.minimum(idx, len(prev_keys) - 1)
+        matched = prev_keys[idx_clipped] == keys
+
+        lifetime = np.fromiter((p.cpu for p in procs), dtype=np.float64, count=count)
+        delta = np.maximum(totals - prev_totals[idx_clipped], 0)
+        interval_cpu = np.round(delta / snapshot.clk_tck / interval * 100, 1)
+        return np.where(matched, interval_cpu, lifetime).tolist()
+
+    def _update_python(self, snapshot, interval):
+        prev = self._prev
+        current = {}
+        cpu = []
+        scale = 100.0 / snapshot.clk_tck / interval if interval > 0 else 0.0
+
+        for p in snapshot.processes:
+            total = p.utime + p.stime
+            key = (p.pid, p.start_time)
+            current[key] = total
+            old = prev.get(key)
+            if old is None or not scale:
+                cpu.append(p.cpu)
+            else:
+                cpu.append(round(max(total - old, 0) * scale, 1))
+
+        self._prev = current
+        return cpu if prev and scale else None
+
+
+def benchmark(sizes=(1000, 10000, 50000), rounds=5):
+    """Benchmark: NumPy- vs. Python-Pfad auf synthetischen Snapshots"""
+    from proc_sampler import ProcInfo
+
+    print("="*60)
+    print(f"⏱️  INTERVALL-CPU BENCHMARK (NumPy: {'ja' if np is not None else 'nicht installiert'})")
+    print("="*60)
+    for count in sizes:
+        base = [ProcInfo(pid, 1, pid * 10, 'w', 'S', 0, pid % 500, 0, 1024, 2048, 0.5, 0.1, 'w')
+                for pid in range(1, count + 1)]
+        later = [p._replace(utime=p.utime + (p.pid % 7)) for p in base]
+        first = ProcessSnapshot(base, 1000.0)
+        second = ProcessSnapshot(later, 1001.0)
+
+        modes = [('python', False)] + ([('numpy', True)] if np is not None else [])
+        for label, use_numpy in modes:
+            best = None
+            for _ in range(rounds):
+                sampler = IntervalCpuSampler(use_numpy=use_numpy)
+                sampler.update(first)
+                start = time.perf_counter()
+                sampler.update(second)
+                elapsed = time.perf_counter() - start
+                best = elapsed if best is None else min(best, elapsed)
+            print(f"  {count:>6} Prozesse [{label:>6}]: {best * 1000:7.2f} ms")
+    print("="*60)
+
+
+if __name__ == "__main__":
+    if len(sys.argv) > 1 and sys.argv[1] == 'bench':
+        sizes = tuple(int(s) for s in sys.argv[2:]) or (1000, 10000, 50000)
+        benchmark(sizes)
+    else:
+        sampler = ProcessSampler()
+        cpu = IntervalCpuSampler()
+        cpu.update(sampler.sample())
+        time.sleep(1)
+        for proc in cpu.update(sampler.sample()).top(15):
+            print(f"{proc.pid:>7} {proc.cpu:5.1f} {proc.cmd[:100]}")
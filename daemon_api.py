@@ -0,0 +1,457 @@
+#!/usr/bin/env python3
+"""
+🔌 DAEMON API - Lokale Abfrage-Schnittstelle des KI-Sicherheitsmanns
+Unix-Domain-Socket (nur für den eigenen User), asyncio-Server in einem
+Hintergrund-Thread, Protokoll: 4 Byte Länge (big endian) + JSON.
+
+    Anfrage:  {"op": "snapshot"} | {"op": "alerts", "since": 0, "limit": 100}
+              {"op": "metrics", "window": 300} | {"op": "stats"} | {"op": "ping"}
+    Antwort:  {"ok": true, "data": ...} oder {"ok": false, "error": "..."}
+
+Der Daemon veröffentlicht nach jedem Check (publish); die kodierte Antwort wird
+pro Version einmal erzeugt und an alle Leser geteilt. Clients (Monitor, Scanner,
+Ultimate Tool) nutzen den Snapshot statt selbst /proc und /proc/net zu scannen
+und fallen ohne laufenden Daemon auf die lokale Erfassung zurück. Vertraut wird
+nur einem Socket, der dem eigenen User gehört und hinter dem laut
+SO_PEERCRED/LOCAL_PEERPID genau der Prozess aus der PID-Datei (<socket>.pid) steht.
+"""
+
+import os
+import sys
+import json
+import stat
+import time
+import socket
+import struct
+import asyncio
+import threading
+from collections import deque
+from pathlib import Path
+
+from proc_sampler import ProcessSnapshot, ProcInfo, ProcessSampler
+from net_sockets import Connection, read_connections
+
+DEFAULT_SOCKET = os.environ.get(
+    'KI_SICHERHEITSMANN_SOCKET', str(Path.home() / ".ki_sicherheitsmann" / "api.sock"))
+
+_LENGTH = struct.Struct('>I')
+MAX_REQUEST = 64 * 1024
+MAX_RESPONSE = 256 * 1024 * 1024
+
+
+class DaemonUnavailable(Exception):
+    """Kein (vertrauenswürdiger) Daemon erreichbar (Socket fehlt, Timeout, Protokollfehler, fremder Peer)"""
+
+
+def pid_file_for(path):
+    """PID-Datei des Servers neben dem Socket"""
+    return f'{path}.pid'
+
+
+def peer_credentials(sock):
+    """(pid, uid) des Prozesses am anderen Ende eines Unix-Sockets; None, wenn nicht ermittelbar"""
+    if hasattr(socket, 'SO_PEERCRED'):  # Linux: struct ucred {pid, uid, gid}
+        pid, uid, _ = struct.unpack('3i', sock.getsockopt(socket.SOL_SOCKET, socket.SO_PEERCRED,
+                                                          struct.calcsize('3i')))
+        return pid, uid
+    if sys.platform == 'darwin':
+        # SOL_LOCAL = 0; LOCAL_PEERCRED = 1 (struct xucred: version, uid, ...), LOCAL_PEERPID = 2
+        uid = struct.unpack_from('=II', sock.getsockopt(0, 1, 76))[1]
+        pid = struct.unpack('=i', sock.getsockopt(0, 2, 4))[0]
+        return pid, uid
+    return None
+
+
+def encode_frame(obj):
+    body = json.dumps(obj, separators=(',', ':'), default=str).encode('utf-8')
+    return _LENGTH.pack(len(body)) + body
+
+
+def snapshot_to_api(snapshot):
+    """ProcessSnapshot als kompakte Zeilen (Feldnamen einmal statt pro Prozess)"""
+    return {
+        'timestamp': snapshot.timestamp,
+        'clk_tck': snapshot.clk_tck,
+        'mem_total_kb': snapshot.mem_total_kb,
+        'source': snapshot.source,
+        'fields': ProcInfo._fields,
+        'rows': [tuple(p) for p in snapshot],
+    }
+
+
+def snapshot_from_api(data):
+    fields = list(data['fields'])
+    if fields == list(ProcInfo._fields):
+        processes = [ProcInfo(*row) for row in data['rows']]
+    else:  # Daemon mit anderer Version: Felder per Name zuordnen
+        processes = [ProcInfo(**{f: dict(zip(fields, row)).get(f) for f in ProcInfo._fields})
+                     for row in data['rows']]
+    return ProcessSnapshot(processes, data['timestamp'], data['clk_tck'], data['mem_total_kb'], data['source'])
+
+
+def connections_to_api(connections, timestamp=None):
+    return {'timestamp': time.time() if timestamp is None else timestamp,
+            'fields': Connection._fields, 'rows': [tuple(c) for c in connections]}
+
+
+def connections_from_api(data):
+    return [Connection(*row) for row in data['rows']]
+
+
+class ApiState:
+    """Vom Daemon veröffentlichte Daten; Lesen aus dem Server-Thread ohne Kopie
+
+    publish() ersetzt einen Eintrag atomar (neues Tupel), die JSON-Antwort
+    entsteht erst bei der ersten Anfrage und gilt bis zum nächsten publish().
+    """
+
+    def __init__(self, max_alerts=500):
+        self._values = {}
+        self._frames = {}
+        self._lock = threading.Lock()
+        self.alerts = deque(maxlen=max_alerts)
+        self.started = time.time()
+
+    def publish(self, name, value):
+        with self._lock:
+            version = self._values.get(name, (0, None))[0] + 1
+            self._values[name] = (version, value)
+            self._frames.pop(name, None)
+
+    def get(self, name):
+        return self._values.get(name, (0, None))[1]
+
+    def add_alerts(self, alerts):
+        now = time.time()
+        with self._lock:
+            for alert in alerts:
+                self.alerts.append(dict(alert, timestamp=alert.get('timestamp', now)))
+
+    def frame(self, name, build):
+        """Kodierte Antwort für `name`, einmal pro Version gebaut"""
+        version, value = self._values.get(name, (0, None))
+        cached = self._frames.get(name)
+        if cached is not None and cached[0] == version:
+            return cached[1]
+        frame = encode_frame({'ok': True, 'data': build(value)})
+        with self._lock:
+            if self._values.get(name, (0, None))[0] == version:
+                self._frames[name] = (version, frame)
+        return frame
+
+
+class ApiServer:
+    """asyncio-Server auf einem Unix-Socket, läuft in einem eigenen Thread
+
+    handlers: op -> callable(request) -> Antwortdaten (JSON-serialisierbar);
+    'snapshot', 'alerts' und 'ping' sind über ApiState eingebaut.
+    """
+
+    def __init__(self, state, path=DEFAULT_SOCKET, handlers=None):
+        self.state = state
+        self.path = str(path)
+        self.pid_file = pid_file_for(self.path)
+        self.handlers = dict(handlers or {})
+        self.requests = 0
+        self.clients = 0
+        self._loop = None
+        self._server = None
+        self._thread = None
+        self._ready = threading.Event()
+        self._error = None
+
+    def _op_snapshot(self, request):
+        return self.state.frame('snapshot', lambda value: value)
+
+    def _op_alerts(self, request):
+        since = float(request.get('since', 0))
+        limit = int(request.get('limit', 100))
+        alerts = [a for a in list(self.state.alerts) if a['timestamp'] > since]
+        return encode_frame({'ok': True, 'data': alerts[-limit:] if limit > 0 else alerts})
+
+    def _op_ping(self, request):
+        return encode_frame({'ok': True, 'data': {
+            'pid': os.getpid(), 'uptime': round(time.time() - self.state.started, 1),
+            'requests': self.requests, 'clients': self.clients
+        }})
+
+    def _dispatch(self, request):
+        op = request.get('op') if isinstance(request, dict) else None
+        builtin = getattr(self, f'_op_{op}', None) if op in ('snapshot', 'alerts', 'ping') else None
+        if builtin is not None:
+            return builtin(request)
+        handler = self.handlers.get(op)
+        if handler is None:
+            return encode_frame({'ok': False, 'error': f'Unbekannte Operation: {op}'})
+        return encode_frame({'ok': True, 'data': handler(request)})
+
+    async def _client(self, reader, writer):
+        self.clients += 1
+        try:
+            while True:
+                try:
+                    header = await reader.readexactly(_LENGTH.size)
+                except (asyncio.IncompleteReadError, ConnectionError):
+                    return
+                (length,) = _LENGTH.unpack(header)
+                if length > MAX_REQUEST:
+                    writer.write(encode_frame({'ok': False, 'error': 'Anfrage zu groß'}))
+                    await writer.drain()
+                    return
+                try:
+                    request = json.loads(await reader.readexactly(length))
+                    response = self._dispatch(request)
+                except (asyncio.IncompleteReadError, ConnectionError):
+                    return
+                except Exception as e:
+                    response = encode_frame({'ok': False, 'error': str(e)})
+                self.requests += 1
+                writer.write(response)
+                await writer.drain()
+        finally:
+            self.clients -= 1
+            writer.close()
+
+    async def _serve(self):
+        directory = os.path.dirname(self.path)
+        if directory:
+            os.makedirs(directory, exist_ok=True)
+        if os.path.exists(self.path):
+            os.unlink(self.path)  # Reste eines abgestürzten Daemons (PID-Datei verhindert Doppelstart)
+        self._server = await asyncio.start_unix_server(self._client, path=self.path)
+        os.chmod(self.path, 0o600)  # nur der eigene User (umask wäre prozessweit)
+        tmp = f'{self.pid_file}.tmp'
+        with open(os.open(tmp, os.O_WRONLY | os.O_CREAT | os.O_TRUNC, 0o600), 'w') as f:
+            f.write(f'{os.getpid()}\n')
+        os.replace(tmp, self.pid_file)  # Clients prüfen den Peer gegen diese PID
+
+    def _run(self):
+        self._loop = asyncio.new_event_loop()
+        asyncio.set_event_loop(self._loop)
+        try:
+            self._loop.run_until_complete(self._serve())
+        except OSError as e:
+            self._error = e
+            self._ready.set()
+            return
+        self._ready.set()
+        try:
+            self._loop.run_forever()
+        finally:
+            self._server.close()
+            self._loop.run_until_complete(self._server.wait_closed())
+            self._loop.close()
+
+    def start(self):
+        """Server-Thread starten; OSError, wenn der Socket nicht angelegt werden kann"""
+        self._thread = threading.Thread(target=self._run, name='daemon-api', daemon=True)
+        self._thread.start()
+        self._ready.wait()
+        if self._error is not None:
+            raise self._error
+        return self
+
+    def stop(self):
+        if self._loop is not None and self._thread is not None and self._thread.is_alive():
+            self._loop.call_soon_threadsafe(self._loop.stop)
+            self._thread.join(timeout=5)
+        for path in (self.path, self.pid_file):
+            try:
+                os.unlink(path)
+            except OSError:
+                pass
+
+
+def _recv_exact(sock, size):
+    chunks = []
+    while size:
+        chunk = sock.recv(min(size, 1 << 20))
+        if not chunk:
+            raise DaemonUnavailable('Verbindung vom Daemon geschlossen')
+        chunks.append(chunk)
+        size -= len(chunk)
+    return b''.join(chunks)
+
+
+class DaemonClient:
+    """Synchroner Client; die Verbindung wird für weitere Anfragen offen gehalten
+
+    verify: Socket-Datei muss dem eigenen User gehören, der Peer (SO_PEERCRED bzw.
+    LOCAL_PEERPID) dieselbe UID haben und die PID aus der PID-Datei - sonst
+    DaemonUnavailable (ein fremder Prozess könnte den Socket ersetzt haben).
+    """
+
+    def __init__(self, path=DEFAULT_SOCKET, timeout=2.0, verify=True):
+        self.path = str(path)
+        self.timeout = timeout
+        self.verify = verify
+        self.pid_file = pid_file_for(self.path)
+        self._sock = None
+
+    def close(self):
+        if self._sock is not None:
+            self._sock.close()
+            self._sock = None
+
+    def request(self, op, **params):
+        """Antwortdaten oder DaemonUnavailable; Fehler des Daemons als RuntimeError"""
+        try:
+            if self._sock is None:
+                sock = socket.socket(socket.AF_UNIX, socket.SOCK_STREAM)
+                sock.settimeout(self.timeout)
+                sock.connect(self.path)
+                if self.verify:
+                    self._verify_peer(sock)
+                self._sock = sock
+            self._sock.sendall(encode_frame(dict(params, op=op)))
+            (length,) = _LENGTH.unpack(_recv_exact(self._sock, _LENGTH.size))
+            if length > MAX_RESPONSE:
+                raise DaemonUnavailable(f'Antwort zu groß: {length} Bytes')
+            response = json.loads(_recv_exact(self._sock, length))
+        except (OSError, ValueError, DaemonUnavailable) as e:
+            self.close()
+            raise DaemonUnavailable(str(e)) from e
+        if not response.get('ok'):
+            raise RuntimeError(response.get('error', 'Unbekannter Fehler'))
+        return response['data']
+
+    def _verify_peer(self, sock):
+        try:
+            st = os.lstat(self.path)
+            if not stat.S_ISSOCK(st.st_mode) or st.st_uid != os.geteuid():
+                raise DaemonUnavailable(f'Socket gehört nicht dem aktuellen User: {self.path}')
+            credentials = peer_credentials(sock)
+            if credentials is None:
+                raise DaemonUnavailable('Peer-Prüfung auf dieser Plattform nicht möglich')
+            pid, uid = credentials
+            if uid != os.geteuid():
+                raise DaemonUnavailable(f'Peer läuft als UID {uid}')
+            with open(self.pid_file, 'r') as f:
+                expected = int(f.read().strip())
+            if pid != expected:
+                raise DaemonUnavailable(f'Peer-PID {pid} passt nicht zur PID-Datei ({expected})')
+        except DaemonUnavailable:
+            sock.close()
+            raise
+        except (OSError, ValueError) as e:
+            sock.close()
+            raise DaemonUnavailable(f'Peer nicht prüfbar: {e}') from e
+
+
+class DaemonView:
+    """Prozesse/Verbindungen vom Daemon, lokal erfasst, wenn keiner läuft oder die Daten zu alt sind
+
+    Drop-in für ProcessSampler.sample() und net_sockets.read_connections();
+    ein abgerufener Snapshot wird `reuse` Sekunden für weitere Aufrufe genutzt.
+    """
+
+    def __init__(self, sampler=None, client=None, max_age=90.0, reuse=1.0):
+        self.sampler = sampler or ProcessSampler()
+        self.client = client or DaemonClient()
+        self.max_age = max_age
+        self.reuse = reuse
+        self.source = None  # 'daemon' oder 'local' (letzter Abruf)
+        self._cached = None
+        self._fetched = 0.0
+        self._lock = threading.Lock()  # Scanner-Stages fragen parallel
+
+    def _part(self, name):
+        """Teil des Daemon-Snapshots ('processes', 'connections', 'resources'), wenn frisch genug"""
+        with self._lock:
+            now = time.monotonic()
+            if self._cached is None or now - self._fetched >= self.reuse:
+                try:
+                    self._cached = self.client.request('snapshot') or {}
+                except (DaemonUnavailable, RuntimeError):
+                    self._cached = {}
+                self._fetched = now
+            part = self._cached.get(name)
+        if not part or time.time() - part.get('timestamp', 0) > self.max_age:
+            return None
+        return part
+
+    def sample(self):
+        part = self._part('processes')
+        if part is not None:
+            self.source = 'daemon'
+            return snapshot_from_api(part)
+        self.source = 'local'
+        return self.sampler.sample()
+
+    def connections(self, protocols=('tcp', 'tcp6'), states=None, resolve_pids=False):
+        """Wie read_connections(); Daemon liefert tcp/tcp6 ESTABLISHED + LISTEN mit PIDs"""
+        served = self._part('connections')
+        if served and set(protocols) <= {'tcp', 'tcp6'} and states and set(states) <= {'ESTABLISHED', 'LISTEN'}:
+            self.source = 'daemon'
+            return [c for c in connections_from_api(served) if c.proto in protocols and c.state in states]
+        self.source = 'local'
+        return read_connections(protocols=protocols, states=states, resolve_pids=resolve_pids)
+
+
+def benchmark(readers=100, requests_per_reader=50, processes=2000):
+    """Latenz unter `readers` gleichzeitigen Clients (asyncio) gegen einen Server mit synthetischem Snapshot"""
+    import tempfile
+
+    state = ApiState()
+    rows = [ProcInfo(i, 1, i * 10, f'proc{i}', 'S', 1000, i, i, 1024, 4096, 0.5, 0.1,
+                     f'/usr/bin/proc{i} --flag') for i in range(1, processes + 1)]
+    state.publish('snapshot', {
+        'processes': snapshot_to_api(ProcessSnapshot(rows, time.time(), 100, 8 * 1024 * 1024)),
+        'connections': connections_to_api([])
+    })
+    state.add_alerts([{'type': 'HIGH_CPU', 'message': 'Test'}] * 50)
+
+    async def reader(path, op, latencies):
+        r, w = await asyncio.open_unix_connection(path, limit=MAX_RESPONSE)
+        frame = encode_frame({'op': op})
+        for _ in range(requests_per_reader):
+            start = time.perf_counter()
+            w.write(frame)
+            await w.drain()
+            (length,) = _LENGTH.unpack(await r.readexactly(_LENGTH.size))
+            await r.readexactly(length)
+            latencies.append(time.perf_counter() - start)
+        w.close()
+
+    async def run(path, op):
+        latencies = []
+        start = time.perf_counter()
+        await asyncio.gather(*(reader(path, op, latencies) for _ in range(readers)))
+        return latencies, time.perf_counter() - start
+
+    with tempfile.TemporaryDirectory() as tmp:
+        server = ApiServer(state, os.path.join(tmp, 'api.sock')).start()
+        try:
+            for op in ('ping', 'alerts', 'snapshot'):
+                latencies, elapsed = asyncio.run(run(server.path, op))
+                latencies.sort()
+                p = lambda q: latencies[min(len(latencies) - 1, int(q / 100 * len(latencies)))] * 1000
+                print(f"🔌 {op:<9} {readers} Leser x {requests_per_reader}: p50 {p(50):.2f} ms, "
+                      f"p95 {p(95):.2f} ms, p99 {p(99):.2f} ms, {len(latencies) / elapsed:,.0f} Anfragen/s")
+        finally:
+            server.stop()
+
+
+if __name__ == "__main__":
+    if len(sys.argv) > 1 and sys.argv[1] == 'bench':
+        benchmark(int(sys.argv[2]) if len(sys.argv) > 2 else 100)
+        sys.exit(0)
+    if len(sys.argv) < 2 or sys.argv[1] not in ('ping', 'snapshot', 'alerts', 'metrics', 'stats'):
+        print("Usage: python3 daemon_api.py ping|snapshot|alerts|metrics|stats [--socket PFAD] | bench [leser]")
+        sys.exit(1)
+
+    path = sys.argv[sys.argv.index('--socket') + 1] if '--socket' in sys.argv else DEFAULT_SOCKET
+    try:
+        data = DaemonClient(path).request(sys.argv[1])
+    except DaemonUnavailable as e:
+        print(f"❌ KI-Sicherheitsmann nicht erreichbar ({path}): {e}")
+        sys.exit(1)
+    if sys.argv[1] == 'snapshot':
+        snapshot = snapshot_from_api(data['processes'])
+        connections = data.get('connections') or {'rows': []}
+        print(f"🔌 Snapshot von {time.ctime(snapshot.timestamp)}: {len(snapshot)} Prozesse, "
+              f"{len(connections['rows'])} Verbindungen")
+        for proc in snapshot.top(10):
+            print(f"  PID {proc.pid:<7} {proc.cpu:>5.1f}% CPU  {proc.cmd[:70]}")
+    else:
+        print(json.dumps(data, indent=2, ensure_ascii=False))
@@ -0,0 +1,236 @@
+#!/usr/bin/env python3
+"""
+📝 EVENT LOG - Gepuffertes, strukturiertes Event-Log (JSON-Lines)
+Queue + Hintergrund-Flusher, ein JSON-Objekt pro Zeile, Rotation nach Größe
+oder Alter mit gzip-Kompression, Flush bei SIGTERM; Leser nach Zeitbereich
+"""
+
+import os
+import sys
+import json
+import glob
+import gzip
+import time
+import atexit
+import shutil
+import signal
+import threading
+from collections import deque
+from datetime import datetime
+
+# Mikrosekunden halten Namen eindeutig und chronologisch sortierbar
+_ROTATED_FORMAT = '%Y%m%d-%H%M%S-%f'
+
+
+class EventLog:
+    """Nimmt Events ohne Datei-I/O entgegen; ein Thread schreibt gebündelt
+
+    write() hängt nur an eine deque an (keine Locks) und ist damit auch aus
+    Signal-Handlern sicher aufrufbar.
+    """
+
+    def __init__(self, path, max_bytes=10 * 1024 * 1024, max_age=86400, backups=5,
+                 flush_interval=1.0, queue_size=10000, compress=True):
+        self.path = str(path)
+        self.max_bytes = max_bytes
+        self.max_age = max_age
+        self.backups = backups
+        self.flush_interval = flush_interval
+        self.compress = compress
+        self.dropped = 0
+        self.written = 0
+        self.queue_size = queue_size
+        self._buffer = deque()
+        self._wake = threading.Event()
+        self._file = None
+        self._opened_at = None
+        self._closed = False
+        self._thread = threading.Thread(target=self._run, name='event-log', daemon=True)
+        self._thread.start()
+        atexit.register(self.close)
+
+    def write(self, level, message, data=None, **fields):
+        """Event einreihen (blockiert nie; bei voller Queue wird verworfen und gezählt)"""
+        now = time.time()
+        event = {
+            'ts': now,
+            'timestamp': datetime.fromtimestamp(now).isoformat(),
+            'level': level,
+            'message': message
+        }
+        if data is not None:
+            event['data'] = data
+        event.update(fields)
+        if len(self._buffer) >= self.queue_size:
+            self.dropped += 1
+            return
+        self._buffer.append(event)
+
+    def flush(self, timeout=5.0):
+        """Warten, bis alle bisher eingereihten Events auf der Platte sind"""
+        if self._closed or not self._thread.is_alive():
+            return False
+        done = threading.Event()
+        self._buffer.append(done)
+        self._wake.set()
+        return done.wait(timeout)
+
+    def close(self):
+        if self._closed:
+            return
+        self._buffer.append(None)
+        self._wake.set()
+        self._thread.join(timeout=10)
+        self._closed = True
+
+    def _open(self):
+        directory = os.path.dirname(self.path)
+        if directory:
+            os.makedirs(directory, exist_ok=True)
+        self._file = open(self.path, 'a', encoding='utf-8')
+        self._opened_at = time.time()
+        # Alter eines bestehenden Logs: Zeitstempel des ersten Events
+        if self._file.tell():
+            try:
+                with open(self.path, 'r', encoding='utf-8') as f:
+                    self._opened_at = json.loads(f.readline())['ts']
+            except (OSError, ValueError, KeyError, TypeError):
+                pass
+
+    def _rotate(self):
+        self._file.close()
+        self._file = None
+        rotated = f"{self.path}.{datetime.now().strftime(_ROTATED_FORMAT)}"
+        os.replace(self.path, rotated)
+        if self.compress:
+            with open(rotated, 'rb') as src, gzip.open(rotated + '.gz', 'wb') as dst:
+                shutil.copyfileobj(src, dst)
+            os.unlink(rotated)
+        old_files = rotated_files(self.path)
+        for old in old_files[:max(0, len(old_files) - self.backups)]:
+            os.unlink(old)
+
+    def _write_batch(self, events):
+        if self._file is None:
+            self._open()
+        self._file.write(''.join(
+            json.dumps(e, ensure_ascii=False, default=str) + '\n' for e in events))
+        self._file.flush()
+        self.written += len(events)
+        if self._file.tell() >= self.max_bytes or (
+                self.max_age and time.time() - self._opened_at >= self.max_age):
+            self._rotate()
+
+    def _run(self):
+        stop = False
+        while not stop:
+            self._wake.wait(self.flush_interval)
+            self._wake.clear()
+            items = []
+            while self._buffer:
+                items.append(self._buffer.popleft())
+
+            events = [item for item in items if isinstance(item, dict)]
+            if events:
+                try:
+                    self._write_batch(events)
+                except OSError as e:
+                    self.dropped += len(events)
+                    print(f"⚠️  Event-Log nicht schreibbar ({self.path}): {e}", file=sys.stderr)
+            for item in items:
+                if item is None:
+                    stop = True
+                elif isinstance(item, threading.Event):
+                    item.set()
+        if self._file is not None:
+            self._file.close()
+            self._file = None
+
+
+def flush_on_signals(signals=(signal.SIGTERM,)):
+    """SIGTERM mit Default-Aktion (sofortiges Ende ohne Aufräumen) in SystemExit
+    umwandeln - finally-Blöcke und atexit leeren dann das Log"""
+    for signum in signals:
+        if signal.getsignal(signum) == signal.SIG_DFL:
+            signal.signal(signum, lambda sig, frame: sys.exit(128 + sig))
+
+
+def rotated_files(path):
+    """Rotierte Logs eines Pfads, älteste zuerst"""
+    return sorted(glob.glob(glob.escape(str(path)) + '.[0-9]*'))
+
+
+def _rotated_at(path, base):
+    stamp = path[len(str(base)) + 1:].split('.')[0]
+    try:
+        return datetime.strptime(stamp, _ROTATED_FORMAT).timestamp()
+    except ValueError:
+        return None
+
+
+def read_events(path, start=None, end=None, levels=None):
+    """Events (älteste zuerst) aus aktuellem und rotierten Logs streamen
+
+    start/end: Unix-Zeit oder datetime; Nicht-JSON-Zeilen (Alt-Format) werden übersprungen.
+    """
+    if isinstance(start, datetime):
+        start = start.timestamp()
+    if isinstance(end, datetime):
+        end = end.timestamp()
+
+    files = rotated_files(path) + [str(path)]
+    for file_path in files:
+        rotated_at = _rotated_at(file_path, path) if file_path != str(path) else None
+        # Datei wurde vor `start` rotiert: enthält nur ältere Events
+        if start is not None and rotated_at is not None and rotated_at < start:
+            continue
+        opener = gzip.open if file_path.endswith('.gz') else open
+        try:
+            with opener(file_path, 'rt', encoding='utf-8', errors='replace') as f:
+                for line in f:
+                    try:
+                        event = json.loads(line)
+                        ts = event['ts']
+                    except (ValueError, KeyError, TypeError):
+                        continue
+                    if start is not None and ts < start:
+                        continue
+                    if end is not None and ts > end:
+                        return
+                    if levels and event.get('level') not in levels:
+                        continue
+                    yield event
+        except FileNotFoundError:
+            continue
+
+
+def _parse_time(value):
+    try:
+        return float(value)
+    except ValueError:
+        return datetime.fromisoformat(value).timestamp()
+
+
+if __name__ == "__main__":
+    if len(sys.argv) < 2:
+        print("Usage: python3 event_log.py <logfile> [--since ZEIT] [--until ZEIT] [--level LEVEL]...")
+        print("       ZEIT = ISO-Datum (2024-01-31T12:00) oder Unix-Zeit")
+        sys.exit(1)
+
+    args = sys.argv[2:]
+    since = until = None
+    levels = set()
+    while args:
+        option, value, args = args[0], args[1] if len(args) > 1 else '', args[2:]
+        if option == '--since':
+            since = _parse_time(value)
+        elif option == '--until':
+            until = _parse_time(value)
+        elif option == '--level':
+            levels.add(value.upper())
+
+    try:
+        for event in read_events(sys.argv[1], since, until, levels):
+            print(json.dumps(event, ensure_ascii=False))
+    except BrokenPipeError:
+        pass
@@ -0,0 +1,266 @@
+#!/usr/bin/env python3
+"""
+👁️ FILE WATCHER - Ereignisgesteuerte Überwachung kritischer Dateien
+Linux inotify (ctypes); Fallback: stat-only Polling für Dateisysteme ohne inotify
+"""
+
+import os
+import sys
+import time
+import glob
+import ctypes
+import ctypes.util
+import select
+import struct
+
+# linux/inotify.h
+IN_MODIFY = 0x00000002
+IN_ATTRIB = 0x00000004
+IN_CLOSE_WRITE = 0x00000008
+IN_MOVED_FROM = 0x00000040
+IN_MOVED_TO = 0x00000080
+IN_CREATE = 0x00000100
+IN_DELETE = 0x00000200
+IN_DELETE_SELF = 0x00000400
+IN_MOVE_SELF = 0x00000800
+IN_Q_OVERFLOW = 0x00004000
+IN_IGNORED = 0x00008000
+IN_ONLYDIR = 0x01000000
+IN_NONBLOCK = 0o4000
+IN_CLOEXEC = 0o2000000
+
+_WATCH_MASK = (IN_MODIFY | IN_ATTRIB | IN_CLOSE_WRITE | IN_MOVED_FROM | IN_MOVED_TO |
+               IN_CREATE | IN_DELETE | IN_DELETE_SELF | IN_MOVE_SELF | IN_ONLYDIR)
+_EVENT = struct.Struct('iIII')
+
+CRITICAL_PATHS = [
+    '/etc/hosts',
+    '/etc/passwd',
+    '/etc/sudoers',
+    '~/.ssh/*',
+    '~/.bashrc',
+    '~/.bash_profile',
+    '~/.profile',
+    '~/.zshrc',
+    '~/.zprofile',
+]
+
+
+def critical_paths(extra=()):
+    """Kritische Pfade + konfigurierte Zusatzpfade (expandiert, `dir/*` bleibt Muster)"""
+    paths = []
+    for path in list(CRITICAL_PATHS) + list(extra):
+        expanded = os.path.expanduser(path)
+        if expanded not in paths:
+            paths.append(expanded)
+    return paths
+
+
+def expand_paths(paths):
+    """Muster (`dir/*`) zu aktuell existierenden Dateien auflösen"""
+    files = []
+    for path in paths:
+        if path.endswith('/*'):
+            files.extend(sorted(p for p in glob.glob(path) if os.path.isfile(p)))
+        elif os.path.isfile(path):
+            files.append(path)
+    return files
+
+
+class _CoalescingMixin:
+    """Sammelt Änderungen und gibt sie erst nach `coalesce_window` Ruhe frei"""
+
+    def _init_pending(self, coalesce_window):
+        self.coalesce_window = coalesce_window
+        self._pending = {}
+
+    def _mark(self, path, now):
+        self._pending[path] = now
+
+    def _release(self, now):
+        ready = {p for p, t in self._pending.items() if now - t >= self.coalesce_window}
+        for path in ready:
+            del self._pending[path]
+        return ready
+
+    def changes(self, timeout=0.0):
+        """Geänderte Pfade seit dem letzten Aufruf (wartet höchstens `timeout` Sekunden)"""
+        deadline = time.monotonic() + timeout
+        while True:
+            self._collect()
+            now = time.monotonic()
+            ready = self._release(now)
+            if ready or now >= deadline:
+                return ready
+            wait = deadline - now
+            if self._pending:
+                wait = min(wait, self.coalesce_window)
+            self._wait(wait)
+
+
+class InotifyWatcher(_CoalescingMixin):
+    """inotify auf den Elternverzeichnissen (überlebt atomare Rename-Writes von Editoren)"""
+
+    name = 'inotify'
+
+    def __init__(self, paths, coalesce_window=0.5):
+        self._init_pending(coalesce_window)
+        libc = ctypes.CDLL(ctypes.util.find_library('c') or None, use_errno=True)
+        self._add_watch = libc.inotify_add_watch
+        self._add_watch.argtypes = [ctypes.c_int, ctypes.c_char_p, ctypes.c_uint32]
+        self._rm_watch = libc.inotify_rm_watch
+        self._rm_watch.argtypes = [ctypes.c_int, ctypes.c_int]
+        self.fd = libc.inotify_init1(IN_NONBLOCK | IN_CLOEXEC)
+        if self.fd < 0:
+            raise OSError(ctypes.get_errno(), 'inotify_init1 fehlgeschlagen')
+
+        self.paths = list(paths)
+        # Verzeichnis -> (Dateinamen oder None für "alle Dateien")
+        self._interest = {}
+        for path in self.paths:
+            directory, name = os.path.split(path)
+            names = self._interest.setdefault(directory, set())
+            if names is not None:
+                if name == '*':
+                    self._interest[directory] = None
+                else:
+                    names.add(name)
+        self._wd_dirs = {}
+        # Fehlende Verzeichnisse (z.B. ~/.ssh) über ihr Elternverzeichnis abwarten
+        self._awaiting = {}
+        for directory in self._interest:
+            self._watch(directory)
+
+    def _watch(self, directory):
+        wd = self._add_watch(self.fd, os.fsencode(directory), _WATCH_MASK)
+        if wd >= 0:
+            self._wd_dirs[wd] = directory
+            return True
+        parent, name = os.path.split(directory)
+        if parent and parent != directory:
+            self._awaiting.setdefault(parent, set()).add(name)
+            if parent not in self._wd_dirs.values():
+                self._watch(parent)
+        return False
+
+    def _mark_paths(self, paths, now):
+        """Existierende Dateien und konkrete (evtl. gelöschte) Pfade als geändert melden"""
+        for path in expand_paths(paths) + [p for p in paths if not p.endswith('/*')]:
+            self._mark(path, now)
+
+    def _rewatch(self, wd, directory, now):
+        """Verzeichnis gelöscht/verschoben: neu beobachten (oder über das Elternverzeichnis abwarten)"""
+        del self._wd_dirs[wd]
+        self._rm_watch(self.fd, wd)  # bei IN_MOVE_SELF hängt der Watch noch am alten Inode
+        self._watch(directory)
+        # Weg (verschoben) oder schon neu angelegt: alle Pfade darin neu prüfen lassen
+        self._mark_paths([p for p in self.paths if os.path.dirname(p) == directory], now)
+
+    def close(self):
+        if self.fd >= 0:
+            os.close(self.fd)
+            self.fd = -1
+
+    def _wait(self, timeout):
+        select.select([self.fd], [], [], max(timeout, 0))
+
+    def _collect(self):
+        now = time.monotonic()
+        while True:
+            try:
+                data = os.read(self.fd, 65536)
+            except BlockingIOError:
+                return
+            offset = 0
+            while offset + _EVENT.size <= len(data):
+                wd, mask, _, length = _EVENT.unpack_from(data, offset)
+                name = data[offset + _EVENT.size:offset + _EVENT.size + length].rstrip(b'\0')
+                offset += _EVENT.size + length
+
+                if mask & IN_Q_OVERFLOW:
+                    # Events verloren: alles als geändert melden
+                    self._mark_paths(self.paths, now)
+                    continue
+                directory = self._wd_dirs.get(wd)
+                if directory is None:
+                    continue
+                if mask & (IN_IGNORED | IN_DELETE_SELF | IN_MOVE_SELF):
+                    self._rewatch(wd, directory, now)
+                    continue
+                name = os.fsdecode(name)
+
+                awaited = self._awaiting.get(directory)
+                if awaited and name in awaited and mask & (IN_CREATE | IN_MOVED_TO):
+                    child = os.path.join(directory, name)
+                    if self._watch(child):
+                        awaited.discard(name)
+                        for path in expand_paths([p for p in self.paths if p.startswith(child + '/')]):
+                            self._mark(path, now)
+
+                names = self._interest.get(directory, set())
+                if not name or (names is not None and name not in names):
+                    continue
+                self._mark(os.path.join(directory, name), now)
+
+
+class PollingWatcher(_CoalescingMixin):
+    """stat-only Fallback: vergleicht (ino, size, mtime_ns, ctime_ns), kein Lesen"""
+
+    name = 'polling'
+
+    def __init__(self, paths, poll_interval=2.0, coalesce_window=0.0):
+        self._init_pending(coalesce_window)
+        self.paths = list(paths)
+        self.poll_interval = poll_interval
+        self._last_poll = 0.0
+        self._stats = self._stat_all()
+
+    def _stat_all(self):
+        stats = {}
+        for path in expand_paths(self.paths):
+            try:
+                st = os.stat(path)
+                stats[path] = (st.st_ino, st.st_size, st.st_mtime_ns, st.st_ctime_ns)
+            except OSError:
+                continue
+        return stats
+
+    def close(self):
+        pass
+
+    def _wait(self, timeout):
+        time.sleep(max(0.0, min(timeout, self.poll_interval)))
+
+    def _collect(self):
+        now = time.monotonic()
+        if now - self._last_poll < self.poll_interval:
+            return
+        self._last_poll = now
+        current = self._stat_all()
+        for path in set(current) | set(self._stats):
+            if current.get(path) != self._stats.get(path):
+                self._mark(path, now)
+        self._stats = current
+
+
+def open_watcher(paths, coalesce_window=0.5):
+    """inotify wenn verfügbar, sonst stat-Polling"""
+    if sys.platform.startswith('linux'):
+        try:
+            return InotifyWatcher(paths, coalesce_window)
+        except (OSError, AttributeError):
+            pass
+    return PollingWatcher(paths)
+
+
+if __name__ == "__main__":
+    watcher = open_watcher(critical_paths(sys.argv[1:]))
+    print(f"👁️  Überwache {len(watcher.paths)} Pfade ({watcher.name}) - Ctrl+C zum Beenden")
+    try:
+        while True:
+            for path in sorted(watcher.changes(timeout=5.0)):
+                print(f"  ✏️  {path}")
+    except KeyboardInterrupt:
+        pass
+    finally:
+        watcher.close()
@@ -0,0 +1,191 @@
+#!/usr/bin/env python3
+"""
+🗂️ FS WALKER - Paralleler, änderungsbewusster Verzeichnis-Scan
+os.scandir in einem Thread-Pool, (dev, inode)-Schleifenschutz, Ausschluss-Muster;
+persistenter mtime-Cache pro Verzeichnis: unveränderte Verzeichnisse werden
+nicht neu gelistet, ihre Treffer kommen aus dem Cache
+"""
+
+import os
+import sys
+import json
+import time
+import fnmatch
+from concurrent.futures import ThreadPoolExecutor, wait, FIRST_COMPLETED
+
+DEFAULT_EXCLUDES = ['*/.git', '*/node_modules', '*/__pycache__']
+
+
+class WalkCache:
+    """Verzeichnis -> {mtime_ns, ino, dirs, files, matches}; ungültig bei anderer Regel-Version"""
+
+    def __init__(self, path, version=''):
+        self.path = path
+        self.version = version
+        self.entries = {}
+        self._visited = set()
+        try:
+            with open(path, 'r') as f:
+                data = json.load(f)
+            if data.get('version') == version:
+                self.entries = data.get('directories', {})
+        except (OSError, ValueError):
+            pass
+
+    def lookup(self, directory, st):
+        entry = self.entries.get(directory)
+        if entry and entry['mtime_ns'] == st.st_mtime_ns and entry['ino'] == st.st_ino:
+            return entry
+        return None
+
+    def store(self, directory, st, dirs, files, matches):
+        self.entries[directory] = {
+            'mtime_ns': st.st_mtime_ns, 'ino': st.st_ino,
+            'dirs': dirs, 'files': files, 'matches': matches
+        }
+
+    def mark(self, directory):
+        self._visited.add(directory)
+
+    def save(self):
+        """Nur in diesem Lauf besuchte Verzeichnisse behalten (gelöschte fallen heraus)"""
+        directories = {d: e for d, e in self.entries.items() if d in self._visited}
+        tmp = f'{self.path}.tmp'
+        with open(tmp, 'w') as f:
+            json.dump({'version': self.version, 'directories': directories}, f)
+        os.replace(tmp, self.path)
+
+
+class ParallelWalker:
+    """Verzeichnisse parallel listen; match(dir, name) liefert pro Datei einen
+    Treffer (dict mit 'file', JSON-serialisierbar für den Cache) oder None
+
+    Der mtime eines Verzeichnisses ändert sich nur, wenn direkte Einträge
+    hinzukommen, verschwinden oder umbenannt werden - Unterverzeichnisse werden
+    daher immer einzeln per stat geprüft, nur das Listen wird gespart.
+    """
+
+    def __init__(self, match, excludes=None, workers=None, cache=None):
+        self.match = match
+        self.excludes = [os.path.expanduser(p).rstrip('/') for p in
+                         (DEFAULT_EXCLUDES if excludes is None else excludes)]
+        self.workers = workers or min(8, (os.cpu_count() or 2) * 2)
+        self.cache = cache
+        self.stats = {}
+
+    def _excluded(self, path):
+        return any(fnmatch.fnmatch(path, pattern) for pattern in self.excludes)
+
+    def _subdir_stats(self, directory, names):
+        subdirs = []
+        for name in names:
+            path = os.path.join(directory, name)
+            try:
+                st = os.lstat(path)
+            except OSError:
+                continue
+            subdirs.append((path, st))
+        return subdirs
+
+    def _process(self, directory, st):
+        """(Unterverzeichnisse, Treffer, gelistete Dateien, übersprungene Dateien)"""
+        cached = self.cache.lookup(directory, st) if self.cache else None
+        if cached is not None:
+            return self._subdir_stats(directory, cached['dirs']), cached['matches'], 0, cached['files']
+
+        dirs = []
+        subdirs = []
+        files = 0
+        matches = []
+        with os.scandir(directory) as entries:
+            for entry in entries:
+                try:
+                    if entry.is_dir(follow_symlinks=False):
+                        dirs.append(entry.name)
+                        subdirs.append((entry.path, entry.stat(follow_symlinks=False)))
+                        continue
+                except OSError:
+                    continue
+                files += 1
+                result = self.match(directory, entry.name)
+                if result is not None:
+                    matches.append(result)
+        if self.cache:
+            self.cache.store(directory, st, dirs, files, matches)
+        return subdirs, matches, files, 0
+
+    def walk(self, roots):
+        """Alle Treffer unter den Wurzeln (sortiert); Statistik in self.stats"""
+        start = time.perf_counter()
+        seen = set()
+        results = []
+        stats = {'directories': 0, 'visited': 0, 'skipped': 0, 'excluded': 0, 'errors': 0, 'matched': 0}
+
+        pool = ThreadPoolExecutor(max_workers=self.workers, thread_name_prefix='fs-walk')
+        pending = {}
+
+        def submit(path, st):
+            key = (st.st_dev, st.st_ino)
+            if key in seen:
+                return
+            seen.add(key)
+            if self._excluded(path):
+                stats['excluded'] += 1
+                return
+            if self.cache:
+                self.cache.mark(path)
+            pending[pool.submit(self._process, path, st)] = path
+
+        try:
+            for root in roots:
+                root = os.path.expanduser(root).rstrip('/') or '/'
+                try:
+                    st = os.stat(root)  # Wurzel darf ein Symlink sein (/tmp -> /private/tmp)
+                except OSError:
+                    continue
+                submit(root, st)
+
+            while pending:
+                done, _ = wait(pending, return_when=FIRST_COMPLETED)
+                for future in done:
+                    pending.pop(future)
+                    try:
+                        subdirs, matches, listed, skipped = future.result()
+                    except OSError:
+                        stats['errors'] += 1
+                        continue
+                    stats['directories'] += 1
+                    stats['visited'] += listed
+                    stats['skipped'] += skipped
+                    results.extend(matches)
+                    for path, st in subdirs:
+                        submit(path, st)
+        finally:
+            pool.shutdown(wait=True)
+
+        elapsed = time.perf_counter() - start
+        stats['matched'] = len(results)
+        stats['seconds'] = round(elapsed, 3)
+        stats['entries_per_second'] = round((stats['visited'] + stats['skipped']) / max(elapsed, 1e-9))
+        self.stats = stats
+        return sorted(results, key=lambda r: r['file'])
+
+
+if __name__ == "__main__":
+    if len(sys.argv) < 2:
+        print("Usage: python3 fs_walker.py <verzeichnis>... [--cache datei]")
+        sys.exit(1)
+    args = sys.argv[1:]
+    cache = None
+    if '--cache' in args:
+        index = args.index('--cache')
+        cache = WalkCache(args[index + 1], version='names')
+        args = args[:index] + args[index + 2:]
+
+    walker = ParallelWalker(lambda directory, name: None, cache=cache)
+    walker.walk(args)
+    if cache:
+        cache.save()
+    s = walker.stats
+    print(f"🗂️  {s['directories']} Verzeichnisse, {s['visited']} gelistet, {s['skipped']} aus Cache, "
+          f"{s['excluded']} ausgeschlossen in {s['seconds']}s ({s['entries_per_second']:,} Einträge/s)")
@@ -0,0 +1,448 @@
+#!/usr/bin/env python3
+"""
+☣️ HASH INDEX - Kompakter Index bekannter Schad-Hashes (SHA-256)
+Sortierte 32-Byte-Digests in einer Binärdatei, per mmap read-only geöffnet
+(mehrere Tools teilen sich die Seiten im Page-Cache); Bloom-Filter als
+Vorfilter, 16-Bit-Fanout-Tabelle für die Suche im richtigen Bucket.
+Feeds werden extern sortiert eingelesen (Millionen Digests, begrenzter
+Speicher); Updates kommen als Delta-Dateien (+hash / -hash).
+"""
+
+import os
+import re
+import sys
+import json
+import glob
+import gzip
+import mmap
+import heapq
+import struct
+import tempfile
+from array import array
+from datetime import datetime
+from collections import OrderedDict
+
+from integrity_engine import IntegrityEngine
+
+DEFAULT_INDEX_FILE = os.environ.get(
+    'KNOWN_BAD_INDEX', os.path.expanduser('~/.ki_sicherheitsmann/known_bad_hashes.idx'))
+DEFAULT_FEED_DIR = os.path.expanduser('~/.ki_sicherheitsmann/threat_feeds')
+
+_MAGIC = b'KBHASH1\n'
+_HEADER = struct.Struct('<8sIIQQI')  # magic, bloom_k, reserved, count, bloom_bits, meta_len
+_FANOUT = struct.Struct('<65536I')
+_FANOUT_ENTRY = struct.Struct('<I')
+_DIGEST_SIZE = 32
+_BLOOM_K = 4
+_BLOOM_BITS_PER_ENTRY = 16  # ~0,25% Fehlalarme im Vorfilter
+_HEX_RE = re.compile(r'\b[0-9a-fA-F]{64}\b')
+
+
+def _to_digest(value):
+    """Hex-String oder 32 Bytes -> 32 Bytes"""
+    if isinstance(value, str):
+        return bytes.fromhex(value)
+    return bytes(value)
+
+
+def _bloom_positions(digest, bits):
+    # SHA-256 ist gleichverteilt: Doppel-Hashing direkt aus den Digest-Bytes
+    h1 = int.from_bytes(digest[16:24], 'little')
+    h2 = int.from_bytes(digest[24:32], 'little') | 1
+    return [(h1 + i * h2) % bits for i in range(_BLOOM_K)]
+
+
+class HashIndex:
+    """Read-only Sicht auf eine Index-Datei; refresh() übernimmt neu gebaute Dateien"""
+
+    def __init__(self, path=DEFAULT_INDEX_FILE):
+        self.path = path
+        self.lookups = 0
+        self.bloom_rejects = 0
+        self.hits = 0
+        self._file = None
+        self._map = None
+        self._open()
+
+    def _open(self):
+        f = open(self.path, 'rb')
+        try:
+            st = os.fstat(f.fileno())
+            mapped = mmap.mmap(f.fileno(), 0, access=mmap.ACCESS_READ)
+            magic, k, _, count, bloom_bits, meta_len = _HEADER.unpack_from(mapped, 0)
+            if magic != _MAGIC or k != _BLOOM_K:
+                mapped.close()
+                raise ValueError(f'Keine Hash-Index-Datei: {self.path}')
+        except Exception:
+            f.close()
+            raise
+        self.close()
+        self._file = f
+        self._map = mapped
+        self._ident = (st.st_dev, st.st_ino, st.st_mtime_ns)
+        self.count = count
+        self.bloom_bits = bloom_bits
+        self.meta = json.loads(mapped[_HEADER.size:_HEADER.size + meta_len])
+        self._fanout_offset = _align(_HEADER.size + meta_len)
+        self._bloom_offset = self._fanout_offset + _FANOUT.size
+        self._records_offset = self._bloom_offset + bloom_bits // 8
+
+    @property
+    def version(self):
+        return f"{self.meta.get('built_at', '')}:{self.count}"
+
+    def refresh(self):
+        """Neu gebaute Datei (os.replace) übernehmen; True wenn gewechselt"""
+        try:
+            st = os.stat(self.path)
+        except OSError:
+            return False
+        if (st.st_dev, st.st_ino, st.st_mtime_ns) == self._ident:
+            return False
+        self._open()
+        return True
+
+    def close(self):
+        if self._map is not None:
+            self._map.close()
+            self._file.close()
+            self._map = self._file = None
+
+    def __len__(self):
+        return self.count
+
+    def __contains__(self, value):
+        return self.contains(value)
+
+    def contains(self, value):
+        """Bloom-Filter (O(1)), dann Binärsuche nur innerhalb des Fanout-Buckets"""
+        digest = _to_digest(value)
+        if len(digest) != _DIGEST_SIZE:
+            return False
+        self.lookups += 1
+        mapped = self._map
+        bloom = self._bloom_offset
+        for position in _bloom_positions(digest, self.bloom_bits):
+            if not mapped[bloom + (position >> 3)] & (1 << (position & 7)):
+                self.bloom_rejects += 1
+                return False
+
+        bucket = (digest[0] << 8) | digest[1]
+        lo = _FANOUT_ENTRY.unpack_from(mapped, self._fanout_offset + 4 * (bucket - 1))[0] if bucket else 0
+        hi = _FANOUT_ENTRY.unpack_from(mapped, self._fanout_offset + 4 * bucket)[0]
+        base = self._records_offset
+        while lo < hi:
+            mid = (lo + hi) // 2
+            offset = base + mid * _DIGEST_SIZE
+            record = mapped[offset:offset + _DIGEST_SIZE]
+            if record < digest:
+                lo = mid + 1
+            elif record > digest:
+                hi = mid
+            else:
+                self.hits += 1
+                return True
+        return False
+
+    def iter_records(self):
+        """Alle Digests (sortiert) - Basis für Delta-Updates"""
+        mapped = self._map
+        offset = self._records_offset
+        for _ in range(self.count):
+            yield mapped[offset:offset + _DIGEST_SIZE]
+            offset += _DIGEST_SIZE
+
+
+def _align(offset, boundary=8):
+    return (offset + boundary - 1) // boundary * boundary
+
+
+def open_index(path=DEFAULT_INDEX_FILE):
+    """Index öffnen; None, wenn (noch) keiner gebaut wurde oder die Datei ungültig ist"""
+    try:
+        return HashIndex(path)
+    except (OSError, ValueError, struct.error) as e:
+        if os.path.exists(path):
+            print(f"⚠️  Hash-Index nicht lesbar ({path}): {e}", file=sys.stderr)
+        return None
+
+
+def _open_text(path):
+    if path.endswith('.gz'):
+        return gzip.open(path, 'rt', encoding='utf-8', errors='replace')
+    return open(path, 'r', encoding='utf-8', errors='replace')
+
+
+def read_feed(path):
+    """Digests einer Feed-Datei: erster 64-stelliger Hex-Wert pro Zeile (auch CSV, .gz)"""
+    with _open_text(path) as f:
+        for line in f:
+            if line.startswith('#'):
+                continue
+            match = _HEX_RE.search(line)
+            if match:
+                yield bytes.fromhex(match.group(0))
+
+
+def read_delta(path):
+    """(op, digest) einer Delta-Datei: '+hash' oder 'hash' = neu, '-hash' = entfernt"""
+    with _open_text(path) as f:
+        for line in f:
+            line = line.strip()
+            if not line or line.startswith('#'):
+                continue
+            match = _HEX_RE.search(line)
+            if match:
+                yield ('-' if line.startswith('-') else '+'), bytes.fromhex(match.group(0))
+
+
+def _sorted_runs(digests, directory, run_size):
+    """Externes Sortieren: Blöcke von run_size Digests sortiert in Temp-Dateien"""
+    runs = []
+    total = 0
+    chunk = []
+
+    def flush():
+        chunk.sort()
+        run = tempfile.TemporaryFile(dir=directory)
+        run.write(b''.join(chunk))
+        run.seek(0)
+        runs.append(run)
+        chunk.clear()
+
+    for digest in digests:
+        chunk.append(digest)
+        total += 1
+        if len(chunk) >= run_size:
+            flush()
+    if chunk:
+        flush()
+    return runs, total
+
+
+def _read_run(run):
+    while True:
+        record = run.read(_DIGEST_SIZE)
+        if len(record) < _DIGEST_SIZE:
+            return
+        yield record
+
+
+def build_index(path, digests, base=None, removals=(), meta=None, run_size=1000000):
+    """Index (neu) schreiben und atomar ersetzen; Leser behalten die alte Datei bis refresh()
+
+    digests: neue Digests (beliebige Reihenfolge, Duplikate erlaubt);
+    base: bestehender HashIndex, dessen Einträge übernommen werden;
+    removals: Digests, die nicht (mehr) enthalten sein sollen.
+    """
+    directory = os.path.dirname(os.path.abspath(path))
+    os.makedirs(directory, exist_ok=True)
+    removals = set(removals)
+    runs, total = _sorted_runs(digests, directory, run_size)
+    sources = [_read_run(run) for run in runs]
+    upper_bound = total
+    if base is not None:
+        sources.append(base.iter_records())
+        upper_bound += base.count
+
+    bloom_bits = _align(max(64, upper_bound * _BLOOM_BITS_PER_ENTRY), 64)
+    bloom = bytearray(bloom_bits // 8)
+    fanout = array('I', bytes(4 * 65536))
+    count = 0
+    previous = None
+    try:
+        with tempfile.TemporaryFile(dir=directory) as records:
+            for digest in heapq.merge(*sources):
+                if digest == previous or digest in removals:
+                    continue
+                previous = digest
+                records.write(digest)
+                count += 1
+                fanout[(digest[0] << 8) | digest[1]] += 1
+                for position in _bloom_positions(digest, bloom_bits):
+                    bloom[position >> 3] |= 1 << (position & 7)
+            running = 0
+            for bucket in range(65536):
+                running += fanout[bucket]
+                fanout[bucket] = running
+
+            meta = dict(meta or {})
+            meta.update(count=count, built_at=datetime.now().isoformat())
+            meta_bytes = json.dumps(meta).encode('utf-8')
+            tmp = f'{path}.tmp'
+            with open(tmp, 'wb') as out:
+                out.write(_HEADER.pack(_MAGIC, _BLOOM_K, 0, count, bloom_bits, len(meta_bytes)))
+                out.write(meta_bytes)
+                out.write(b'\0' * (_align(out.tell()) - out.tell()))
+                out.write(_FANOUT.pack(*fanout))
+                out.write(bloom)
+                records.seek(0)
+                while True:
+                    block = records.read(1024 * 1024)
+                    if not block:
+                        break
+                    out.write(block)
+            os.replace(tmp, path)
+    finally:
+        for run in runs:
+            run.close()
+    return count
+
+
+def build_from_feeds(path, feeds):
+    """Vollständiger Neuaufbau aus Feed-Dateien"""
+    def digests():
+        for feed in feeds:
+            yield from read_feed(feed)
+    return build_index(path, digests(), meta={'sources': [os.path.basename(f) for f in feeds], 'deltas': []})
+
+
+def apply_deltas(path=DEFAULT_INDEX_FILE, feed_dir=DEFAULT_FEED_DIR):
+    """Noch nicht angewendete *.delta-Dateien (Namens-Reihenfolge) einarbeiten
+
+    Liefert die Namen der angewendeten Deltas; bei mehreren Operationen auf
+    denselben Digest gilt die letzte.
+    """
+    base = open_index(path)
+    meta = dict(base.meta) if base else {'sources': [], 'deltas': []}
+    applied = set(meta.get('deltas', []))
+    pending = [d for d in sorted(glob.glob(os.path.join(feed_dir, '*.delta')))
+               if os.path.basename(d) not in applied]
+    if not pending:
+        if base:
+            base.close()
+        return []
+
+    operations = {}
+    for delta in pending:
+        for op, digest in read_delta(delta):
+            operations[digest] = op
+    additions = (digest for digest, op in operations.items() if op == '+')
+    removals = {digest for digest, op in operations.items() if op == '-'}
+    meta['deltas'] = meta.get('deltas', []) + [os.path.basename(d) for d in pending]
+    try:
+        build_index(path, additions, base=base, removals=removals, meta=meta)
+    finally:
+        if base:
+            base.close()
+    return [os.path.basename(d) for d in pending]
+
+
+class DigestCache:
+    """SHA-256 pro (dev, inode, size, mtime_ns) - jede Datei wird nur einmal gehasht (LRU)"""
+
+    def __init__(self, max_entries=4096, max_size=256 * 1024 * 1024):
+        self.engine = IntegrityEngine('sha256')
+        self.max_entries = max_entries
+        self.max_size = max_size
+        self._cache = OrderedDict()
+
+    def digest(self, path):
+        """Hex-Digest oder None (nicht lesbar, keine reguläre Datei, zu groß)"""
+        try:
+            st = os.stat(path)
+            if not os.path.isfile(path) or st.st_size > self.max_size:
+                return None
+            key = (st.st_dev, st.st_ino, st.st_size, st.st_mtime_ns)
+            if key in self._cache:
+                self._cache.move_to_end(key)
+                return self._cache[key]
+            digest = self.engine.hash_file(path, size=st.st_size)
+        except OSError:
+            return None
+        self._cache[key] = digest
+        if len(self._cache) > self.max_entries:
+            self._cache.popitem(last=False)
+        return digest
+
+
+def executable_path(pid, cmd=None):
+    """Pfad der ausgeführten Binärdatei (Linux: /proc/<pid>/exe, sonst aus der Kommandozeile)"""
+    if os.path.exists(f'/proc/{pid}/exe'):
+        return f'/proc/{pid}/exe'  # öffnet die Datei auch, wenn sie gelöscht wurde
+    program = (cmd or '').split(' ')[0]
+    return program if os.path.isabs(program) else None
+
+
+def benchmark(count=1000000, lookups=200000):
+    """Aufbau-Zeit, Lookups/s und Speicher: Index gegen Python-Set aus Hex-Strings"""
+    import time
+    import tracemalloc
+    import random
+    rng = random.Random(7)
+    digests = [rng.randbytes(_DIGEST_SIZE) for _ in range(count)]
+    with tempfile.TemporaryDirectory() as tmp:
+        path = os.path.join(tmp, 'bench.idx')
+        start = time.perf_counter()
+        build_index(path, iter(digests))
+        build_time = time.perf_counter() - start
+
+        tracemalloc.start()
+        index = HashIndex(path)
+        index_heap = tracemalloc.get_traced_memory()[0]
+        tracemalloc.stop()
+
+        probes = [rng.choice(digests) if i % 10 == 0 else rng.randbytes(_DIGEST_SIZE) for i in range(lookups)]
+        start = time.perf_counter()
+        hits = sum(1 for probe in probes if probe in index)
+        lookup_time = time.perf_counter() - start
+
+        tracemalloc.start()
+        hex_set = {d.hex() for d in digests}
+        set_heap = tracemalloc.get_traced_memory()[0]
+        tracemalloc.stop()
+        start = time.perf_counter()
+        set_hits = sum(1 for probe in probes if probe.hex() in hex_set)
+        set_time = time.perf_counter() - start
+
+        size = os.path.getsize(path)
+        print(f"☣️  {count:,} Digests: Aufbau {build_time:.1f}s, Datei {size / 1e6:.1f} MB (mmap, geteilt)")
+        print(f"  Index:   {lookups / lookup_time:>10,.0f} Lookups/s, {index_heap / 1e6:>7.2f} MB Heap, "
+              f"{hits} Treffer, {index.bloom_rejects / lookups:.0%} per Bloom-Filter verworfen")
+        print(f"  Hex-Set: {lookups / set_time:>10,.0f} Lookups/s, {set_heap / 1e6:>7.2f} MB Heap, {set_hits} Treffer")
+        index.close()
+
+
+if __name__ == "__main__":
+    args = sys.argv[1:]
+    index_path = DEFAULT_INDEX_FILE
+    if '--index' in args:
+        position = args.index('--index')
+        index_path = args[position + 1]
+        args = args[:position] + args[position + 2:]
+
+    command = args[0] if args else None
+    if command == 'build' and len(args) > 1:
+        count = build_from_feeds(index_path, args[1:])
+        print(f"☣️  Index gebaut: {index_path} ({count:,} Digests)")
+    elif command == 'update':
+        feed_dir = args[1] if len(args) > 1 else DEFAULT_FEED_DIR
+        applied = apply_deltas(index_path, feed_dir)
+        index = open_index(index_path)
+        print(f"☣️  {len(applied)} Delta(s) angewendet, {len(index) if index else 0:,} Digests im Index")
+    elif command == 'check' and len(args) > 1:
+        index = open_index(index_path)
+        if index is None:
+            print(f"❌ Kein Index: {index_path}")
+            sys.exit(1)
+        hasher = DigestCache()
+        for item in args[1:]:
+            digest = item if _HEX_RE.fullmatch(item) else hasher.digest(item)
+            status = '🔴 BEKANNT' if digest and digest in index else '✅ unbekannt'
+            print(f"  {status:<12} {item}")
+    elif command == 'info':
+        index = open_index(index_path)
+        if index is None:
+            print(f"❌ Kein Index: {index_path}")
+            sys.exit(1)
+        print(f"☣️  {index_path}: {len(index):,} Digests, Stand {index.meta.get('built_at')}")
+        print(f"  Feeds:  {', '.join(index.meta.get('sources', [])) or '-'}")
+        print(f"  Deltas: {', '.join(index.meta.get('deltas', [])) or '-'}")
+    elif command == 'bench':
+        benchmark(int(args[1]) if len(args) > 1 else 1000000)
+    else:
+        print("Usage: python3 hash_index.py build <feed>... [--index datei]")
+        print("       python3 hash_index.py update [feed-verzeichnis]   (*.delta: +hash / -hash)")
+        print("       python3 hash_index.py check <sha256|datei>...")
+        print("       python3 hash_index.py info | bench [anzahl]")
+        sys.exit(1)
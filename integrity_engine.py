@@ -0,0 +1,137 @@
+#!/usr/bin/env python3
+"""
+🔐 INTEGRITY ENGINE - Stat-gesteuertes, streamendes Hashing
+Hash nur bei geändertem (dev, inode, size, mtime_ns, ctime_ns); Dateien werden in
+festen Blöcken gelesen (große Dateien per mmap), nie komplett in den Speicher
+"""
+
+import os
+import sys
+import mmap
+import time
+import hashlib
+
+ALGORITHMS = ('sha256', 'blake2b')
+
+UNCHANGED = 'unchanged'       # stat identisch, kein Hash nötig
+TOUCHED = 'touched'           # stat anders, Inhalt+mtime gleich (chmod, atomares Rewrite)
+MODIFIED = 'modified'         # mtime anders, Inhalt gleich
+HASH_CHANGED = 'hash_changed'  # Inhalt anders
+
+
+def stat_key(st):
+    """Vergleichs-Tupel aus os.stat_result"""
+    return [st.st_dev, st.st_ino, st.st_size, st.st_mtime_ns, st.st_ctime_ns]
+
+
+class IntegrityEngine:
+    """Baseline-Einträge erzeugen und Dateien gegen sie prüfen"""
+
+    def __init__(self, algorithm='sha256', chunk_size=1024 * 1024, mmap_threshold=64 * 1024 * 1024):
+        if algorithm not in ALGORITHMS:
+            raise ValueError(f'Unbekannter Hash-Algorithmus: {algorithm} (erlaubt: {", ".join(ALGORITHMS)})')
+        self.algorithm = algorithm
+        self.chunk_size = chunk_size
+        self.mmap_threshold = mmap_threshold
+        self._buffer = bytearray(chunk_size)
+        self.files_hashed = 0
+        self.bytes_hashed = 0
+
+    def hash_file(self, path, algorithm=None, size=None):
+        """Hex-Digest, gestreamt in Blöcken bzw. per mmap für große Dateien"""
+        h = hashlib.new(algorithm or self.algorithm)
+        with open(path, 'rb', buffering=0) as f:
+            if size is None:
+                size = os.fstat(f.fileno()).st_size
+            if size >= self.mmap_threshold:
+                with mmap.mmap(f.fileno(), 0, access=mmap.ACCESS_READ) as mapped:
+                    h.update(mapped)
+            else:
+                view = memoryview(self._buffer)
+                while True:
+                    n = f.readinto(self._buffer)
+                    if not n:
+                        break
+                    h.update(view[:n])
+        self.files_hashed += 1
+        self.bytes_hashed += size
+        return h.hexdigest()
+
+    def baseline_entry(self, path, st=None):
+        """Neuer Baseline-Eintrag (JSON-kompatibel, abwärtskompatibel zu hash/mtime/size)"""
+        st = st or os.stat(path)
+        return {
+            'hash': self.hash_file(path, size=st.st_size),
+            'algorithm': self.algorithm,
+            'mtime': st.st_mtime,
+            'size': st.st_size,
+            'stat': stat_key(st)
+        }
+
+    def compare(self, path, stored):
+        """(Status, aktueller Eintrag) - hasht nur, wenn sich der stat-Schlüssel geändert hat"""
+        st = os.stat(path)
+        key = stat_key(st)
+        if stored.get('stat') == key:
+            return UNCHANGED, stored
+
+        stored_algorithm = stored.get('algorithm', 'sha256')
+        current_hash = self.hash_file(path, algorithm=stored_algorithm, size=st.st_size)
+        if current_hash != stored['hash']:
+            entry = self.baseline_entry(path, st) if stored_algorithm != self.algorithm else {
+                'hash': current_hash, 'algorithm': stored_algorithm,
+                'mtime': st.st_mtime, 'size': st.st_size, 'stat': key
+            }
+            return HASH_CHANGED, entry
+
+        if stored_algorithm != self.algorithm:
+            # Einmalige Migration auf den konfigurierten Algorithmus
+            current_hash = self.hash_file(path, size=st.st_size)
+        entry = {
+            'hash': current_hash, 'algorithm': self.algorithm,
+            'mtime': st.st_mtime, 'size': st.st_size, 'stat': key
+        }
+        if st.st_mtime != stored.get('mtime'):
+            return MODIFIED, entry
+        return TOUCHED, entry
+
+
+def iter_files(roots, follow_symlinks=False):
+    """Reguläre Dateien unter Verzeichnissen (rekursiv, os.scandir)"""
+    stack = [os.path.expanduser(r) for r in roots]
+    while stack:
+        current = stack.pop()
+        try:
+            with os.scandir(current) as entries:
+                for entry in entries:
+                    try:
+                        if entry.is_dir(follow_symlinks=follow_symlinks):
+                            stack.append(entry.path)
+                        elif entry.is_file(follow_symlinks=follow_symlinks):
+                            yield entry.path
+                    except OSError:
+                        continue
+        except (NotADirectoryError, FileNotFoundError):
+            if os.path.isfile(current):
+                yield current
+        except PermissionError:
+            continue
+
+
+if __name__ == "__main__":
+    algorithm = 'sha256'
+    args = sys.argv[1:]
+    if args and args[0] in ALGORITHMS:
+        algorithm, args = args[0], args[1:]
+    engine = IntegrityEngine(algorithm)
+    start = time.perf_counter()
+    count = 0
+    for path in iter_files(args or ['.']):
+        try:
+            engine.baseline_entry(path)
+            count += 1
+        except OSError:
+            continue
+    elapsed = time.perf_counter() - start
+    print(f"🔐 {count} Dateien, {engine.bytes_hashed / 1e6:.1f} MB in {elapsed:.2f}s "
+          f"({algorithm}, {engine.bytes_hashed / 1e6 / max(elapsed, 1e-9):.1f} MB/s)")
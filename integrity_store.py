@@ -0,0 +1,206 @@
+#!/usr/bin/env python3
+"""
+🗄️ INTEGRITY STORE - Skalierbare Baseline (SQLite im WAL-Modus)
+Punkt-Updates, gebündelte Commits, schnelle Verzeichnis-Abfragen; Import/Export
+des bisherigen file_integrity.db.json-Formats; paralleler Baseline-Aufbau
+"""
+
+import os
+import sys
+import json
+import time
+import sqlite3
+import threading
+from collections.abc import MutableMapping
+from concurrent.futures import ThreadPoolExecutor
+
+from integrity_engine import IntegrityEngine, iter_files
+
+_SCHEMA = """
+CREATE TABLE IF NOT EXISTS files (
+    path      TEXT PRIMARY KEY,
+    hash      TEXT NOT NULL,
+    algorithm TEXT NOT NULL DEFAULT 'sha256',
+    mtime     REAL,
+    size      INTEGER,
+    dev       INTEGER,
+    ino       INTEGER,
+    mtime_ns  INTEGER,
+    ctime_ns  INTEGER
+) WITHOUT ROWID
+"""
+
+_COLUMNS = 'path, hash, algorithm, mtime, size, dev, ino, mtime_ns, ctime_ns'
+
+
+def _row_to_entry(row):
+    entry = {'hash': row[1], 'algorithm': row[2], 'mtime': row[3], 'size': row[4]}
+    if row[5] is not None:
+        entry['stat'] = [row[5], row[6], row[4], row[7], row[8]]
+    return entry
+
+
+def _entry_to_row(path, entry):
+    st = entry.get('stat') or [None] * 5
+    return (path, entry['hash'], entry.get('algorithm', 'sha256'), entry.get('mtime'),
+            entry.get('size'), st[0], st[1], st[3], st[4])
+
+
+class IntegrityStore(MutableMapping):
+    """Dict-artige Baseline (Pfad -> Eintrag), Änderungen werden gebündelt committet"""
+
+    def __init__(self, path, batch_size=1000):
+        self.path = path
+        self.batch_size = batch_size
+        self._pending = 0
+        self.conn = sqlite3.connect(path)
+        self.conn.execute('PRAGMA journal_mode=WAL')
+        self.conn.execute('PRAGMA synchronous=NORMAL')
+        self.conn.execute(_SCHEMA)
+        self.conn.commit()
+
+    def _changed(self):
+        self._pending += 1
+        if self._pending >= self.batch_size:
+            self.commit()
+
+    def commit(self):
+        """Offene Änderungen schreiben (eine Transaktion)"""
+        if self._pending:
+            self.conn.commit()
+            self._pending = 0
+
+    def close(self):
+        self.commit()
+        self.conn.close()
+
+    def __getitem__(self, path):
+        row = self.conn.execute(f'SELECT {_COLUMNS} FROM files WHERE path = ?', (path,)).fetchone()
+        if row is None:
+            raise KeyError(path)
+        return _row_to_entry(row)
+
+    def __setitem__(self, path, entry):
+        self.conn.execute(f'INSERT OR REPLACE INTO files ({_COLUMNS}) VALUES (?, ?, ?, ?, ?, ?, ?, ?, ?)',
+                          _entry_to_row(path, entry))
+        self._changed()
+
+    def __delitem__(self, path):
+        if self.conn.execute('DELETE FROM files WHERE path = ?', (path,)).rowcount == 0:
+            raise KeyError(path)
+        self._changed()
+
+    def __contains__(self, path):
+        return self.conn.execute('SELECT 1 FROM files WHERE path = ?', (path,)).fetchone() is not None
+
+    def __len__(self):
+        return self.conn.execute('SELECT COUNT(*) FROM files').fetchone()[0]
+
+    def __iter__(self):
+        for (path,) in self.conn.execute('SELECT path FROM files ORDER BY path'):
+            yield path
+
+    def items(self, page_size=1000):
+        """(Pfad, Eintrag) seitenweise gestreamt - Updates während der Iteration sind sicher"""
+        last = ''
+        while True:
+            rows = self.conn.execute(
+                f'SELECT {_COLUMNS} FROM files WHERE path > ? ORDER BY path LIMIT ?',
+                (last, page_size)).fetchall()
+            if not rows:
+                return
+            for row in rows:
+                yield row[0], _row_to_entry(row)
+            last = rows[-1][0]
+
+    def under(self, directory):
+        """Alle Einträge unterhalb eines Verzeichnisses (Index-Bereichsabfrage)"""
+        prefix = directory.rstrip('/') + '/'
+        # '0' ist das Zeichen direkt nach '/' - obere Grenze des Präfixbereichs
+        upper = prefix[:-1] + '0'
+        for row in self.conn.execute(
+                f'SELECT {_COLUMNS} FROM files WHERE path >= ? AND path < ? ORDER BY path',
+                (prefix, upper)):
+            yield row[0], _row_to_entry(row)
+
+    def import_json(self, json_path):
+        """Bestehendes file_integrity.db.json übernehmen"""
+        with open(json_path, 'r') as f:
+            data = json.load(f)
+        self.conn.executemany(f'INSERT OR REPLACE INTO files ({_COLUMNS}) VALUES (?, ?, ?, ?, ?, ?, ?, ?, ?)',
+                              (_entry_to_row(path, entry) for path, entry in data.items()))
+        self.conn.commit()
+        self._pending = 0
+        return len(data)
+
+    def export_json(self, json_path):
+        """Baseline im bisherigen JSON-Format exportieren"""
+        self.commit()
+        data = dict(self.items())
+        with open(json_path, 'w') as f:
+            json.dump(data, f, indent=2)
+        return len(data)
+
+
+def build_baseline(store, files, algorithm='sha256', workers=None, progress=None):
+    """Baseline parallel hashen (Thread-Pool, hashlib gibt den GIL frei)
+
+    progress(erledigt, gesamt, bytes) wird regelmäßig aus dem Aufrufer-Thread gerufen.
+    """
+    files = list(files)
+    local = threading.local()
+
+    def hash_one(path):
+        engine = getattr(local, 'engine', None)
+        if engine is None:
+            engine = local.engine = IntegrityEngine(algorithm)
+        try:
+            return path, engine.baseline_entry(path)
+        except OSError:
+            return path, None
+
+    done = 0
+    total_bytes = 0
+    last_report = 0.0
+    with ThreadPoolExecutor(max_workers=workers or min(8, (os.cpu_count() or 2))) as pool:
+        for path, entry in pool.map(hash_one, files, chunksize=64):
+            done += 1
+            if entry is not None:
+                store[path] = entry
+                total_bytes += entry['size'] or 0
+            now = time.monotonic()
+            if progress and (now - last_report >= 0.5 or done == len(files)):
+                progress(done, len(files), total_bytes)
+                last_report = now
+    store.commit()
+    return done
+
+
+def print_progress(done, total, total_bytes):
+    """Fortschrittsanzeige für build_baseline"""
+    print(f"\r  🔐 {done}/{total} Dateien ({total_bytes / 1e6:.1f} MB)", end='', flush=True)
+    if done == total:
+        print()
+
+
+if __name__ == "__main__":
+    usage = "Usage: python3 integrity_store.py <store> [import|export <json> | build <dir>... | stats]"
+    if len(sys.argv) < 3:
+        print(usage)
+        sys.exit(1)
+
+    store = IntegrityStore(sys.argv[1])
+    command = sys.argv[2]
+    if command == 'import' and len(sys.argv) > 3:
+        print(f"📥 {store.import_json(sys.argv[3])} Einträge importiert")
+    elif command == 'export' and len(sys.argv) > 3:
+        print(f"📤 {store.export_json(sys.argv[3])} Einträge exportiert")
+    elif command == 'build' and len(sys.argv) > 3:
+        start = time.perf_counter()
+        count = build_baseline(store, iter_files(sys.argv[3:]), progress=print_progress)
+        print(f"✅ {count} Dateien in {time.perf_counter() - start:.2f}s")
+    elif command == 'stats':
+        print(f"📊 {len(store)} Einträge in {store.path}")
+    else:
+        print(usage)
+    store.close()
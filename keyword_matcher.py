@@ -0,0 +1,213 @@
+#!/usr/bin/env python3
+"""
+🔎 KEYWORD MATCHER - Kompilierter Multi-Keyword-Matcher (Aho-Corasick)
+Ein Durchlauf pro Kommandozeile, meldet alle Treffer - auch bei zehntausenden Keywords
+"""
+
+import os
+import sys
+import json
+import time
+import random
+import string
+from functools import lru_cache
+
+# Unterhalb dieser Listengröße ist die C-Substring-Suche pro Keyword schneller
+# als ein Python-Automat; darüber gewinnt der Automat deutlich.
+SMALL_LIST_THRESHOLD = 48
+
+
+class KeywordMatcher:
+    """Findet alle Keywords (Substring-Semantik wie `kw in text`) in einem Durchlauf"""
+
+    def __init__(self, keywords, case_insensitive=True, small_list_threshold=SMALL_LIST_THRESHOLD):
+        self.case_insensitive = case_insensitive
+        seen = set()
+        ordered = []
+        for kw in keywords:
+            if not kw:
+                continue
+            kw = kw.lower() if case_insensitive else kw
+            if kw not in seen:
+                seen.add(kw)
+                ordered.append(kw)
+        self.keywords = tuple(ordered)
+        self._use_automaton = len(self.keywords) > small_list_threshold
+        if self._use_automaton:
+            self._build()
+
+    def __len__(self):
+        return len(self.keywords)
+
+    def __bool__(self):
+        return bool(self.keywords)
+
+    def _build(self):
+        """Baue Trie + Fail-Links (BFS); Ausgaben werden entlang der Fail-Kette vereinigt"""
+        goto = [{}]
+        fail = [0]
+        output = [()]
+
+        for kw in self.keywords:
+            node = 0
+            for ch in kw:
+                nxt = goto[node].get(ch)
+                if nxt is None:
+                    nxt = len(goto)
+                    goto[node][ch] = nxt
+                    goto.append({})
+                    fail.append(0)
+                    output.append(())
+                node = nxt
+            output[node] = output[node] + (kw,)
+
+        queue = list(goto[0].values())
+        head = 0
+        while head < len(queue):
+            node = queue[head]
+            head += 1
+            for ch, child in goto[node].items():
+                queue.append(child)
+                f = fail[node]
+                while f and ch not in goto[f]:
+                    f = fail[f]
+                target = goto[f].get(ch, 0)
+                fail[child] = target if target != child else 0
+                if output[fail[child]]:
+                    output[child] = output[child] + output[fail[child]]
+
+        self._goto = goto
+        self._fail = fail
+        self._output = output
+
+    def find_all(self, text):
+        """Alle getroffenen Keywords (eindeutig, in Reihenfolge des ersten Auftretens)"""
+        if self.case_insensitive:
+            text = text.lower()
+        if not self._use_automaton:
+            return [kw for kw in self.keywords if kw in text]
+
+        goto = self._goto
+        fail = self._fail
+        output = self._output
+        node = 0
+        hits = []
+        for ch in text:
+            nxt = goto[node].get(ch)
+            while nxt is None and node:
+                node = fail[node]
+                nxt = goto[node].get(ch)
+            node = nxt or 0
+            if output[node]:
+                for kw in output[node]:
+                    if kw not in hits:
+                        hits.append(kw)
+        return hits
+
+    def search(self, text):
+        """Erstes getroffenes Keyword oder None"""
+        hits = self.find_all(text)
+        return hits[0] if hits else None
+
+
+@lru_cache(maxsize=32)
+def _cached_matcher(keywords):
+    return KeywordMatcher(keywords)
+
+
+def matcher_for(keywords):
+    """Geteilter Matcher für statische Keyword-Listen (wird nur einmal kompiliert)"""
+    return _cached_matcher(tuple(keywords))
+
+
+class WatchedKeywordList:
+    """Keyword-Liste aus JSON-Datei; Matcher wird nur bei Dateiänderung neu gebaut"""
+
+    def __init__(self, path, field='processes', fallback=()):
+        self.path = path
+        self.field = field
+        self.fallback = list(fallback)
+        self._signature = None
+        self._matcher = None
+
+    def matcher(self):
+        """Aktueller Matcher (ein stat() pro Aufruf)"""
+        try:
+            st = os.stat(self.path)
+            signature = (st.st_ino, st.st_size, st.st_mtime_ns)
+        except OSError:
+            signature = None
+
+        if self._matcher is None or signature != self._signature:
+            keywords = self.fallback
+            if signature is not None:
+                try:
+                    with open(self.path, 'r') as f:
+                        keywords = json.load(f).get(self.field, [])
+                except (OSError, ValueError):
+                    # Halbe Schreibvorgänge: alten Matcher behalten
+                    if self._matcher is not None:
+                        return self._matcher
+            self._matcher = KeywordMatcher(keywords)
+            self._signature = signature
+        return self._matcher
+
+
+def _random_words(count, rng, min_len=5, max_len=12):
+    letters = string.ascii_lowercase
+    return [''.join(rng.choice(letters) for _ in range(rng.randint(min_len, max_len)))
+            for _ in range(count)]
+
+
+def benchmark(list_sizes=(8, 100, 1000, 10000, 50000), lines=2000):
+    """Micro-Benchmark: Matcher vs. bisherige `any(kw in cmd ...)`-Schleifen"""
+    rng = random.Random(42)
+    commands = []
+    for i in range(lines):
+        args = ' '.join(_random_words(rng.randint(1, 6), rng, 3, 10))
+        commands.append(f'/usr/local/bin/{_random_words(1, rng)[0]} --worker {i} {args}')
+
+    print("="*72)
+    print(f"⏱️  KEYWORD MATCHER BENCHMARK ({lines} Kommandozeilen)")
+    print("="*72)
+    print(f"  {'Keywords':>9} {'any()-Loop':>12} {'alle Treffer':>14} {'Matcher':>12} {'Build':>10}")
+
+    for size in list_sizes:
+        keywords = _random_words(size, rng)
+        # Einige Treffer garantieren
+        for j in range(0, lines, 50):
+            commands[j] += ' ' + keywords[j % size]
+
+        start = time.perf_counter()
+        for cmd in commands:
+            cmd_lower = cmd.lower()
+            any(kw in cmd_lower for kw in keywords)
+        loop_any = time.perf_counter() - start
+
+        start = time.perf_counter()
+        for cmd in commands:
+            cmd_lower = cmd.lower()
+            [kw for kw in keywords if kw in cmd_lower]
+        loop_all = time.perf_counter() - start
+
+        start = time.perf_counter()
+        matcher = KeywordMatcher(keywords)
+        build = time.perf_counter() - start
+
+        start = time.perf_counter()
+        for cmd in commands:
+            matcher.find_all(cmd)
+        matched = time.perf_counter() - start
+
+        print(f"  {size:>9} {loop_any * 1000:>10.1f}ms {loop_all * 1000:>12.1f}ms "
+              f"{matched * 1000:>10.1f}ms {build * 1000:>8.1f}ms")
+
+    print("="*72)
+
+
+if __name__ == "__main__":
+    if len(sys.argv) > 1 and sys.argv[1] == 'bench':
+        sizes = tuple(int(s) for s in sys.argv[2:]) or (8, 100, 1000, 10000, 50000)
+        benchmark(sizes)
+    else:
+        print("Usage: python3 keyword_matcher.py bench [listengrößen...]")
@@ -14,6 +14,20 @@ from pathlib import Path
 from collections import defaultdict
 import signal
 
+from proc_sampler import ProcessSampler
+from keyword_matcher import matcher_for
+from cpu_sampler import IntervalCpuSampler, CPU_MODE_INTERVAL
+from net_sockets import read_connections
+from event_log import EventLog
+from timeseries import TimeSeriesStore
+from check_scheduler import CheckScheduler, PRIORITY_CRITICAL, PRIORITY_NORMAL, PRIORITY_LOW
+from hash_index import open_index, DigestCache, executable_path, DEFAULT_INDEX_FILE
+from check_overhead import OverheadMeter, format_stats
+from resource_backend import open_backend
+from daemon_api import ApiState, ApiServer, DEFAULT_SOCKET, snapshot_to_api, connections_to_api
+from process_lineage import ProcessLineage, format_match
+from alert_pipeline import AlertPipeline, FIRING, RESOLVED, format_event, webhook_sink
+
 class KISicherheitsmann:
     def __init__(self):
         self.running = True
@@ -24,6 +38,14 @@ class KISicherheitsmann:
         self.log_file = Path.home() / ".ki_sicherheitsmann" / "security.log"
         self.report_dir = Path.home() / ".ki_sicherheitsmann" / "reports"
         self.config_file = Path.home() / ".ki_sicherheitsmann" / "config.json"
+        self.metrics_file = Path.home() / ".ki_sicherheitsmann" / "metrics.tsdb"
+        self.stats_file = Path.home() / ".ki_sicherheitsmann" / "stats.json"
+        self.sampler = ProcessSampler()
+        self.cpu_sampler = IntervalCpuSampler()
+        self.scheduler = None
+        self.meter = OverheadMeter()
+        self.api_server = None
+        self.latest = {}
         
         # Erstelle Verzeichnisse
         self.log_file.parent.mkdir(parents=True, exist_ok=True)
@@ -31,6 +53,35 @@ class KISicherheitsmann:
         
         # Lade Konfiguration
         self.config = self.load_config()
+        self.api_state = ApiState(max_alerts=self.config['alert_history'])  # Snapshot + Alerts für die Socket-API
+        
+        # Log: gepuffert, JSON-Lines, rotiert und komprimiert
+        self.event_log = EventLog(self.log_file,
+                                  max_bytes=self.config['log_max_bytes'],
+                                  max_age=self.config['log_rotate_interval'],
+                                  backups=self.config['log_backups'])
+        
+        # System-Ressourcen: /proc direkt (Linux), `top -l 1` (macOS) oder Fixture-Verzeichnis
+        self.resources = open_backend(self.config['resource_backend'])
+        
+        # Ressourcen-Zeitreihen (Ring-Buffer + mmap-Datei mit 1s/1min/1h-Stufen)
+        self.metrics = TimeSeriesStore(self.metrics_file, ['cpu', 'memory', 'load'])
+        
+        # Bekannte Schad-Hashes (read-only geteilter Index, siehe hash_index.py)
+        self.hash_index = open_index(self.config['known_bad_index'])
+        self.exe_digests = DigestCache()
+        self.hash_checked = {}  # (pid, start_time) -> Alert oder None, für bereits geprüfte Prozesse
+        
+        # Prozessbaum für Herkunfts-Regeln (None = Standardregeln aus process_lineage.py)
+        self.lineage = ProcessLineage(self.config.get("lineage_rules"))
+        
+        # Alerts: Fingerprint + Dedup; Log, Report, API und Slack nur bei Übergängen
+        sinks = [self.handle_alert_events]
+        if self.config.get("slack_webhook"):
+            sinks.append(webhook_sink(self.config["slack_webhook"]))
+        self.alert_pipeline = AlertPipeline(window=self.config['alert_window'],
+                                            reminder_interval=self.config['alert_reminder_interval'],
+                                            history=self.config['alert_history'], sinks=sinks)
         
         # Signal Handler für sauberes Beenden
         signal.signal(signal.SIGINT, self.signal_handler)
@@ -41,13 +92,33 @@ class KISicherheitsmann:
         default_config = {
             "scan_interval": 30,
             "cpu_threshold": 80.0,
+            "cpu_mode": "lifetime",  # "interval" = echte CPU% seit letztem Scan
             "memory_threshold": 90.0,
             "load_threshold": 5.0,
+            "pressure_threshold": 40.0,
+            "resource_backend": "auto",
             "alert_email": None,
+            "alert_window": 300,
+            "alert_reminder_interval": 3600,
+            "alert_history": 1000,
+            "slack_webhook": os.environ.get("SLACK_WEBHOOK_URL") or None,
             "suspicious_keywords": ["dartvm", "miner", "crypto", "backdoor", "trojan"],
+            "lineage_rules": None,
             "monitor_network": True,
             "monitor_processes": True,
-            "monitor_system": True
+            "monitor_system": True,
+            "log_max_bytes": 10485760,
+            "log_rotate_interval": 86400,
+            "log_backups": 5,
+            "trend_window": 300,
+            "check_intervals": {"processes": 30, "resources": 30, "network": 60},
+            "check_jitter": 0.1,
+            "load_backoff_threshold": 1.0,
+            "cpu_budget_percent": 10.0,
+            "stats_interval": 60,
+            "known_bad_index": DEFAULT_INDEX_FILE,
+            "api_enabled": True,
+            "api_socket": DEFAULT_SOCKET
         }
         
         if self.config_file.exists():
@@ -68,12 +139,11 @@ class KISicherheitsmann:
         """Sauberes Beenden"""
         self.log("🛑 Beende KI-Sicherheitsmann...")
         self.running = False
+        if self.scheduler is not None:
+            self.scheduler.stop()
     
     def log(self, message, level="INFO"):
-        """Logge Nachricht"""
-        timestamp = datetime.now().strftime("%Y-%m-%d %H:%M:%S")
-        log_entry = f"[{timestamp}] [{level}] {message}\n"
-        
+        """Logge Nachricht (auch aus dem Signal-Handler sicher)"""
         # Console Output
         if level == "ALERT":
             print(f"🚨 {message}")
@@ -82,12 +152,8 @@ class KISicherheitsmann:
         elif level == "INFO":
             print(f"ℹ️  {message}")
         
-        # File Log
-        try:
-            with open(self.log_file, 'a') as f:
-                f.write(log_entry)
-        except:
-            pass
+        # File Log (gepuffert, Hintergrund-Thread schreibt)
+        self.event_log.write(level, message)
     
     def run_command(self, cmd, timeout=5):
         """Führe System-Befehl aus"""
@@ -103,111 +169,161 @@ class KISicherheitsmann:
             return ""
     
     def check_system_resources(self):
-        """Prüfe System-Ressourcen"""
+        """Prüfe System-Ressourcen (Backend: /proc unter Linux, `top -l 1` unter macOS)"""
         if not self.config.get("monitor_system", True):
             return []
         
         alerts = []
+        resources = self.resources.sample()
+        sample = {'cpu': resources.cpu, 'memory': resources.memory, 'load': resources.load1}
+        self.publish(resources=resources._asdict())
         
         # CPU
-        cpu_info = self.run_command("top -l 1 | grep 'CPU usage'")
-        if cpu_info:
-            try:
-                cpu_user = float(cpu_info.split()[2].replace('%', ''))
-                if cpu_user > self.config.get("cpu_threshold", 80.0):
-                    alerts.append({
-                        "type": "HIGH_CPU",
-                        "severity": "WARNING",
-                        "message": f"Hohe CPU-Nutzung: {cpu_user}%",
-                        "value": cpu_user
-                    })
-            except:
-                pass
+        if resources.cpu is not None and resources.cpu > self.config.get("cpu_threshold", 80.0):
+            alerts.append({
+                "type": "HIGH_CPU",
+                "severity": "WARNING",
+                "message": f"Hohe CPU-Nutzung: {resources.cpu}%",
+                "value": resources.cpu
+            })
         
         # Memory
-        mem_info = self.run_command("top -l 1 | grep 'PhysMem'")
-        if mem_info:
-            try:
-                # Extrahiere Memory-Info
-                if "used" in mem_info:
-                    mem_parts = mem_info.split()
-                    for i, part in enumerate(mem_parts):
-                        if part == "used" and i + 1 < len(mem_parts):
-                            mem_used = mem_parts[i + 1].replace('G', '').replace('M', '')
-                            try:
-                                mem_used_num = float(mem_used)
-                                if mem_used_num > self.config.get("memory_threshold", 90.0):
-                                    alerts.append({
-                                        "type": "HIGH_MEMORY",
-                                        "severity": "WARNING",
-                                        "message": f"Hohe RAM-Nutzung: {mem_used_num}GB",
-                                        "value": mem_used_num
-                                    })
-                            except:
-                                pass
-            except:
-                pass
+        if resources.memory is not None and resources.memory > self.config.get("memory_threshold", 90.0):
+            alerts.append({
+                "type": "HIGH_MEMORY",
+                "severity": "WARNING",
+                "message": f"Hohe RAM-Nutzung: {resources.memory}% ({resources.memory_used_gb}GB)",
+                "value": resources.memory
+            })
         
         # Load Average
-        load_info = self.run_command("uptime")
-        if load_info:
-            try:
-                load_avg = load_info.split("load averages:")[1].split()[0].replace(',', '')
-                load_avg_num = float(load_avg)
-                if load_avg_num > self.config.get("load_threshold", 5.0):
-                    alerts.append({
-                        "type": "HIGH_LOAD",
-                        "severity": "WARNING",
-                        "message": f"Hohe Load Average: {load_avg_num}",
-                        "value": load_avg_num
-                    })
-            except:
-                pass
+        if resources.load1 is not None and resources.load1 > self.config.get("load_threshold", 5.0):
+            alerts.append({
+                "type": "HIGH_LOAD",
+                "severity": "WARNING",
+                "message": f"Hohe Load Average: {resources.load1}",
+                "value": resources.load1
+            })
+        
+        # Pressure Stall Information (Linux): Anteil der Zeit, in der Tasks warten mussten
+        for resource, value in resources.pressure.items():
+            if value > self.config.get("pressure_threshold", 40.0):
+                alerts.append({
+                    "type": "HIGH_PRESSURE",
+                    "severity": "WARNING",
+                    "resource": resource,
+                    "message": f"Ressourcen-Druck {resource}: {value}% (avg10)",
+                    "value": value
+                })
+        
+        # Werte speichern (Trends, Forensik) statt verwerfen
+        self.metrics.add(sample)
+        alerts.extend(self.check_resource_trends())
         
         return alerts
     
+    def check_resource_trends(self):
+        """Anhaltend hohe CPU: Median über `trend_window` Sekunden über dem Schwellwert"""
+        window = self.config.get("trend_window", 300)
+        stats = self.metrics.aggregate('cpu', window)
+        if not stats or stats['count'] < 3:
+            return []
+        threshold = self.config.get("cpu_threshold", 80.0)
+        if stats['p50'] <= threshold:
+            return []
+        return [{
+            "type": "SUSTAINED_HIGH_CPU",
+            "severity": "WARNING",
+            "message": f"Anhaltend hohe CPU-Nutzung: Median {stats['p50']:.1f}%, "
+                       f"p95 {stats['p95']:.1f}% über {window // 60} min",
+            "value": stats['p50']
+        }]
+    
     def check_processes(self):
         """Prüfe verdächtige Prozesse"""
         if not self.config.get("monitor_processes", True):
             return []
         
         alerts = []
-        suspicious_keywords = self.config.get("suspicious_keywords", [])
+        suspicious_keywords = matcher_for(self.config.get("suspicious_keywords", []))
+        
+        # Hole alle Prozesse (direkt aus /proc, kein ps-Fork)
+        snapshot = self.sampler.sample()
+        if self.config.get("cpu_mode") == CPU_MODE_INTERVAL:
+            snapshot = self.cpu_sampler.update(snapshot)
+        self.publish(processes=snapshot_to_api(snapshot))
+        
+        alerts.extend(self.check_known_bad_executables(snapshot))
+        alerts.extend(self.check_lineage(snapshot))
+        
+        for proc in snapshot:
+            pid = str(proc.pid)
+            cpu = proc.cpu
+            mem = proc.mem
+            cmd = proc.cmd
+            
+            # Prüfe auf hohe CPU
+            if cpu > self.config.get("cpu_threshold", 80.0):
+                # Prüfe auf verdächtige Keywords
+                is_suspicious = bool(suspicious_keywords.find_all(cmd))
+            
+                if is_suspicious or cpu > 90.0:
+                    alerts.append({
+                        "type": "SUSPICIOUS_PROCESS",
+                        "severity": "ALERT",
+                        "pid": pid,
+                        "cpu": cpu,
+                        "mem": mem,
+                        "cmd": cmd[:100],
+                        "message": f"Verdächtiger Prozess: PID {pid} ({cpu}% CPU) - {cmd[:50]}"
+                    })
         
-        # Hole alle Prozesse
-        processes = self.run_command("ps aux")
+        return alerts
+    
+    def check_lineage(self, snapshot):
+        """Herkunfts-Regeln (z.B. Shell unter Browser); der Index arbeitet nur das Delta ein"""
+        alerts = []
+        for match in self.lineage.update(snapshot):
+            alerts.append({
+                "type": f"LINEAGE_{match.rule.name.upper()}",
+                "severity": match.rule.severity,
+                "pid": str(match.proc.pid),
+                "cmd": match.proc.cmd[:100],
+                "ancestor": match.ancestor.cmd[:100],
+                "message": format_match(match, self.lineage)
+            })
+        return alerts
+    
+    def check_known_bad_executables(self, snapshot):
+        """Binärdateien neuer Prozesse gegen den Hash-Index prüfen (jede Datei einmal gehasht);
+        ein Treffer wird gemeldet, solange der Prozess läuft (erst danach gilt er als erledigt)"""
+        if self.hash_index is None:
+            return []
+        self.hash_index.refresh()
         
-        for line in processes.split('\n')[1:]:  # Skip header
-            if not line.strip():
+        alerts = []
+        current = {}
+        for proc in snapshot:
+            key = (proc.pid, proc.start_time)
+            if key in self.hash_checked:
+                current[key] = self.hash_checked[key]
+                if current[key] is not None:
+                    alerts.append(current[key])
                 continue
-            
-            parts = line.split()
-            if len(parts) >= 11:
-                try:
-                    pid = parts[1]
-                    cpu = float(parts[2])
-                    mem = float(parts[3])
-                    cmd = ' '.join(parts[10:])
-                    
-                    # Prüfe auf hohe CPU
-                    if cpu > self.config.get("cpu_threshold", 80.0):
-                        # Prüfe auf verdächtige Keywords
-                        cmd_lower = cmd.lower()
-                        is_suspicious = any(kw in cmd_lower for kw in suspicious_keywords)
-                        
-                        if is_suspicious or cpu > 90.0:
-                            alerts.append({
-                                "type": "SUSPICIOUS_PROCESS",
-                                "severity": "ALERT",
-                                "pid": pid,
-                                "cpu": cpu,
-                                "mem": mem,
-                                "cmd": cmd[:100],
-                                "message": f"Verdächtiger Prozess: PID {pid} ({cpu}% CPU) - {cmd[:50]}"
-                            })
-                except:
-                    pass
-        
+            current[key] = None
+            exe = executable_path(proc.pid, proc.cmd)
+            digest = self.exe_digests.digest(exe) if exe else None
+            if digest and digest in self.hash_index:
+                current[key] = {
+                    "type": "KNOWN_MALWARE",
+                    "severity": "ALERT",
+                    "pid": str(proc.pid),
+                    "cmd": proc.cmd[:100],
+                    "sha256": digest,
+                    "message": f"Bekannte Malware (Hash): PID {proc.pid} - {proc.cmd[:50]}"
+                }
+                alerts.append(current[key])
+        self.hash_checked = current
         return alerts
     
     def check_network(self):
@@ -217,9 +333,11 @@ class KISicherheitsmann:
         
         alerts = []
         
-        # Aktive Verbindungen
-        connections = self.run_command("netstat -an | grep ESTABLISHED")
-        connection_count = len([l for l in connections.split('\n') if l.strip()])
+        # Aktive Verbindungen + offene Ports (mit PIDs, für Clients der Socket-API)
+        connections = read_connections(protocols=('tcp', 'tcp6'), states={'ESTABLISHED', 'LISTEN'},
+                                       resolve_pids=True)
+        self.publish(connections=connections_to_api(connections))
+        connection_count = sum(1 for conn in connections if conn.state == 'ESTABLISHED')
         
         # Prüfe auf ungewöhnlich viele Verbindungen
         if connection_count > 100:
@@ -243,84 +361,142 @@ class KISicherheitsmann:
         with open(report_file, 'w') as f:
             f.write(f"# 🛡️ Security Report\n\n")
             f.write(f"**Datum:** {datetime.now().strftime('%Y-%m-%d %H:%M:%S')}\n\n")
-            f.write(f"**Gefundene Alerts:** {len(alerts)}\n\n")
+            f.write(f"**Vorfälle:** {len(alerts)}\n\n")
             f.write("---\n\n")
             
             # Gruppiere nach Severity
-            critical = [a for a in alerts if a.get("severity") == "ALERT"]
-            warnings = [a for a in alerts if a.get("severity") == "WARNING"]
+            active = [a for a in alerts if a.get("state") != RESOLVED]
+            critical = [a for a in active if a.get("severity") == "ALERT"]
+            warnings = [a for a in active if a.get("severity") == "WARNING"]
+            resolved = [a for a in alerts if a.get("state") == RESOLVED]
             
             if critical:
                 f.write("## 🚨 KRITISCHE ALERTS\n\n")
                 for alert in critical:
-                    f.write(f"- **{alert.get('type', 'UNKNOWN')}:** {alert.get('message', '')}\n")
+                    f.write(f"- **{alert.get('type', 'UNKNOWN')}:** {format_event(alert)}\n")
                 f.write("\n")
             
             if warnings:
                 f.write("## ⚠️ WARNINGS\n\n")
                 for alert in warnings:
-                    f.write(f"- **{alert.get('type', 'UNKNOWN')}:** {alert.get('message', '')}\n")
+                    f.write(f"- **{alert.get('type', 'UNKNOWN')}:** {format_event(alert)}\n")
+                f.write("\n")
+            
+            if resolved:
+                f.write("## ✅ ERLEDIGT\n\n")
+                for alert in resolved:
+                    f.write(f"- **{alert.get('type', 'UNKNOWN')}:** {format_event(alert)}\n")
                 f.write("\n")
         
         self.log(f"Report generiert: {report_file}")
     
-    def run_scan(self):
-        """Führe einen vollständigen Scan durch"""
-        self.log("🔍 Starte Security-Scan...")
-        
-        all_alerts = []
-        
-        # System-Ressourcen
-        system_alerts = self.check_system_resources()
-        all_alerts.extend(system_alerts)
-        
-        # Prozesse
-        process_alerts = self.check_processes()
-        all_alerts.extend(process_alerts)
-        
-        # Netzwerk
-        network_alerts = self.check_network()
-        all_alerts.extend(network_alerts)
-        
-        # Alerts loggen
-        for alert in all_alerts:
-            self.log(alert.get("message", "Unbekannter Alert"), alert.get("severity", "INFO"))
-        
-        # Report generieren (nur bei Alerts)
-        if all_alerts:
-            self.generate_report(all_alerts)
-        
-        return len(all_alerts)
+    def publish(self, **parts):
+        """Teile des Snapshots (processes/connections/resources) für die Socket-API ersetzen"""
+        self.latest.update(parts)
+        self.api_state.publish('snapshot', dict(self.latest))
+    
+    def start_api(self):
+        """Unix-Socket-API starten (python3 daemon_api.py ping|snapshot|alerts|metrics|stats)"""
+        if not self.config.get("api_enabled", True):
+            return
+        metric_names = ['cpu', 'memory', 'load']
+        handlers = {
+            'metrics': lambda request: {
+                metric: self.metrics.aggregate(metric, float(request.get('window', 300)))
+                for metric in request.get('metrics', metric_names) if metric in metric_names
+            },
+            'stats': lambda request: dict(self.meter.stats(), alerts=self.alert_pipeline.stats())
+        }
+        try:
+            self.api_server = ApiServer(self.api_state, self.config.get("api_socket", DEFAULT_SOCKET),
+                                        handlers).start()
+            self.log(f"Socket-API: {self.api_server.path}", "INFO")
+        except OSError as e:
+            self.api_server = None
+            self.log(f"Socket-API nicht verfügbar: {e}", "WARNING")
+    
+    def handle_alert_events(self, events):
+        """Sink der Alert-Pipeline: loggen, an die API geben, ein Report pro Stapel"""
+        self.api_state.add_alerts(events)
+        for event in events:
+            level = "INFO" if event['state'] == RESOLVED else event.get("severity", "INFO")
+            self.log(format_event(event), level)
+        self.generate_report(events)
+    
+    def scheduled_check(self, name, check):
+        """Check für den Scheduler: Alerts durch die Pipeline, neue Vorfälle zurückgeben
+        (nur sie verkürzen die Kadenz - ein Dauer-Alert hält den Check nicht im Minimum).
+        Übersprungene Läufe (Budget-Modus) lösen nichts auf, nur echte Läufe ohne den Vorfall."""
+        def job():
+            events = self.alert_pipeline.process(check(), source=name)
+            return [event for event in events if event['state'] == FIRING]
+        return job
+    
+    def write_stats(self):
+        """Eigenverbrauch pro Check nach stats.json (python3 check_overhead.py stats.json)"""
+        stats = self.meter.stats()
+        if self.scheduler is not None:
+            for name, info in self.scheduler.stats().items():
+                if name in stats['checks']:
+                    stats['checks'][name]['schedule'] = info
+        stats['process']['cpu_budget'] = self.config.get("cpu_budget_percent")
+        self.alert_pipeline.expire()  # Einmal-Events vergessen (Auflösung nur durch Check-Läufe)
+        stats['alerts'] = self.alert_pipeline.stats()
+        tmp = self.stats_file.with_suffix('.tmp')
+        with open(tmp, 'w') as f:
+            json.dump(stats, f, indent=2)
+        os.replace(tmp, self.stats_file)
+        return 0
+    
+    def build_scheduler(self):
+        """Eigene Kadenz pro Check; Prozesse haben Vorrang und werden unter Last nicht gebremst
+
+        Überschreitet der eigene CPU-Verbrauch cpu_budget_percent (eines Kerns),
+        wird der Netzwerk-Check übersprungen und der Ressourcen-Check gedrosselt.
+        """
+        intervals = self.config.get("check_intervals", {})
+        base = self.config.get("scan_interval", self.scan_interval)
+        jitter = self.config.get("check_jitter", 0.1)
+        scheduler = CheckScheduler(
+            load_threshold=self.config.get("load_backoff_threshold", 1.0),
+            on_error=lambda name, e: self.log(f"Fehler im Check {name}: {e}", "WARNING"),
+            meter=self.meter,
+            cpu_budget=self.config.get("cpu_budget_percent")
+        )
+        scheduler.add('processes', self.scheduled_check('processes', self.check_processes),
+                      intervals.get('processes', base), PRIORITY_CRITICAL, jitter)
+        scheduler.add('resources', self.scheduled_check('resources', self.check_system_resources),
+                      intervals.get('resources', base), PRIORITY_NORMAL, jitter)
+        scheduler.add('network', self.scheduled_check('network', self.check_network),
+                      intervals.get('network', base * 2), PRIORITY_LOW, jitter)
+        scheduler.add('stats', self.write_stats, self.config.get("stats_interval", 60),
+                      PRIORITY_CRITICAL, 0.0, run_now=False)
+        return scheduler
     
     def run(self):
-        """Haupt-Loop"""
+        """Haupt-Loop: Checks laufen einzeln nach ihrem adaptiven Zeitplan"""
         self.log("🛡️ KI-Sicherheitsmann gestartet", "INFO")
-        self.log(f"Scan-Intervall: {self.scan_interval} Sekunden", "INFO")
+        self.scheduler = self.build_scheduler()
+        self.start_api()
+        for name, info in self.scheduler.stats().items():
+            self.log(f"Check {name}: alle {info['interval']} Sekunden", "INFO")
         self.log(f"Log-Datei: {self.log_file}", "INFO")
         self.log(f"Report-Verzeichnis: {self.report_dir}", "INFO")
         
-        scan_count = 0
-        
-        while self.running:
-            try:
-                alert_count = self.run_scan()
-                scan_count += 1
-                
-                if alert_count > 0:
-                    self.log(f"Scan #{scan_count}: {alert_count} Alerts gefunden", "WARNING")
-                else:
-                    self.log(f"Scan #{scan_count}: System sauber", "INFO")
-                
-                # Warte bis zum nächsten Scan
-                time.sleep(self.scan_interval)
-                
-            except KeyboardInterrupt:
-                self.running = False
-                break
-            except Exception as e:
-                self.log(f"Fehler im Scan: {e}", "WARNING")
-                time.sleep(self.scan_interval)
-        
+        try:
+            self.scheduler.run(lambda: self.running)
+        except KeyboardInterrupt:
+            self.running = False
+        finally:
+            if self.api_server is not None:
+                self.api_server.stop()
+        
+        for name, info in self.scheduler.stats().items():
+            self.log(f"Check {name}: {info['runs']} Läufe, {info['alerts']} Alerts, "
+                     f"Kadenz zuletzt {info['interval']}s", "INFO")
+        self.write_stats()
+        for line in format_stats(self.meter.stats()).splitlines():
+            self.log(line.strip(), "INFO")
         self.log("🛑 KI-Sicherheitsmann beendet", "INFO")
 
 def main():
@@ -357,6 +533,10 @@ def main():
     try:
         sicherheitsmann.run()
     finally:
+        # Restliche Events schreiben (auch nach SIGTERM)
+        sicherheitsmann.event_log.close()
+        sicherheitsmann.metrics.close()
+        
         # Lösche PID-File beim Beenden
         if pid_file.exists():
             pid_file.unlink()
@@ -0,0 +1,266 @@
+#!/usr/bin/env python3
+"""
+📥 LOG INGEST - Inkrementelles Einlesen von System-Logs mit Cursorn
+Pro Quelle wird ein Cursor gespeichert (Datei: inode + Byte-Offset, journald:
+__CURSOR, macOS Unified Log: letzter Zeitstempel); jeder Lauf liest nur neue
+Einträge, gestreamt als Generator mit konstantem Speicher
+"""
+
+import os
+import sys
+import json
+import time
+import signal
+import threading
+import subprocess
+
+DEFAULT_CURSOR_FILE = 'log_cursors.json'
+
+
+class _StreamedCommand:
+    """Befehl als Zeilen-Generator; wird nach `timeout` Sekunden beendet"""
+
+    def __init__(self, args, timeout=15):
+        self.args = args
+        self.timeout = timeout
+
+    def _kill(self, proc):
+        try:
+            proc.send_signal(signal.SIGKILL)
+        except OSError:
+            pass
+
+    def lines(self):
+        try:
+            proc = subprocess.Popen(self.args, stdout=subprocess.PIPE, stderr=subprocess.DEVNULL,
+                                    text=True, errors='replace')
+        except OSError:
+            return
+        timer = threading.Timer(self.timeout, self._kill, (proc,))
+        timer.start()
+        try:
+            for line in proc.stdout:
+                yield line.rstrip('\n')
+        finally:
+            timer.cancel()
+            proc.stdout.close()
+            if proc.poll() is None:
+                proc.kill()
+            proc.wait()
+
+
+class FileSource:
+    """Klartext-Log; Cursor = (dev, inode, offset), erkennt Rotation und Kürzung"""
+
+    def __init__(self, path, name=None, severity='MEDIUM', initial_bytes=64 * 1024):
+        self.path = os.path.expanduser(path)
+        self.name = name or f'Log File: {path}'
+        self.key = f'file:{self.path}'
+        self.severity = severity
+        self.initial_bytes = initial_bytes
+
+    def available(self):
+        # /var/log/auth.log & Co. sind meist 0640 root:adm - ohne Leserecht gar nicht erst anbieten
+        return os.path.isfile(self.path) and os.access(self.path, os.R_OK)
+
+    def _read_from(self, path, offset, state):
+        """Vollständige Zeilen ab `offset`; state['offset'] folgt dem Gelesenen"""
+        with open(path, 'rb') as f:
+            f.seek(offset)
+            if offset and state.pop('skip_partial', False):
+                # Erster Lauf mitten in der Datei: angeschnittene Zeile verwerfen
+                partial = f.readline()
+                offset += len(partial)
+            for raw in f:
+                if not raw.endswith(b'\n'):
+                    break  # wird noch geschrieben - beim nächsten Lauf
+                offset += len(raw)
+                state['offset'] = offset
+                yield raw.rstrip(b'\r\n').decode('utf-8', 'replace')
+            state['offset'] = offset
+
+    def records(self, cursor, state):
+        st = os.stat(self.path)
+        state.update(dev=st.st_dev, ino=st.st_ino, offset=0)
+        if cursor and (cursor.get('dev'), cursor.get('ino')) == (st.st_dev, st.st_ino):
+            offset = cursor.get('offset', 0)
+            if offset > st.st_size:
+                offset = 0  # gekürzt (copytruncate)
+        elif cursor:
+            # Rotiert: Rest der alten Datei (logrotate: <path>.1) zuerst nachlesen
+            rotated = self.path + '.1'
+            try:
+                old = os.stat(rotated)
+                if (old.st_dev, old.st_ino) == (cursor.get('dev'), cursor.get('ino')):
+                    yield from self._read_from(rotated, cursor.get('offset', 0), {})
+            except OSError:
+                pass
+            offset = 0
+        else:
+            offset = max(0, st.st_size - self.initial_bytes)
+            state['skip_partial'] = True
+        yield from self._read_from(self.path, offset, state)
+        state.pop('skip_partial', None)
+
+
+class JournaldSource:
+    """systemd-journal über `journalctl -o json`; Cursor = __CURSOR des letzten Eintrags"""
+
+    def __init__(self, name, severity='MEDIUM', priority=None, kernel=False, identifiers=(),
+                 grep=None, initial_since='-2h', timeout=15):
+        self.name = name
+        self.key = f'journald:{name}'
+        self.severity = severity
+        self.priority = priority
+        self.kernel = kernel
+        self.identifiers = list(identifiers)
+        self.grep = grep.lower() if grep else None
+        self.initial_since = initial_since
+        self.timeout = timeout
+
+    def available(self):
+        return sys.platform.startswith('linux') and os.path.isdir('/run/systemd/journal')
+
+    def records(self, cursor, state):
+        args = ['journalctl', '--no-pager', '-o', 'json', '--output-fields=MESSAGE']
+        if cursor and cursor.get('cursor'):
+            args.append(f"--after-cursor={cursor['cursor']}")
+            state['cursor'] = cursor['cursor']
+        else:
+            args.append(f'--since={self.initial_since}')
+        if self.priority:
+            args.append(f'--priority={self.priority}')
+        if self.kernel:
+            args.append('--dmesg')
+        for identifier in self.identifiers:
+            args.append(f'--identifier={identifier}')
+
+        for line in _StreamedCommand(args, self.timeout).lines():
+            try:
+                entry = json.loads(line)
+            except ValueError:
+                continue
+            state['cursor'] = entry.get('__CURSOR', state.get('cursor'))
+            message = entry.get('MESSAGE')
+            if isinstance(message, list):  # Binärfelder kommen als Byte-Liste
+                message = bytes(message).decode('utf-8', 'replace')
+            if message and (self.grep is None or self.grep in message.lower()):
+                yield message
+
+
+class UnifiedLogSource:
+    """macOS `log show --style ndjson`; Cursor = Zeitstempel des letzten Eintrags"""
+
+    def __init__(self, name, predicate, severity='MEDIUM', initial_last='2h', timeout=15):
+        self.name = name
+        self.key = f'unified:{name}'
+        self.predicate = predicate
+        self.severity = severity
+        self.initial_last = initial_last
+        self.timeout = timeout
+
+    def available(self):
+        return sys.platform == 'darwin'
+
+    def records(self, cursor, state):
+        args = ['log', 'show', '--style', 'ndjson', '--predicate', self.predicate]
+        since = cursor.get('timestamp') if cursor else None
+        if since:
+            # `--start` hat Sekunden-Auflösung: bereits gesehene Einträge überspringen
+            args += ['--start', since[:19]]
+            state['timestamp'] = since
+        else:
+            args += ['--last', self.initial_last]
+
+        for line in _StreamedCommand(args, self.timeout).lines():
+            try:
+                entry = json.loads(line)
+            except ValueError:
+                continue
+            timestamp = entry.get('timestamp')
+            if not timestamp or (since and timestamp <= since):
+                continue
+            state['timestamp'] = timestamp
+            message = entry.get('eventMessage')
+            if message:
+                yield message
+
+
+class LogIngester:
+    """Verwaltet Cursor (JSON-Datei) und liefert pro Quelle nur neue Zeilen"""
+
+    def __init__(self, cursor_file=DEFAULT_CURSOR_FILE):
+        self.cursor_file = cursor_file
+        self.cursors = {}
+        self.stats = {}
+        try:
+            with open(cursor_file, 'r') as f:
+                self.cursors = json.load(f)
+        except (OSError, ValueError):
+            pass
+
+    def read(self, source):
+        """Neue Zeilen einer Quelle; der Cursor rückt erst nach vollständigem Lesen vor.
+        Lesefehler (z.B. fehlende Rechte) überspringen nur diese Quelle."""
+        state = {}
+        start = time.perf_counter()
+        count = 0
+        try:
+            for line in source.records(self.cursors.get(source.key), state):
+                count += 1
+                yield line
+        except OSError as e:
+            self.stats[source.key] = {'lines': count, 'seconds': round(time.perf_counter() - start, 3),
+                                      'error': str(e)}
+            return
+        state.pop('skip_partial', None)
+        if state:
+            self.cursors[source.key] = state
+        self.stats[source.key] = {'lines': count, 'seconds': round(time.perf_counter() - start, 3)}
+
+    def save(self):
+        """Cursor atomar schreiben"""
+        tmp = f'{self.cursor_file}.tmp'
+        with open(tmp, 'w') as f:
+            json.dump(self.cursors, f, indent=2)
+        os.replace(tmp, self.cursor_file)
+
+
+def default_sources():
+    """Quellen für die aktuelle Plattform (nur vorhandene)"""
+    if sys.platform == 'darwin':
+        sources = [
+            UnifiedLogSource('System Errors',
+                             'eventMessage contains "error" OR eventMessage contains "Error" OR eventMessage contains "ERROR"',
+                             'HIGH'),
+            UnifiedLogSource('Security Events',
+                             'subsystem == "com.apple.security" OR subsystem == "com.apple.network"', 'MEDIUM'),
+            UnifiedLogSource('Firewall Events', 'process == "socketfilterfw"', 'MEDIUM'),
+            UnifiedLogSource('Kernel Panics', 'eventMessage contains "panic" OR eventMessage contains "Panic"',
+                             'CRITICAL', initial_last='24h'),
+            FileSource('/var/log/system.log'),
+            FileSource('/var/log/install.log'),
+        ]
+    else:
+        sources = [
+            JournaldSource('System Errors', 'HIGH', priority='err'),
+            JournaldSource('Security Events', 'MEDIUM', identifiers=('sshd', 'sudo', 'su', 'polkitd')),
+            JournaldSource('Kernel Panics', 'CRITICAL', kernel=True, grep='panic', initial_since='-24h'),
+            FileSource('/var/log/syslog'),
+            FileSource('/var/log/auth.log'),
+            FileSource('/var/log/kern.log'),
+            FileSource('/var/log/messages'),
+            FileSource('/var/log/secure'),
+        ]
+    return [source for source in sources if source.available()]
+
+
+if __name__ == "__main__":
+    cursor_file = sys.argv[1] if len(sys.argv) > 1 else DEFAULT_CURSOR_FILE
+    ingester = LogIngester(cursor_file)
+    for source in default_sources():
+        count = sum(1 for _ in ingester.read(source))
+        error = ingester.stats[source.key].get('error')
+        print(f"📥 {source.name:<40} {count:>8} neue Zeilen" + (f"  ⚠️  {error}" if error else ""))
+    ingester.save()
+    print(f"💾 Cursor gespeichert: {cursor_file}")
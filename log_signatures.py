@@ -0,0 +1,327 @@
+#!/usr/bin/env python3
+"""
+🧬 LOG SIGNATURES - Vorkompilierte Signaturen für Log-Anomalien
+Benannte Regex-/Literal-Signaturen mit Schweregrad aus log_signatures.json,
+kompiliert zu einem gemeinsamen Literal-Vorfilter (blockweise per str.find);
+Regexe laufen nur auf Kandidaten-Zeilen; Zähler und Beispiele pro Signatur
+mit begrenztem Speicher
+"""
+
+import os
+import re
+import sys
+import json
+import time
+import random
+from bisect import bisect_right
+from itertools import accumulate, islice
+from collections import Counter
+
+DEFAULT_RULES_FILE = os.path.join(os.path.dirname(os.path.abspath(__file__)), 'log_signatures.json')
+
+SEVERITY_ORDER = {'LOW': 0, 'MEDIUM': 1, 'HIGH': 2, 'CRITICAL': 3}
+
+_LITERAL_CHARS = set('abcdefghijklmnopqrstuvwxyzABCDEFGHIJKLMNOPQRSTUVWXYZ0123456789 :_-/=\'"<>,;@#%&!')
+
+
+def required_literals(pattern, min_length=3, lower=True):
+    """Pflicht-Literale einer Regex (eines pro Top-Level-Alternative) oder None
+
+    Konservativ: nur Text außerhalb von Gruppen/Klassen, ohne Quantor dahinter.
+    None heißt: keine sichere Vorfilterung möglich, Regex läuft für jede Zeile.
+    """
+    branches = []
+    best = current = ''
+    depth = 0
+    i = 0
+    while i <= len(pattern):
+        ch = pattern[i] if i < len(pattern) else '|'
+        if ch == '\\' and i + 1 < len(pattern):
+            nxt = pattern[i + 1]
+            if not depth and not nxt.isalnum():
+                current += nxt
+            else:
+                best, current = max(best, current, key=len), ''
+            i += 2
+            continue
+        if ch in '([':
+            depth += 1
+            best, current = max(best, current, key=len), ''
+        elif ch in ')]':
+            depth -= 1
+            current = ''
+        elif depth:
+            pass
+        elif ch == '|':
+            branches.append(max(best, current, key=len))
+            best = current = ''
+        elif ch in '?*{':
+            best, current = max(best, current[:-1], key=len), ''
+            if ch == '{':  # {m,n} überspringen - kein Literal
+                i = pattern.find('}', i) if '}' in pattern[i:] else len(pattern) - 1
+        elif ch in _LITERAL_CHARS:
+            current += ch
+        else:
+            best, current = max(best, current, key=len), ''
+        i += 1
+    if any(len(b) < min_length for b in branches):
+        return None
+    return [b.lower() for b in branches] if lower else branches
+
+
+class Signature:
+    __slots__ = ('name', 'pattern', 'kind', 'severity', 'ignore_case', 'prefilter', 'regex')
+
+    def __init__(self, name, pattern, kind='regex', severity='MEDIUM', ignore_case=True, prefilter=None):
+        if kind not in ('regex', 'literal'):
+            raise ValueError(f'Signatur {name}: unbekannter Typ {kind}')
+        if severity not in SEVERITY_ORDER:
+            raise ValueError(f'Signatur {name}: unbekannter Schweregrad {severity}')
+        self.name = name
+        self.pattern = pattern
+        self.kind = kind
+        self.severity = severity
+        self.ignore_case = ignore_case
+        if prefilter is None:
+            prefilter = [pattern.lower()] if kind == 'literal' else required_literals(pattern)
+        self.prefilter = [p.lower() for p in prefilter] if prefilter else None
+
+        body = re.escape(pattern) if kind == 'literal' else pattern
+        self.regex = re.compile(body, re.IGNORECASE if ignore_case else 0)
+
+
+class SignatureTally:
+    """Zähler + Beispiele für einen Scan (Beispiele: Reservoir-Sampling, fest begrenzt)"""
+
+    def __init__(self, engine, max_exemplars=5, max_line_length=300):
+        self.engine = engine
+        self.max_exemplars = max_exemplars
+        self.max_line_length = max_line_length
+        self.counts = Counter()
+        self.exemplars = {}
+        self.lines = 0
+        self.matched_lines = 0
+        self.first_matches = []  # erste Treffer-Zeilen in Log-Reihenfolge
+        self._random = random.Random(0)
+
+    def _record(self, line, names):
+        self.matched_lines += 1
+        line = line[:self.max_line_length]
+        if len(self.first_matches) < self.max_exemplars:
+            self.first_matches.append(line)
+        for name in names:
+            self.counts[name] += 1
+            samples = self.exemplars.setdefault(name, [])
+            if len(samples) < self.max_exemplars:
+                samples.append(line)
+            else:
+                slot = self._random.randrange(self.counts[name])
+                if slot < self.max_exemplars:
+                    samples[slot] = line
+
+    def add(self, line):
+        """Eine Zeile klassifizieren und zählen"""
+        self.lines += 1
+        names = self.engine.classify(line)
+        if names:
+            self._record(line, names)
+        return names
+
+    def _feed_batch(self, batch):
+        self.lines += len(batch)
+        engine = self.engine
+        text = '\n'.join(batch).lower()
+        # Zeilenende-Offsets (inkl. '\n'), komplett in C berechnet
+        ends = list(accumulate(map((1).__add__, map(len, batch))))
+        if len(text) + 1 != ends[-1]:
+            # lower() hat Längen verändert (z.B. 'İ'): Offsets passen nicht, Zeile für Zeile
+            for line in batch:
+                names = engine.classify(line)
+                if names:
+                    self._record(line, names)
+            return
+
+        # Zeile -> Signaturen, deren Pflicht-Literal im Block gefunden wurde
+        candidates = {}
+        for literal, indices in engine.anchors:
+            pos = text.find(literal)
+            while pos != -1:
+                index = bisect_right(ends, pos)
+                candidates.setdefault(index, set()).update(indices)
+                pos = text.find(literal, ends[index])
+        if engine.unanchored:
+            for index in range(len(batch)):
+                candidates.setdefault(index, set()).update(engine.unanchored)
+
+        for index in sorted(candidates):
+            names = engine.verify(batch[index], candidates[index])
+            if names:
+                self._record(batch[index], names)
+
+    def feed(self, lines, batch_size=4096):
+        """Viele Zeilen klassifizieren: Vorfilter läuft blockweise über den Text (str.find in C)"""
+        iterator = iter(lines)
+        while True:
+            batch = list(islice(iterator, batch_size))
+            if not batch:
+                return self
+            self._feed_batch(batch)
+
+    def max_severity(self):
+        if not self.counts:
+            return None
+        return max((self.engine.by_name[n].severity for n in self.counts), key=SEVERITY_ORDER.get)
+
+    def summary(self):
+        """{Name: {'count', 'severity', 'exemplars'}} sortiert nach Schweregrad, dann Anzahl"""
+        names = sorted(self.counts, key=lambda n: (-SEVERITY_ORDER[self.engine.by_name[n].severity],
+                                                   -self.counts[n], n))
+        return {
+            name: {
+                'count': self.counts[name],
+                'severity': self.engine.by_name[name].severity,
+                'exemplars': list(self.exemplars[name])
+            }
+            for name in names
+        }
+
+
+class LogSignatureEngine:
+    """Alle Signaturen hinter einem gemeinsamen Literal-Vorfilter
+
+    Jede Signatur hat Pflicht-Literale (automatisch abgeleitet oder per
+    "prefilter" im Regelwerk); der Regex einer Signatur läuft nur auf Zeilen,
+    in denen eines ihrer Literale vorkommt - die meisten Zeilen treffen nichts.
+    Eine Zeile bekommt alle passenden Signaturen (in Regelwerk-Reihenfolge).
+    """
+
+    def __init__(self, signatures):
+        self.signatures = list(signatures)
+        if not self.signatures:
+            raise ValueError('Keine Signaturen definiert')
+        self.by_name = {}
+        for signature in self.signatures:
+            if signature.name in self.by_name:
+                raise ValueError(f'Signatur doppelt: {signature.name}')
+            self.by_name[signature.name] = signature
+
+        # Literale, die ein kürzeres enthalten, sind redundant ('i/o error' ⊃ 'error'):
+        # das kürzere Literal übernimmt deren Signaturen
+        literals = sorted({p for s in self.signatures if s.prefilter for p in s.prefilter}, key=len)
+        minimal = []
+        for literal in literals:
+            if not any(shorter in literal for shorter in minimal):
+                minimal.append(literal)
+        anchors = {literal: set() for literal in minimal}
+        for index, signature in enumerate(self.signatures):
+            for literal in signature.prefilter or ():
+                for anchor in minimal:
+                    if anchor in literal:
+                        anchors[anchor].add(index)
+        self.anchors = [(literal, frozenset(indices)) for literal, indices in anchors.items()]
+        self.unanchored = frozenset(i for i, s in enumerate(self.signatures) if not s.prefilter)
+
+    @classmethod
+    def from_file(cls, path=DEFAULT_RULES_FILE):
+        with open(path, 'r') as f:
+            data = json.load(f)
+        return cls(
+            Signature(rule['name'], rule['pattern'], rule.get('type', 'regex'),
+                      rule.get('severity', 'MEDIUM'), rule.get('ignore_case', True),
+                      prefilter=rule.get('prefilter'))
+            for rule in data.get('signatures', [])
+        )
+
+    def verify(self, line, indices):
+        """Regexe der Kandidaten-Signaturen prüfen"""
+        signatures = self.signatures
+        return [signatures[i].name for i in sorted(indices) if signatures[i].regex.search(line)]
+
+    def classify(self, line):
+        """Namen aller Signaturen, die in der Zeile vorkommen"""
+        low = line.lower()
+        indices = set(self.unanchored)
+        for literal, anchored in self.anchors:
+            if literal in low:
+                indices |= anchored
+        return self.verify(line, indices) if indices else []
+
+    def tally(self, max_exemplars=5):
+        return SignatureTally(self, max_exemplars)
+
+
+_engines = {}
+
+
+def load_engine(path=DEFAULT_RULES_FILE):
+    """Engine pro Regeldatei cachen; neu kompilieren, wenn sich die Datei ändert"""
+    st = os.stat(path)
+    key = (st.st_ino, st.st_size, st.st_mtime_ns)
+    cached = _engines.get(path)
+    if cached is None or cached[0] != key:
+        cached = _engines[path] = (key, LogSignatureEngine.from_file(path))
+    return cached[1]
+
+
+def _synthetic_lines(count, hit_ratio=0.02, seed=7):
+    rng = random.Random(seed)
+    normal = [
+        'Oct 18 08:00:01 host CRON[1234]: (root) CMD (run-parts /etc/cron.hourly)',
+        'Oct 18 08:00:02 host systemd[1]: Started Session 42 of user alice.',
+        'Oct 18 08:00:03 host kernel: [12345.678] usb 1-1: new high-speed USB device number 3',
+        'Oct 18 08:00:04 host NetworkManager[812]: <info>  [1697616004.1234] dhcp4 (eth0): state changed',
+    ]
+    hits = [
+        'Oct 18 08:00:05 host sshd[999]: Failed password for invalid user admin from 203.0.113.9 port 4242 ssh2',
+        'Oct 18 08:00:06 host kernel: [99.1] app[4321]: segfault at 0 ip 000055 sp 00007ff error 4',
+        'Oct 18 08:00:07 host myapp[77]: ERROR could not connect to database',
+        'Oct 18 08:00:08 host systemd[1]: backup.service: Failed with result exit-code.',
+    ]
+    return [rng.choice(hits) if rng.random() < hit_ratio else rng.choice(normal) for _ in range(count)]
+
+
+def benchmark(count=500000):
+    """Zeilen/s: bisheriger Ansatz (zweimal lower()) gegen kombinierten Regex"""
+    lines = _synthetic_lines(count)
+    total_bytes = sum(len(l) for l in lines)
+
+    start = time.perf_counter()
+    naive = len([l for l in lines if 'error' in l.lower() or 'fail' in l.lower()])
+    naive_time = time.perf_counter() - start
+
+    engine = load_engine()
+    start = time.perf_counter()
+    tally = engine.tally().feed(lines)
+    engine_time = time.perf_counter() - start
+
+    # Gleiche Aufgabe wie der bisherige Ansatz: nur 'error'/'fail'
+    minimal = LogSignatureEngine([Signature('error', 'error', 'literal'), Signature('fail', 'fail', 'literal')])
+    start = time.perf_counter()
+    minimal_tally = minimal.tally().feed(lines)
+    minimal_time = time.perf_counter() - start
+
+    print(f"🧬 {count} Zeilen ({total_bytes / 1e6:.1f} MB), {len(engine.signatures)} Signaturen")
+    print(f"  lower()-Vergleich: {count / naive_time:>12,.0f} Zeilen/s  ({naive} Treffer, nur Anzahl)")
+    print(f"  Engine error/fail: {count / minimal_time:>12,.0f} Zeilen/s  ({minimal_tally.matched_lines} Treffer)")
+    print(f"  Signatur-Engine:   {count / engine_time:>12,.0f} Zeilen/s  ({tally.matched_lines} Treffer, "
+          f"{len(tally.counts)} Signaturen klassifiziert)")
+
+
+if __name__ == "__main__":
+    if len(sys.argv) > 1 and sys.argv[1] == 'bench':
+        benchmark(int(sys.argv[2]) if len(sys.argv) > 2 else 500000)
+    elif len(sys.argv) > 1:
+        engine = load_engine()
+        tally = engine.tally()
+        start = time.perf_counter()
+        with open(sys.argv[1], 'r', encoding='utf-8', errors='replace') as f:
+            tally.feed(f)
+        elapsed = time.perf_counter() - start
+        print(f"🧬 {tally.lines} Zeilen in {elapsed:.2f}s ({tally.lines / max(elapsed, 1e-9):,.0f} Zeilen/s), "
+              f"{tally.matched_lines} Treffer")
+        for name, info in tally.summary().items():
+            print(f"  [{info['severity']:<8}] {name:<20} {info['count']:>8}")
+            for sample in info['exemplars'][:2]:
+                print(f"      {sample.rstrip()[:120]}")
+    else:
+        print("Usage: python3 log_signatures.py <logfile> | bench [zeilen]")
@@ -0,0 +1,205 @@
+#!/usr/bin/env python3
+"""
+🔌 NET SOCKETS - Socket-Tabelle direkt aus /proc/net (ersetzt netstat/lsof)
+Liest tcp/tcp6/udp/udp6, dekodiert Adressen gebündelt, ordnet Inodes über einen
+gecachten /proc/*/fd-Index den Prozessen zu
+"""
+
+import os
+import sys
+import time
+import socket
+import struct
+import subprocess
+from collections import namedtuple
+
+Connection = namedtuple('Connection', [
+    'proto',        # 'tcp' | 'tcp6' | 'udp' | 'udp6'
+    'local_ip',     # str
+    'local_port',   # int
+    'remote_ip',    # str
+    'remote_port',  # int
+    'state',        # 'ESTABLISHED', 'LISTEN', ... (UDP: 'UNCONN'/'ESTABLISHED')
+    'inode',        # int (0 im netstat-Fallback)
+    'uid',          # int oder None
+    'pid',          # int oder None (nur mit resolve_pids=True)
+])
+
+TCP_STATES = {
+    '01': 'ESTABLISHED', '02': 'SYN_SENT', '03': 'SYN_RECV', '04': 'FIN_WAIT1',
+    '05': 'FIN_WAIT2', '06': 'TIME_WAIT', '07': 'CLOSE', '08': 'CLOSE_WAIT',
+    '09': 'LAST_ACK', '0A': 'LISTEN', '0B': 'CLOSING', '0C': 'NEW_SYN_RECV',
+}
+UDP_STATES = {'01': 'ESTABLISHED', '07': 'UNCONN'}
+
+PROTOCOLS = ('tcp', 'tcp6', 'udp', 'udp6')
+
+
+def format_endpoint(ip, port):
+    """ip:port, IPv6 in Klammern ([::1]:443)"""
+    if ':' in ip:
+        return f'[{ip}]:{port}'
+    return f'{ip}:{port}'
+
+
+class SocketOwnerIndex:
+    """Inode -> PID über /proc/*/fd; neu aufgebaut nur bei unbekannten Inodes"""
+
+    def __init__(self, proc_root='/proc', min_rescan_interval=2.0):
+        self.proc_root = proc_root
+        self.min_rescan_interval = min_rescan_interval
+        self._owners = {}
+        self._last_scan = 0.0
+
+    def _rescan(self):
+        owners = {}
+        root = self.proc_root
+        try:
+            pids = [e for e in os.listdir(root) if e.isdigit()]
+        except OSError:
+            pids = []
+        for pid in pids:
+            fd_dir = f'{root}/{pid}/fd'
+            try:
+                fds = os.listdir(fd_dir)
+            except OSError:
+                continue  # fremder Prozess ohne Rechte oder bereits beendet
+            for fd in fds:
+                try:
+                    target = os.readlink(f'{fd_dir}/{fd}')
+                except OSError:
+                    continue
+                if target.startswith('socket:['):
+                    owners[int(target[8:-1])] = int(pid)
+        self._owners = owners
+        self._last_scan = time.monotonic()
+
+    def owners(self, inodes):
+        """PID pro Inode (fehlende Inodes -> None)"""
+        missing = [i for i in inodes if i and i not in self._owners]
+        if missing and time.monotonic() - self._last_scan >= self.min_rescan_interval:
+            self._rescan()
+        return {i: self._owners.get(i) for i in inodes}
+
+
+class SocketTableReader:
+    """Liest die Socket-Tabellen als typisierte Connection-Records"""
+
+    def __init__(self, proc_root='/proc'):
+        self.proc_root = proc_root
+        self.use_proc = os.path.exists(os.path.join(proc_root, 'net', 'tcp'))
+        self.owner_index = SocketOwnerIndex(proc_root)
+        self._addr_cache = {}
+
+    def _decode(self, hex_addr):
+        """Hex-Adresse aus /proc/net/* -> (ip, port), Adressen werden gecacht"""
+        addr, _, port_hex = hex_addr.partition(':')
+        ip = self._addr_cache.get(addr)
+        if ip is None:
+            raw = bytes.fromhex(addr)
+            if len(raw) == 4:
+                ip = socket.inet_ntop(socket.AF_INET, raw[::-1])
+            else:
+                # IPv6: vier 32-Bit-Wörter in Host-Byte-Order (little endian)
+                words = struct.unpack('<4I', raw)
+                ip = socket.inet_ntop(socket.AF_INET6, struct.pack('>4I', *words))
+            if len(self._addr_cache) > 65536:
+                self._addr_cache.clear()
+            self._addr_cache[addr] = ip
+        return ip, int(port_hex, 16)
+
+    def read(self, protocols=PROTOCOLS, states=None, resolve_pids=False):
+        """Alle Verbindungen, optional gefiltert nach Zustand (z.B. {'LISTEN'})"""
+        if not self.use_proc:
+            return self._read_netstat(protocols, states)
+
+        connections = []
+        for proto in protocols:
+            state_map = TCP_STATES if proto.startswith('tcp') else UDP_STATES
+            try:
+                with open(os.path.join(self.proc_root, 'net', proto), 'r') as f:
+                    lines = f.read().split('\n')[1:]
+            except OSError:
+                continue
+            for line in lines:
+                parts = line.split()
+                if len(parts) < 10:
+                    continue
+                state = state_map.get(parts[3], parts[3])
+                if states is not None and state not in states:
+                    continue
+                try:
+                    local_ip, local_port = self._decode(parts[1])
+                    remote_ip, remote_port = self._decode(parts[2])
+                    connections.append(Connection(
+                        proto, local_ip, local_port, remote_ip, remote_port,
+                        state, int(parts[9]), int(parts[7]), None
+                    ))
+                except (ValueError, OSError):
+                    continue
+
+        if resolve_pids and connections:
+            owners = self.owner_index.owners([c.inode for c in connections])
+            connections = [c._replace(pid=owners.get(c.inode)) for c in connections]
+        return connections
+
+    def _read_netstat(self, protocols, states):
+        """macOS/BSD-Fallback: ein `netstat -an` ohne Shell-Pipeline, IPv6-sicher"""
+        try:
+            result = subprocess.run(['netstat', '-an'], capture_output=True, text=True, timeout=10)
+            stdout = result.stdout
+        except (OSError, subprocess.SubprocessError):
+            return []
+
+        connections = []
+        for line in stdout.split('\n'):
+            parts = line.split()
+            if len(parts) < 5:
+                continue
+            proto = parts[0].lower()
+            if proto in ('tcp4', 'udp4'):
+                proto = proto[:3]
+            elif proto == 'tcp46':
+                proto = 'tcp6'
+            elif proto == 'udp46':
+                proto = 'udp6'
+            if proto not in protocols:
+                continue
+            state = parts[5] if len(parts) > 5 and proto.startswith('tcp') else 'UNCONN'
+            if states is not None and state not in states:
+                continue
+            local_ip, local_port = _split_netstat_endpoint(parts[3])
+            remote_ip, remote_port = _split_netstat_endpoint(parts[4])
+            connections.append(Connection(
+                proto, local_ip, local_port, remote_ip, remote_port, state, 0, None, None
+            ))
+        return connections
+
+
+def _split_netstat_endpoint(endpoint):
+    """'1.2.3.4.443' (BSD), '1.2.3.4:443' (Linux), 'fe80::1%lo0.443', '*.*'"""
+    sep = '.' if endpoint.count(':') != 1 and not endpoint.startswith('[') else ':'
+    host, _, port = endpoint.rpartition(sep)
+    host = host.strip('[]')
+    try:
+        return host, int(port)
+    except ValueError:
+        return host or endpoint, 0
+
+
+_default_reader = None
+
+
+def read_connections(protocols=PROTOCOLS, states=None, resolve_pids=False):
+    """Verbindungen mit dem geteilten Standard-Reader"""
+    global _default_reader
+    if _default_reader is None:
+        _default_reader = SocketTableReader()
+    return _default_reader.read(protocols, states, resolve_pids)
+
+
+if __name__ == "__main__":
+    wanted = set(sys.argv[1:]) or None
+    for conn in read_connections(states=wanted, resolve_pids=True):
+        print(f"{conn.proto:<5} {conn.state:<12} {format_endpoint(conn.local_ip, conn.local_port):<40} "
+              f"{format_endpoint(conn.remote_ip, conn.remote_port):<40} pid={conn.pid}")
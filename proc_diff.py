@@ -0,0 +1,81 @@
+#!/usr/bin/env python3
+"""
+🔀 PROC DIFF - Inkrementeller Prozesstabellen-Vergleich
+Zustand pro (pid, start_time): nur Spawned/Exited/Changed-Events pro Zyklus
+"""
+
+import time
+from collections import namedtuple
+
+SPAWNED = 'spawned'
+EXITED = 'exited'
+CHANGED = 'changed'
+
+# proc = aktueller ProcInfo (bei EXITED der letzte bekannte), previous = Vergleichsbasis
+ProcessEvent = namedtuple('ProcessEvent', ['kind', 'key', 'proc', 'previous'])
+
+
+def process_key(proc):
+    """Eindeutiger Schlüssel trotz PID-Wiederverwendung"""
+    return (proc.pid, proc.start_time)
+
+
+class ProcessTableDiffer:
+    """Hält die Prozesstabelle zwischen Zyklen und liefert nur das Delta"""
+
+    def __init__(self, cpu_delta=5.0, rss_delta_kb=51200,
+                 change_fields=('cmd', 'ppid', 'uid')):
+        self.cpu_delta = cpu_delta
+        self.rss_delta_kb = rss_delta_kb
+        self.change_fields = change_fields
+        # key -> zuletzt gemeldeter ProcInfo (Vergleichsbasis für CHANGED)
+        self.table = {}
+        # key -> Zeitpunkt der ersten Sichtung
+        self.first_seen = {}
+
+    def __len__(self):
+        return len(self.table)
+
+    def _changed(self, old, new):
+        for field in self.change_fields:
+            if getattr(old, field) != getattr(new, field):
+                return True
+        if abs(new.cpu - old.cpu) >= self.cpu_delta:
+            return True
+        return abs(new.rss_kb - old.rss_kb) >= self.rss_delta_kb
+
+    def update(self, snapshot):
+        """Vergleiche Snapshot mit dem bekannten Zustand, liefere Events"""
+        now = snapshot.timestamp
+        table = self.table
+        events = []
+        seen = set()
+
+        for proc in snapshot:
+            key = (proc.pid, proc.start_time)
+            seen.add(key)
+            old = table.get(key)
+            if old is None:
+                table[key] = proc
+                self.first_seen[key] = now
+                events.append(ProcessEvent(SPAWNED, key, proc, None))
+            elif self._changed(old, proc):
+                # Basis nur bei gemeldeter Änderung verschieben, damit
+                # langsame Drift irgendwann die Schwelle überschreitet
+                table[key] = proc
+                events.append(ProcessEvent(CHANGED, key, proc, old))
+
+        if len(seen) != len(table):
+            for key in [k for k in table if k not in seen]:
+                events.append(ProcessEvent(EXITED, key, table.pop(key), None))
+                self.first_seen.pop(key, None)
+
+        return events
+
+    def age(self, key, now=None):
+        """Sekunden seit der ersten Sichtung des Prozesses"""
+        first = self.first_seen.get(key)
+        if first is None:
+            return 0
+        return (now or time.time()) - first
+
@@ -0,0 +1,376 @@
+#!/usr/bin/env python3
+"""
+⚡ PROC EVENTS - Ereignisgesteuerte Prozess-Überwachung (fork/exec/exit)
+Linux Netlink Proc Connector; Fallback: adaptives /proc-Polling; Replay aus Fixtures
+
+Fixture-Format (JSON-Lines, eine Zeile pro Event, `t` = Sekunden seit Start):
+    {"t": 0.000, "kind": "exec", "pid": 4242, "ppid": 1, "start_time": 0, "cmd": "/tmp/xmrig -o pool"}
+    {"t": 0.350, "kind": "exit", "pid": 4242, "ppid": 0, "start_time": 0, "cmd": ""}
+"""
+
+import os
+import sys
+import json
+import time
+import errno
+import shutil
+import select
+import socket
+import struct
+import tempfile
+from collections import namedtuple
+
+from proc_sampler import ProcessSampler
+from proc_diff import ProcessTableDiffer, SPAWNED, EXITED, CHANGED
+
+FORK = 'fork'
+EXEC = 'exec'
+EXIT = 'exit'
+
+# timestamp = time.time() beim Eintreffen bzw. Replay-Zeitpunkt
+ProcEvent = namedtuple('ProcEvent', ['kind', 'pid', 'ppid', 'start_time', 'cmd', 'timestamp'])
+
+# linux/netlink.h, linux/connector.h, linux/cn_proc.h
+NETLINK_CONNECTOR = 11
+CN_IDX_PROC = 1
+CN_VAL_PROC = 1
+NLMSG_DONE = 3
+PROC_CN_MCAST_LISTEN = 1
+PROC_CN_MCAST_IGNORE = 2
+PROC_EVENT_FORK = 0x00000001
+PROC_EVENT_EXEC = 0x00000002
+PROC_EVENT_EXIT = 0x80000000
+
+_NLMSGHDR = struct.Struct('=IHHII')
+_CN_MSG = struct.Struct('=IIIIHH')
+_PROC_EVENT_HDR = struct.Struct('=IIQ')
+_TWO_IDS = struct.Struct('=II')
+_FOUR_IDS = struct.Struct('=IIII')
+
+
+def _read_proc_identity(pid, proc_root='/proc'):
+    """(ppid, start_time, cmd) eines frisch gestarteten Prozesses, best effort"""
+    try:
+        with open(f'{proc_root}/{pid}/stat', 'rb') as f:
+            stat = f.read()
+        fields = stat[stat.rindex(b')') + 2:].split()
+        ppid, start_time = int(fields[1]), int(fields[19])
+    except (OSError, ValueError, IndexError):
+        return 0, 0, ''
+    try:
+        with open(f'{proc_root}/{pid}/cmdline', 'rb') as f:
+            cmd = f.read().rstrip(b'\0').replace(b'\0', b' ').decode('utf-8', 'replace')
+    except OSError:
+        cmd = ''
+    return ppid, start_time, cmd
+
+
+class NetlinkProcSource:
+    """Events vom Kernel in Echtzeit (benötigt root bzw. CAP_NET_ADMIN)"""
+
+    name = 'netlink'
+
+    def __init__(self, proc_root='/proc'):
+        self.proc_root = proc_root
+        self.sock = socket.socket(socket.AF_NETLINK, socket.SOCK_DGRAM, NETLINK_CONNECTOR)
+        try:
+            self.sock.bind((os.getpid(), CN_IDX_PROC))
+            self._control(PROC_CN_MCAST_LISTEN)
+        except OSError:
+            self.sock.close()
+            raise
+        self.sock.setblocking(False)
+
+    def _control(self, op):
+        payload = struct.pack('=I', op)
+        cn = _CN_MSG.pack(CN_IDX_PROC, CN_VAL_PROC, 0, 0, len(payload), 0)
+        hdr = _NLMSGHDR.pack(_NLMSGHDR.size + len(cn) + len(payload), NLMSG_DONE, 0, 0, os.getpid())
+        self.sock.send(hdr + cn + payload)
+
+    def close(self):
+        try:
+            self._control(PROC_CN_MCAST_IGNORE)
+        except OSError:
+            pass
+        self.sock.close()
+
+    def _parse(self, data):
+        offset = 0
+        now = time.time()
+        while offset + _NLMSGHDR.size <= len(data):
+            msg_len = _NLMSGHDR.unpack_from(data, offset)[0]
+            if msg_len < _NLMSGHDR.size:
+                break
+            base = offset + _NLMSGHDR.size + _CN_MSG.size
+            offset += (msg_len + 3) & ~3
+            if base + _PROC_EVENT_HDR.size > len(data):
+                continue
+            what = _PROC_EVENT_HDR.unpack_from(data, base)[0]
+            body = base + _PROC_EVENT_HDR.size
+
+            if what == PROC_EVENT_EXEC:
+                _, tgid = _TWO_IDS.unpack_from(data, body)
+                ppid, start_time, cmd = _read_proc_identity(tgid, self.proc_root)
+                yield ProcEvent(EXEC, tgid, ppid, start_time, cmd, now)
+            elif what == PROC_EVENT_FORK:
+                _, parent_tgid, child_pid, child_tgid = _FOUR_IDS.unpack_from(data, body)
+                if child_pid == child_tgid:  # Threads ignorieren
+                    yield ProcEvent(FORK, child_tgid, parent_tgid, 0, '', now)
+            elif what == PROC_EVENT_EXIT:
+                pid, tgid = _TWO_IDS.unpack_from(data, body)
+                if pid == tgid:
+                    yield ProcEvent(EXIT, tgid, 0, 0, '', now)
+
+    def events(self, until):
+        """Events bis zur Deadline (time.monotonic()) liefern, sobald sie eintreffen"""
+        while True:
+            remaining = until - time.monotonic()
+            if remaining <= 0:
+                return
+            readable, _, _ = select.select([self.sock], [], [], remaining)
+            if not readable:
+                return
+            while True:
+                try:
+                    data = self.sock.recv(65536)
+                except BlockingIOError:
+                    break
+                except OSError as e:
+                    if e.errno == errno.ENOBUFS:
+                        # Kernel-Puffer übergelaufen: Events verloren, der nächste
+                        # Voll-Scan gleicht das aus
+                        break
+                    raise
+                yield from self._parse(data)
+
+
+class PollingProcSource:
+    """Fallback ohne Netlink: /proc-Polling mit adaptivem Intervall
+
+    Bei Prozess-Churn wird das Intervall halbiert (bis min_interval), in ruhigen
+    Phasen verdoppelt (bis max_interval) - kurze Prozesse werden so eher
+    gesehen, ohne im Leerlauf CPU zu verbrennen.
+    """
+
+    name = 'polling'
+
+    def __init__(self, sampler=None, min_interval=0.25, max_interval=5.0):
+        self.sampler = sampler or ProcessSampler()
+        self.differ = ProcessTableDiffer(cpu_delta=float('inf'), rss_delta_kb=float('inf'),
+                                         change_fields=('cmd',))
+        self.min_interval = min_interval
+        self.max_interval = max_interval
+        self.interval = min_interval
+        # Erster Durchlauf füllt nur die Tabelle (keine Events für Altbestand)
+        self.differ.update(self.sampler.sample())
+
+    def close(self):
+        pass
+
+    def _poll(self):
+        snapshot = self.sampler.sample()
+        now = snapshot.timestamp
+        events = []
+        for change in self.differ.update(snapshot):
+            proc = change.proc
+            if change.kind == CHANGED and proc.cmd.startswith('['):
+                # Kernel-Threads benennen sich um, Zombies verlieren ihre cmdline
+                continue
+            if change.kind in (SPAWNED, CHANGED):
+                events.append(ProcEvent(EXEC, proc.pid, proc.ppid, proc.start_time, proc.cmd, now))
+            elif change.kind == EXITED:
+                events.append(ProcEvent(EXIT, proc.pid, proc.ppid, proc.start_time, proc.cmd, now))
+        if events:
+            self.interval = max(self.min_interval, self.interval / 2)
+        else:
+            self.interval = min(self.max_interval, self.interval * 2)
+        return events
+
+    def events(self, until):
+        while True:
+            remaining = until - time.monotonic()
+            if remaining <= 0:
+                return
+            time.sleep(min(self.interval, remaining))
+            yield from self._poll()
+
+
+class FixtureProcSource:
+    """Spielt aufgezeichnete Events ab (Tests für Erkennungslatenz ohne root)"""
+
+    name = 'fixture'
+
+    def __init__(self, path, speed=1.0):
+        self.speed = speed
+        self.records = []
+        with open(path, 'r') as f:
+            for line in f:
+                line = line.strip()
+                if line and not line.startswith('#'):
+                    self.records.append(json.loads(line))
+        self.records.sort(key=lambda r: r['t'])
+        self._index = 0
+        self._start = None
+        self.started_at = None  # time.time() beim Start des Replays
+        self.last_due = None  # geplanter Zeitpunkt (time.time()) des zuletzt gelieferten Events
+
+    def start(self):
+        """Replay (neu) beginnen: t=0 ist jetzt"""
+        self._index = 0
+        self._start = time.monotonic()
+        self.started_at = time.time()
+        self.last_due = None
+
+    def close(self):
+        pass
+
+    @property
+    def exhausted(self):
+        return self._index >= len(self.records)
+
+    def events(self, until):
+        if self._start is None:
+            self.start()
+        while self._index < len(self.records):
+            record = self.records[self._index]
+            due = self._start + (record['t'] / self.speed if self.speed else 0)
+            if due > until:
+                remaining = until - time.monotonic()
+                if remaining > 0:
+                    time.sleep(remaining)
+                return
+            delay = due - time.monotonic()
+            if delay > 0:
+                time.sleep(delay)
+            self._index += 1
+            self.last_due = self.started_at + (record['t'] / self.speed if self.speed else 0)
+            yield ProcEvent(record['kind'], record['pid'], record.get('ppid', 0),
+                            record.get('start_time', 0), record.get('cmd', ''), time.time())
+
+
+def open_event_source(sampler=None, prefer_netlink=True):
+    """Netlink wenn möglich, sonst adaptives Polling"""
+    if prefer_netlink and hasattr(socket, 'AF_NETLINK'):
+        try:
+            return NetlinkProcSource()
+        except OSError:
+            pass
+    return PollingProcSource(sampler)
+
+
+def record_events(path, duration, source=None):
+    """Live-Events im Fixture-Format aufzeichnen"""
+    source = source or open_event_source()
+    start = time.time()
+    count = 0
+    try:
+        with open(path, 'w') as f:
+            for event in source.events(time.monotonic() + duration):
+                f.write(json.dumps({
+                    't': round(event.timestamp - start, 6), 'kind': event.kind, 'pid': event.pid,
+                    'ppid': event.ppid, 'start_time': event.start_time, 'cmd': event.cmd
+                }) + '\n')
+                count += 1
+    finally:
+        source.close()
+    return count
+
+
+class _RecordingTerminator:
+    """Ersatz für TerminationScheduler im Replay: merkt sich Beendigungen, sendet keine Signale"""
+
+    def __init__(self):
+        self.requests = []
+
+    def request(self, pid, reason, start_time=None):
+        self.requests.append((int(pid), reason, time.time()))
+
+    def poll(self):
+        return []
+
+    def next_deadline(self):
+        return None
+
+
+def replay_config(workdir):
+    """Tool-Config fürs Replay: alle Dateien im `workdir`, Black-/Whitelist als Kopie der aktuellen"""
+    config = {
+        'log_file': 'security_monitor.log',
+        'report_dir': 'security_reports',
+        'whitelist_file': 'process_whitelist.json',
+        'blacklist_file': 'process_blacklist.json',
+        'firewall_rules_file': 'firewall_rules.json',
+        'file_integrity_db': 'file_integrity.db.json',
+        'file_integrity_store': 'file_integrity.sqlite',
+        'known_bad_index': 'known_bad.idx',
+        'stats_file': 'monitor_stats.json',
+        'snapshot_file': 'last_snapshot.json',
+        'slack_webhook': None
+    }
+    for field in ('whitelist_file', 'blacklist_file'):
+        if os.path.exists(config[field]):
+            shutil.copy(config[field], workdir)
+    return {field: os.path.join(workdir, name) if isinstance(name, str) else name
+            for field, name in config.items()}
+
+
+def replay_latency(path, keywords=None, tool=None):
+    """Fixture durch UltimateSecurityTool.handle_process_event abspielen und die Latenz
+    vom geplanten Event-Zeitpunkt bis zur Beendigungs-Anforderung messen
+
+    keywords: eigene Blacklist statt process_blacklist.json; tool: vorhandene Instanz.
+    Ohne `tool` schreibt das Replay Log, Store und Config nur in ein Temp-Verzeichnis.
+    """
+    from ultimate_security_tool import UltimateSecurityTool
+    from keyword_matcher import WatchedKeywordList
+
+    with tempfile.TemporaryDirectory(prefix='replay-') as workdir:
+        own = tool is None
+        if own:
+            tool = UltimateSecurityTool(replay_config(workdir))
+        # Fixture-PIDs gehören jetzt fremden Prozessen: kein Hash über /proc/<pid>/exe
+        tool.hash_index = None
+        if keywords:
+            tool.blacklist_source = WatchedKeywordList('', fallback=keywords)  # kein Pfad -> nur Fallback
+        tool.terminator = _RecordingTerminator()
+        source = FixtureProcSource(path)
+        tool.event_source = source
+        detections = []
+        try:
+            source.start()
+            while not source.exhausted:
+                for event in source.events(time.monotonic() + 1.0):
+                    requested = len(tool.terminator.requests)
+                    tool.handle_process_event(event)
+                    if len(tool.terminator.requests) > requested:
+                        detections.append((event, tool.terminator.requests[-1][2] - source.last_due))
+        finally:
+            if own:
+                tool.event_log.close()
+                tool.file_hashes.close()
+    return detections
+
+
+if __name__ == "__main__":
+    if len(sys.argv) > 2 and sys.argv[1] == 'record':
+        duration = float(sys.argv[3]) if len(sys.argv) > 3 else 30
+        print(f"⏺️  Zeichne {duration}s Prozess-Events auf: {sys.argv[2]}")
+        print(f"   {record_events(sys.argv[2], duration)} Events gespeichert")
+    elif len(sys.argv) > 2 and sys.argv[1] == 'replay':
+        # Ohne Keywords gilt die Blacklist des Tools (process_blacklist.json)
+        detections = replay_latency(sys.argv[2], sys.argv[3:])
+        for event, latency in detections:
+            print(f"🔴 PID {event.pid}: {event.cmd[:60]} - erkannt nach {latency * 1000:.2f} ms")
+        if not detections:
+            print("✅ Keine Treffer der Blacklist im Replay")
+    else:
+        source = open_event_source()
+        print(f"⚡ Event-Quelle: {source.name} - Ctrl+C zum Beenden")
+        try:
+            while True:
+                for event in source.events(time.monotonic() + 1.0):
+                    print(f"{event.kind:<5} pid={event.pid:<7} ppid={event.ppid:<7} {event.cmd[:80]}")
+        except KeyboardInterrupt:
+            pass
+        finally:
+            source.close()
@@ -0,0 +1,287 @@
+#!/usr/bin/env python3
+"""
+⚙️ PROC SAMPLER - Fork-freier Prozess-Snapshot
+Liest /proc/[pid]/stat, statm, status und cmdline direkt (kein `ps aux` pro Zyklus)
+"""
+
+import os
+import sys
+import time
+import shutil
+import tempfile
+import subprocess
+from collections import namedtuple
+
+# Kompakter, typisierter Datensatz pro Prozess (ein Tupel statt Dict)
+ProcInfo = namedtuple('ProcInfo', [
+    'pid',          # int
+    'ppid',         # int
+    'start_time',   # int - Jiffies seit Boot (Linux) bzw. Epoch-Sekunden (ps-Fallback)
+    'name',         # str - comm
+    'state',        # str - R/S/D/Z/...
+    'uid',          # int
+    'utime',        # int - Jiffies im User-Mode
+    'stime',        # int - Jiffies im Kernel-Mode
+    'rss_kb',       # int
+    'vsz_kb',       # int
+    'cpu',          # float - CPU% über die Lebenszeit (wie `ps aux`)
+    'mem',          # float - RAM% vom physischen Speicher
+    'cmd',          # str - volle Kommandozeile
+])
+
+
+class ProcessSnapshot:
+    """Unveränderlicher Prozess-Snapshot eines Sampling-Zyklus"""
+
+    __slots__ = ('processes', 'timestamp', 'clk_tck', 'mem_total_kb', 'source', '_by_pid')
+
+    def __init__(self, processes, timestamp, clk_tck=100, mem_total_kb=0, source='proc'):
+        self.processes = tuple(processes)
+        self.timestamp = timestamp
+        self.clk_tck = clk_tck
+        self.mem_total_kb = mem_total_kb
+        self.source = source
+        self._by_pid = None
+
+    def __iter__(self):
+        return iter(self.processes)
+
+    def __len__(self):
+        return len(self.processes)
+
+    def get(self, pid):
+        """Prozess per PID (int oder str)"""
+        if self._by_pid is None:
+            self._by_pid = {p.pid: p for p in self.processes}
+        return self._by_pid.get(int(pid))
+
+    def top(self, n=15, key='cpu'):
+        """Top-N Prozesse nach Feld (ersetzt `ps aux | sort -rk 3,3 | head`)"""
+        return sorted(self.processes, key=lambda p: getattr(p, key), reverse=True)[:n]
+
+
+def _read(path):
+    """Lese kleine /proc-Datei ohne Python-Dateiobjekt-Overhead"""
+    fd = os.open(path, os.O_RDONLY)
+    try:
+        return os.read(fd, 65536)
+    finally:
+        os.close(fd)
+
+
+class ProcessSampler:
+    """Sampelt die Prozesstabelle direkt aus /proc (Fallback: ein `ps`-Aufruf ohne Shell)"""
+
+    def __init__(self, proc_root='/proc'):
+        self.proc_root = proc_root
+        # Eigener proc_root (Fixtures/Benchmarks) braucht kein /proc/self
+        if proc_root == '/proc':
+            self.use_proc = os.path.exists('/proc/self/stat')
+        else:
+            self.use_proc = os.path.isdir(proc_root)
+        try:
+            self.clk_tck = os.sysconf('SC_CLK_TCK')
+            self.page_kb = os.sysconf('SC_PAGE_SIZE') // 1024
+        except (ValueError, OSError, AttributeError):
+            self.clk_tck = 100
+            self.page_kb = 4
+
+    def sample(self):
+        """Erzeuge einen ProcessSnapshot"""
+        if self.use_proc:
+            return self._sample_proc()
+        return self._sample_ps()
+
+    def _mem_total_kb(self):
+        try:
+            for line in _read(os.path.join(self.proc_root, 'meminfo')).split(b'\n'):
+                if line.startswith(b'MemTotal:'):
+                    return int(line.split()[1])
+        except (OSError, ValueError, IndexError):
+            pass
+        return 0
+
+    def _uptime(self):
+        try:
+            return float(_read(os.path.join(self.proc_root, 'uptime')).split()[0])
+        except (OSError, ValueError, IndexError):
+            return 0.0
+
+    def _sample_proc(self):
+        root = self.proc_root
+        clk_tck = self.clk_tck
+        page_kb = self.page_kb
+        mem_total_kb = self._mem_total_kb()
+        uptime = self._uptime()
+        processes = []
+        append = processes.append
+
+        try:
+            entries = os.scandir(root)
+        except OSError:
+            return ProcessSnapshot([], time.time(), clk_tck, mem_total_kb)
+
+        with entries:
+            for entry in entries:
+                name = entry.name
+                if not name.isdigit():
+                    continue
+                base = entry.path + '/'
+                try:
+                    stat = _read(base + 'stat')
+                    statm = _read(base + 'statm').split()
+                    status = _read(base + 'status')
+                    cmdline = _read(base + 'cmdline')
+                except OSError:
+                    # Prozess zwischen scandir und read beendet
+                    continue
+
+                try:
+                    lparen = stat.index(b'(')
+                    rparen = stat.rindex(b')')
+                    comm = stat[lparen + 1:rparen].decode('utf-8', 'replace')
+                    fields = stat[rparen + 2:].split()
+                    ppid = int(fields[1])
+                    utime = int(fields[11])
+                    stime = int(fields[12])
+                    start_time = int(fields[19])
+                    vsz_kb = int(statm[0]) * page_kb
+                    rss_kb = int(statm[1]) * page_kb
+                except (ValueError, IndexError):
+                    continue
+
+                uid = 0
+                pos = status.find(b'\nUid:')
+                if pos >= 0:
+                    try:
+                        uid = int(status[pos + 5:status.index(b'\n', pos + 5)].split()[0])
+                    except (ValueError, IndexError):
+                        pass
+
+                if cmdline:
+                    cmd = cmdline.rstrip(b'\0').replace(b'\0', b' ').decode('utf-8', 'replace')
+                else:
+                    cmd = f'[{comm}]'
+
+                elapsed = uptime - start_time / clk_tck
+                cpu = round((utime + stime) / clk_tck / elapsed * 100, 1) if elapsed > 0 else 0.0
+                mem = round(rss_kb / mem_total_kb * 100, 1) if mem_total_kb else 0.0
+
+                append(ProcInfo(
+                    int(name), ppid, start_time, comm, fields[0].decode(), uid,
+                    utime, stime, rss_kb, vsz_kb, cpu, mem, cmd
+                ))
+
+        return ProcessSnapshot(processes, time.time(), clk_tck, mem_total_kb, 'proc')
+
+    def _sample_ps(self):
+        """macOS/BSD: ein einzelner `ps`-Aufruf ohne Shell-Pipeline"""
+        try:
+            result = subprocess.run(
+                ['ps', '-axww', '-o', 'pid=,ppid=,uid=,pcpu=,pmem=,rss=,vsz=,state=,lstart=,args='],
+                capture_output=True, text=True, timeout=10
+            )
+            stdout = result.stdout
+        except (OSError, subprocess.SubprocessError):
+            stdout = ''
+
+        processes = []
+        for line in stdout.split('\n'):
+            parts = line.split(None, 13)
+            if len(parts) < 14:
+                continue
+            try:
+                # lstart = "Mon Oct 18 10:00:00 2026" (5 Tokens)
+                start_time = int(time.mktime(time.strptime(' '.join(parts[8:13]), '%a %b %d %H:%M:%S %Y')))
+                cmd = parts[13]
+                processes.append(ProcInfo(
+                    int(parts[0]), int(parts[1]), start_time,
+                    os.path.basename(cmd.split()[0]) if cmd else '',
+                    parts[7][:1], int(parts[2]), 0, 0,
+                    int(parts[5]), int(parts[6]),
+                    float(parts[3].replace(',', '.')), float(parts[4].replace(',', '.')), cmd
+                ))
+            except (ValueError, IndexError):
+                continue
+
+        return ProcessSnapshot(processes, time.time(), self.clk_tck, 0, 'ps')
+
+
+_default_sampler = None
+
+
+def sample_processes():
+    """Snapshot mit dem Standard-Sampler (von allen Security-Tools geteilt)"""
+    global _default_sampler
+    if _default_sampler is None:
+        _default_sampler = ProcessSampler()
+    return _default_sampler.sample()
+
+
+def _build_fake_proc(root, count):
+    """Erzeuge synthetischen /proc-Baum mit `count` Prozessen (für Benchmarks)"""
+    with open(os.path.join(root, 'meminfo'), 'w') as f:
+        f.write('MemTotal:       16384000 kB\nMemFree:         8192000 kB\n')
+    with open(os.path.join(root, 'uptime'), 'w') as f:
+        f.write('100000.00 400000.00\n')
+
+    for pid in range(1, count + 1):
+        base = os.path.join(root, str(pid))
+        os.mkdir(base)
+        with open(os.path.join(base, 'stat'), 'w') as f:
+            f.write(f'{pid} (worker {pid}) S 1 {pid} {pid} 0 -1 4194560 100 0 0 0 '
+                    f'{pid % 500} {pid % 70} 0 0 20 0 1 0 {pid * 10} 104857600 2560 '
+                    '18446744073709551615 0 0 0 0 0 0 0 0 0 0 0 0 17 0 0 0 0 0 0\n')
+        with open(os.path.join(base, 'statm'), 'w') as f:
+            f.write('25600 2560 512 10 0 1024 0\n')
+        with open(os.path.join(base, 'status'), 'w') as f:
+            f.write(f'Name:\tworker {pid}\nState:\tS (sleeping)\nPid:\t{pid}\nPPid:\t1\n'
+                    'Uid:\t1000\t1000\t1000\t1000\nGid:\t1000\t1000\t1000\t1000\n')
+        with open(os.path.join(base, 'cmdline'), 'wb') as f:
+            f.write(f'/usr/bin/worker\0--id\0{pid}\0'.encode())
+
+
+def benchmark(sizes=(1000, 10000, 50000), rounds=3):
+    """Benchmark: Zyklus-Latenz bei 1k/10k/50k Prozessen vs. `ps aux`"""
+    print("="*60)
+    print("⏱️  PROC SAMPLER BENCHMARK")
+    print("="*60)
+
+    for count in sizes:
+        root = tempfile.mkdtemp(prefix='fake_proc_')
+        try:
+            _build_fake_proc(root, count)
+            sampler = ProcessSampler(proc_root=root)
+            timings = []
+            for _ in range(rounds):
+                start = time.perf_counter()
+                snapshot = sampler.sample()
+                timings.append(time.perf_counter() - start)
+            assert len(snapshot) == count
+            best = min(timings)
+            print(f"  {count:>6} Prozesse: {best * 1000:8.1f} ms/Zyklus "
+                  f"({best / count * 1e6:.1f} µs/Prozess)")
+        finally:
+            shutil.rmtree(root, ignore_errors=True)
+
+    # Vergleich auf dem Live-System
+    live = ProcessSampler()
+    start = time.perf_counter()
+    snapshot = live.sample()
+    native = time.perf_counter() - start
+    start = time.perf_counter()
+    subprocess.run('ps aux', shell=True, capture_output=True, text=True)
+    forked = time.perf_counter() - start
+    print(f"\n  Live ({len(snapshot)} Prozesse, Quelle: {snapshot.source}):")
+    print(f"    ProcessSampler: {native * 1000:8.1f} ms")
+    print(f"    ps aux:         {forked * 1000:8.1f} ms (ohne Parsing)")
+    print("="*60)
+
+
+if __name__ == "__main__":
+    if len(sys.argv) > 1 and sys.argv[1] == 'bench':
+        sizes = tuple(int(s) for s in sys.argv[2:]) or (1000, 10000, 50000)
+        benchmark(sizes)
+    else:
+        for proc in sample_processes().top(15):
+            print(f"{proc.pid:>7} {proc.cpu:5.1f} {proc.mem:5.1f} {proc.cmd[:100]}")
@@ -0,0 +1,388 @@
+#!/usr/bin/env python3
+"""
+🌳 PROCESS LINEAGE - Prozessbaum-Index für herkunftsbasierte Regeln
+Aus den ppid-Feldern jedes Snapshots: Eltern-Lookup in O(1), Ahnenketten
+werden beim ersten Zugriff berechnet und gecacht. Pro Zyklus wird nur das
+Delta (proc_diff-Events) eingearbeitet - betroffen sind nur neue, geänderte
+und beendete Prozesse samt ihrer Teilbäume. Regeln matchen auf die Herkunft,
+z.B. "Shell, deren Vorfahre ein Browser ist" oder "curl, gestartet von einer
+Binärdatei in /tmp".
+"""
+
+import os
+import sys
+import time
+import random
+from collections import namedtuple
+
+from proc_sampler import ProcInfo, ProcessSnapshot
+from proc_diff import ProcessEvent, SPAWNED, CHANGED, EXITED
+
+SHELLS = ['sh', 'bash', 'zsh', 'dash', 'fish', 'ksh', 'csh', 'tcsh']
+TEMP_PATHS = ['/tmp/', '/var/tmp/', '/dev/shm/', '/private/tmp/']
+
+# process: Namen des Prozesses selbst (leer = jeder), ancestor: Namen eines Vorfahren,
+# ancestor_paths: Pfad-Präfixe der Binärdatei eines Vorfahren, max_depth: wie weit hoch (None = ganz)
+DEFAULT_LINEAGE_RULES = [
+    {
+        'name': 'browser_shell',
+        'severity': 'ALERT',
+        'message': 'Shell aus einem Browser gestartet',
+        'process': SHELLS,
+        'ancestor': ['chrome', 'chromium', 'google chrome', 'firefox', 'firefox-bin', 'safari',
+                     'opera', 'msedge', 'microsoft edge', 'brave', 'brave browser'],
+    },
+    {
+        'name': 'webserver_shell',
+        'severity': 'ALERT',
+        'message': 'Shell aus einem Webserver gestartet (Webshell?)',
+        'process': SHELLS,
+        'ancestor': ['nginx', 'apache2', 'httpd', 'php-fpm', 'lighttpd', 'caddy'],
+    },
+    {
+        'name': 'temp_downloader',
+        'severity': 'ALERT',
+        'message': 'Netzwerk-Tool von einer Binärdatei aus einem Temp-Verzeichnis gestartet',
+        'process': ['curl', 'wget', 'nc', 'ncat', 'netcat', 'socat', 'scp'],
+        'ancestor_paths': TEMP_PATHS,
+    },
+    {
+        'name': 'office_shell',
+        'severity': 'WARNING',
+        'message': 'Shell aus einem Office-/PDF-Programm gestartet',
+        'process': SHELLS,
+        'ancestor': ['soffice.bin', 'libreoffice', 'microsoft word', 'microsoft excel',
+                     'microsoft powerpoint', 'acroread', 'adobe acrobat', 'evince'],
+        'max_depth': 3,
+    },
+]
+
+# rule = LineageRule, proc = passender Prozess, ancestor = Vorfahre, der die Regel auslöst, depth = 1 (Eltern) ...
+LineageMatch = namedtuple('LineageMatch', ['rule', 'proc', 'ancestor', 'depth'])
+
+
+def process_names(name, cmd):
+    """Vergleichsnamen: comm und Basename von argv[0], klein geschrieben"""
+    names = {os.path.basename(name).lower()} if name else set()
+    argv0 = cmd.split(' ', 1)[0] if cmd else ''
+    if argv0:
+        names.add(os.path.basename(argv0).lower())
+    return frozenset(names)
+
+
+class LineageRule:
+    """Kompilierte Regel (Sets statt Listen: Namensvergleich in O(1))"""
+
+    __slots__ = ('name', 'severity', 'message', 'process', 'ancestor', 'ancestor_paths', 'max_depth')
+
+    def __init__(self, name, severity='WARNING', message='', process=(), ancestor=(),
+                 ancestor_paths=(), max_depth=None):
+        self.name = name
+        self.severity = severity
+        self.message = message or name
+        self.process = frozenset(p.lower() for p in process)
+        self.ancestor = frozenset(a.lower() for a in ancestor)
+        self.ancestor_paths = tuple(ancestor_paths)
+        self.max_depth = max_depth
+
+    @classmethod
+    def from_config(cls, rule):
+        return rule if isinstance(rule, cls) else cls(**rule)
+
+    def applies_to(self, names):
+        return not self.process or not self.process.isdisjoint(names)
+
+    def ancestor_matches(self, names, proc):
+        if not self.ancestor.isdisjoint(names):
+            return True
+        return bool(self.ancestor_paths) and proc.cmd.startswith(self.ancestor_paths)
+
+
+class ProcessLineage:
+    """Prozessbaum über die Zyklen hinweg; update() liefert alle aktuell passenden Regeln
+
+    Gecacht werden nur die PIDs der Ahnenkette; ob ein Prozess für eine Regel
+    als Vorfahre zählt, steht pro Prozess fest (Tags). Deshalb invalidiert
+    nur ein Wechsel von ppid, cmd oder name oder ein Exit den Teilbaum darunter.
+    """
+
+    def __init__(self, rules=None, max_depth=64):
+        self.rules = [LineageRule.from_config(r) for r in (DEFAULT_LINEAGE_RULES if rules is None else rules)]
+        self.max_depth = max_depth
+        self.procs = {}  # pid -> ProcInfo
+        self._names = {}  # pid -> process_names()
+        self._tags = {}  # pid -> Regeln, für die der Prozess als Vorfahre zählt (nur wenn nicht leer)
+        self._children = {}  # ppid -> set(pid), auch für (noch) unbekannte Eltern
+        self._chains = {}  # pid -> Tupel der Vorfahren-PIDs (Eltern zuerst)
+        self.matches = {}  # pid -> Tupel von LineageMatch
+        self.evaluated = 0  # Regelauswertungen insgesamt (Kosten-Kennzahl)
+
+    def __len__(self):
+        return len(self.procs)
+
+    def __contains__(self, pid):
+        return int(pid) in self.procs
+
+    def update(self, snapshot):
+        """Snapshot einarbeiten; eigener, schmaler Diff (nur start_time, ppid, cmd, name zählen)"""
+        procs = self.procs
+        events = []
+        added = 0
+        for proc in snapshot:
+            old = procs.get(proc.pid)
+            if old is None or old.start_time != proc.start_time:
+                added += old is None
+                events.append(ProcessEvent(SPAWNED, (proc.pid, proc.start_time), proc, None))
+            elif old.ppid != proc.ppid or old.cmd != proc.cmd or old.name != proc.name:
+                events.append(ProcessEvent(CHANGED, (proc.pid, proc.start_time), proc, old))
+        if len(procs) + added != len(snapshot):  # sonst ist niemand verschwunden
+            seen = {proc.pid for proc in snapshot}
+            for pid in [pid for pid in procs if pid not in seen]:
+                old = procs[pid]
+                events.append(ProcessEvent(EXITED, (pid, old.start_time), old, None))
+        return self.apply(events)
+
+    def apply(self, events):
+        """proc_diff-Events einarbeiten (z.B. die des Aufrufers, ohne zweiten Diff)"""
+        dirty = []
+        for event in events:
+            proc = event.proc
+            pid = proc.pid
+            if event.kind == EXITED:
+                current = self.procs.get(pid)
+                if current is None or current.start_time != proc.start_time:
+                    continue  # PID bereits von einem neuen Prozess belegt
+                del self.procs[pid]
+                del self._names[pid]
+                self._tags.pop(pid, None)
+                self._unlink(pid, current.ppid)
+                self.matches.pop(pid, None)
+                dirty.extend(self._children.get(pid, ()))  # Nachfahren verlieren einen Vorfahren
+                self._chains.pop(pid, None)
+                continue
+            old = self.procs.get(pid)
+            if old is not None and old.ppid != proc.ppid:
+                self._unlink(pid, old.ppid)
+            self.procs[pid] = proc
+            names = self._names[pid] = process_names(proc.name, proc.cmd)
+            tags = tuple(rule for rule in self.rules if rule.ancestor_matches(names, proc))
+            if tags:
+                self._tags[pid] = tags
+            else:
+                self._tags.pop(pid, None)
+            self._children.setdefault(proc.ppid, set()).add(pid)
+            dirty.append(pid)
+
+        # Ketten im betroffenen Teilbaum verwerfen, danach Regeln neu auswerten
+        seen = set()
+        while dirty:
+            pid = dirty.pop()
+            if pid in seen:
+                continue
+            seen.add(pid)
+            self._chains.pop(pid, None)
+            dirty.extend(self._children.get(pid, ()))
+        for pid in seen:
+            if pid in self.procs:
+                self._evaluate(pid)
+        return self.current_matches()
+
+    def _unlink(self, pid, ppid):
+        siblings = self._children.get(ppid)
+        if siblings is not None:
+            siblings.discard(pid)
+            if not siblings:
+                del self._children[ppid]
+
+    def chain(self, pid):
+        """Vorfahren-PIDs (Eltern zuerst); gecacht, Zyklen und Tiefe begrenzt"""
+        chain = self._chains.get(pid)
+        if chain is not None:
+            return chain
+        if pid not in self.procs:
+            return ()
+        pending = []
+        visited = set()
+        current = pid
+        base = ()
+        while len(pending) < self.max_depth:
+            pending.append(current)
+            visited.add(current)
+            parent = self.procs[current].ppid
+            if parent not in self.procs or parent in visited:
+                break
+            cached = self._chains.get(parent)
+            if cached is not None:
+                base = ((parent,) + cached)[:self.max_depth]
+                break
+            current = parent
+        for p in reversed(pending):
+            self._chains[p] = base
+            base = ((p,) + base)[:self.max_depth]
+        return self._chains[pid]
+
+    def _match(self, proc, names, chain):
+        found = []
+        tags = self._tags
+        for rule in self.rules:
+            if not rule.applies_to(names):
+                continue
+            self.evaluated += 1
+            for depth, ancestor_pid in enumerate(chain, 1):
+                if rule.max_depth is not None and depth > rule.max_depth:
+                    break
+                if ancestor_pid in tags and rule in tags[ancestor_pid]:
+                    found.append(LineageMatch(rule, proc, self.procs[ancestor_pid], depth))
+                    break
+        return tuple(found)
+
+    def _evaluate(self, pid):
+        proc, names = self.procs[pid], self._names[pid]
+        found = self._match(proc, names, self.chain(pid))
+        # Herkunft bleibt haften: endet der auslösende Vorfahre (Dropper beendet sich,
+        # Kind wird an init gehängt), gilt der Treffer für diesen Prozess weiter
+        for match in self.matches.get(pid, ()):
+            if (match.proc.start_time == proc.start_time and match.rule.applies_to(names)
+                    and self.procs.get(match.ancestor.pid) is not match.ancestor
+                    and all(f.rule is not match.rule for f in found)):
+                found += (match._replace(proc=proc),)
+        if found:
+            self.matches[pid] = found
+        else:
+            self.matches.pop(pid, None)
+
+    def check(self, pid, ppid, cmd, name=''):
+        """Regeln für einen gerade gestarteten Prozess (exec-Event) gegen den bekannten Baum;
+        der Index selbst bleibt unverändert"""
+        proc = ProcInfo(int(pid), int(ppid), 0, name, '', 0, 0, 0, 0, 0, 0.0, 0.0, cmd)
+        ppid = int(ppid)
+        chain = (ppid,) + self.chain(ppid) if ppid in self.procs else ()
+        return list(self._match(proc, process_names(name, cmd), chain))
+
+    def current_matches(self):
+        return [match for found in self.matches.values() for match in found]
+
+    def parent(self, pid):
+        """Elternprozess (ProcInfo) oder None"""
+        proc = self.procs.get(int(pid))
+        return None if proc is None else self.procs.get(proc.ppid)
+
+    def ancestors(self, pid):
+        return [self.procs[p] for p in self.chain(int(pid))]
+
+    def children(self, pid):
+        return [self.procs[p] for p in self._children.get(int(pid), ()) if p in self.procs]
+
+    def descendants(self, pid):
+        result = []
+        stack = list(self._children.get(int(pid), ()))
+        seen = set()
+        while stack:
+            child = stack.pop()
+            if child in seen or child not in self.procs:
+                continue
+            seen.add(child)
+            result.append(self.procs[child])
+            stack.extend(self._children.get(child, ()))
+        return result
+
+    def format_lineage(self, pid, limit=6):
+        """'bash (812) ← chrome (640) ← systemd (1)'"""
+        pid = int(pid)
+        procs = ([self.procs[pid]] if pid in self.procs else []) + self.ancestors(pid)
+        parts = [f"{p.name or os.path.basename(p.cmd.split(' ', 1)[0])} ({p.pid})" for p in procs[:limit]]
+        if len(procs) > limit:
+            parts.append('…')
+        return ' ← '.join(parts)
+
+    def stats(self):
+        return {
+            'processes': len(self.procs),
+            'cached_chains': len(self._chains),
+            'matches': sum(len(found) for found in self.matches.values()),
+            'evaluated': self.evaluated,
+        }
+
+
+def format_match(match, lineage=None):
+    """Eine Zeile pro Treffer, mit Kette, wenn der Index übergeben wird"""
+    proc = match.proc
+    if lineage is not None and proc.pid in lineage:
+        origin = lineage.format_lineage(proc.pid)
+    else:
+        origin = f"{proc.cmd[:50]} ← {match.ancestor.cmd[:50]}"
+    return f"{match.rule.message}: {origin}"
+
+
+def _synthetic_tree(count, rng, start=2, services=300):
+    """Baum wie auf einem vollen Host: Dienste unter init, darunter Worker und Sitzungen"""
+    procs = [ProcInfo(1, 0, 0, 'init', 'S', 0, 0, 0, 0, 0, 0.0, 0.0, '/sbin/init')]
+    names = ['bash', 'python3', 'node', 'chrome', 'sshd', 'nginx', 'postgres', 'java', 'sleep', 'curl']
+    for pid in range(start, start + count - 1):
+        if len(procs) <= services:
+            parent = 1
+        elif rng.random() < 0.7:
+            parent = procs[rng.randrange(1, services + 1)].pid
+        else:
+            parent = procs[rng.randrange(len(procs))].pid
+        name = rng.choice(names)
+        procs.append(ProcInfo(pid, parent, pid, name, 'S', 0, 0, 0, 0, 0, 0.0, 0.0, f'/usr/bin/{name} --id {pid}'))
+    return procs
+
+
+def benchmark(count=50000, cycles=20, churn=200):
+    """Aufbau bei 50k Prozessen und inkrementelle Zyklen mit Spawn/Exit"""
+    rng = random.Random(42)
+    procs = _synthetic_tree(count, rng)
+    lineage = ProcessLineage()
+
+    start = time.perf_counter()
+    matches = lineage.update(ProcessSnapshot(procs, time.time()))
+    build = time.perf_counter() - start
+    print(f"🌳 Aufbau: {count:,} Prozesse in {build * 1000:.0f} ms, {len(matches)} Treffer")
+
+    next_pid = count + 10
+    timings = []
+    for _ in range(cycles):
+        # churn Prozesse enden (nicht init), churn neue starten unter zufälligen Eltern
+        alive = {p.pid: p for p in procs}
+        for victim in rng.sample(procs[1:], churn):
+            alive.pop(victim.pid, None)
+        parents = list(alive)
+        for _ in range(churn):
+            name = rng.choice(['bash', 'sleep', 'curl', 'python3'])
+            alive[next_pid] = ProcInfo(next_pid, rng.choice(parents), next_pid, name, 'S', 0, 0, 0, 0, 0,
+                                       0.0, 0.0, f'/usr/bin/{name}')
+            next_pid += 1
+        # Waisen an init hängen, wie der Kernel
+        procs = [p if p.ppid in alive or p.pid == 1 else p._replace(ppid=1) for p in alive.values()]
+        snapshot = ProcessSnapshot(procs, time.time())
+        start = time.perf_counter()
+        matches = lineage.update(snapshot)
+        timings.append(time.perf_counter() - start)
+
+    timings.sort()
+    print(f"🌳 Zyklus ({churn} Spawns + {churn} Exits): Median {timings[len(timings) // 2] * 1000:.1f} ms, "
+          f"max {timings[-1] * 1000:.1f} ms, {len(matches)} Treffer, {lineage.stats()}")
+
+    start = time.perf_counter()
+    for proc in procs[:10000]:
+        lineage.chain(proc.pid)
+    print(f"🌳 Ahnenkette (gecacht): {(time.perf_counter() - start) / 10000 * 1e6:.2f} µs")
+
+
+if __name__ == "__main__":
+    if len(sys.argv) > 1 and sys.argv[1] == 'bench':
+        benchmark(int(sys.argv[2]) if len(sys.argv) > 2 else 50000)
+        sys.exit(0)
+
+    from proc_sampler import ProcessSampler
+
+    lineage = ProcessLineage()
+    matches = lineage.update(ProcessSampler().sample())
+    if len(sys.argv) > 1:
+        print(lineage.format_lineage(sys.argv[1], limit=64))
+    else:
+        print(f"🌳 {len(lineage)} Prozesse, {len(matches)} Treffer")
+        for match in matches:
+            print(f"  {'🚨' if match.rule.severity == 'ALERT' else '⚠️ '} {format_match(match, lineage)}")
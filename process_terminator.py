@@ -0,0 +1,171 @@
+#!/usr/bin/env python3
+"""
+🛑 PROCESS TERMINATOR - Nicht-blockierende Prozess-Beendigung
+SIGTERM sofort, SIGKILL nach Frist; Exit-Bestätigung über pidfd (Linux) bzw.
+kill(pid, 0); jede Beendigung wird mit Zeitstempeln protokolliert
+"""
+
+import os
+import time
+import errno
+import select
+import signal
+
+TERMINATED = 'terminated'   # nach SIGTERM beendet
+KILLED = 'killed'           # erst nach SIGKILL beendet
+GONE = 'gone'               # war bereits beendet
+FAILED = 'failed'           # auch nach SIGKILL noch da / keine Rechte
+
+_HAS_PIDFD = hasattr(os, 'pidfd_open') and hasattr(signal, 'pidfd_send_signal')
+
+
+def _start_time(pid, proc_root='/proc'):
+    """Startzeit (Ticks seit Boot) aus /proc/<pid>/stat, None wenn nicht lesbar"""
+    try:
+        with open(f'{proc_root}/{pid}/stat', 'rb') as f:
+            stat = f.read()
+        return int(stat[stat.rindex(b')') + 2:].split()[19])
+    except (OSError, ValueError, IndexError):
+        return None
+
+
+class _Pending:
+    __slots__ = ('pid', 'reason', 'pidfd', 'requested_at', 'term_at', 'kill_at', 'deadline')
+
+    def __init__(self, pid, reason, pidfd, now):
+        self.pid = pid
+        self.reason = reason
+        self.pidfd = pidfd
+        self.requested_at = now
+        self.term_at = None
+        self.kill_at = None
+        self.deadline = None
+
+
+class TerminationScheduler:
+    """Verwaltet laufende Eskalationen (TERM -> KILL) mit Deadlines"""
+
+    def __init__(self, grace_period=2.0, kill_timeout=5.0, audit=None):
+        self.grace_period = grace_period
+        self.kill_timeout = kill_timeout
+        self.audit = audit
+        self.pending = {}
+
+    def __len__(self):
+        return len(self.pending)
+
+    def request(self, pid, reason, start_time=None):
+        """SIGTERM senden und Eskalation einplanen (kehrt sofort zurück)
+
+        Mit start_time wird nach dem Öffnen des pidfd geprüft, dass die PID noch
+        zum erkannten Prozess gehört (Schutz vor PID-Wiederverwendung).
+        """
+        pid = int(pid)
+        if pid in self.pending or pid <= 1 or pid == os.getpid():
+            return False
+
+        now = time.time()
+        pidfd = None
+        if _HAS_PIDFD:
+            try:
+                # pidfd pinnt die Prozess-Identität: keine Signale an wiederverwendete PIDs
+                pidfd = os.pidfd_open(pid)
+            except OSError as e:
+                if e.errno == errno.ESRCH:
+                    self._finish(_Pending(pid, reason, None, now), GONE, now)
+                    return False
+
+        entry = _Pending(pid, reason, pidfd, now)
+        if start_time and _start_time(pid) not in (None, start_time):
+            self._finish(entry, GONE, now, error='pid reused')
+            return False
+        if not self._signal(entry, signal.SIGTERM):
+            return False
+        entry.term_at = time.time()
+        entry.deadline = time.monotonic() + self.grace_period
+        self.pending[pid] = entry
+        return True
+
+    def _signal(self, entry, sig):
+        try:
+            if entry.pidfd is not None:
+                signal.pidfd_send_signal(entry.pidfd, sig)
+            else:
+                os.kill(entry.pid, sig)
+            return True
+        except ProcessLookupError:
+            # Vor SIGTERM schon weg; vor SIGKILL hat SIGTERM gereicht (Exit nur noch nicht gesehen)
+            self._finish(entry, GONE if sig == signal.SIGTERM else TERMINATED, time.time())
+        except PermissionError:
+            self._finish(entry, FAILED, time.time(), error='permission denied')
+        return False
+
+    def _exited(self, entry):
+        if entry.pidfd is not None:
+            readable, _, _ = select.select([entry.pidfd], [], [], 0)
+            return bool(readable)
+        try:
+            os.kill(entry.pid, 0)
+            return False
+        except ProcessLookupError:
+            return True
+        except PermissionError:
+            return False
+
+    def _finish(self, entry, outcome, now, error=None):
+        self.pending.pop(entry.pid, None)
+        if entry.pidfd is not None:
+            os.close(entry.pidfd)
+            entry.pidfd = None
+        if self.audit:
+            self.audit({
+                'pid': entry.pid,
+                'reason': entry.reason,
+                'outcome': outcome,
+                'requested_at': entry.requested_at,
+                'term_at': entry.term_at,
+                'kill_at': entry.kill_at,
+                'confirmed_at': now,
+                'error': error
+            })
+
+    def next_deadline(self):
+        """Nächste Eskalations-Deadline (time.monotonic()) oder None"""
+        if not self.pending:
+            return None
+        return min(e.deadline for e in self.pending.values())
+
+    def poll(self):
+        """Exits bestätigen, fällige Eskalationen auslösen; liefert Anzahl abgeschlossener"""
+        finished = 0
+        now = time.monotonic()
+        for entry in list(self.pending.values()):
+            if self._exited(entry):
+                self._finish(entry, KILLED if entry.kill_at else TERMINATED, time.time())
+                finished += 1
+            elif now >= entry.deadline:
+                if entry.kill_at is None:
+                    if self._signal(entry, signal.SIGKILL):
+                        entry.kill_at = time.time()
+                        entry.deadline = now + self.kill_timeout
+                    else:
+                        finished += 1
+                else:
+                    self._finish(entry, FAILED, time.time(), error='still running after SIGKILL')
+                    finished += 1
+        return finished
+
+    def wait(self, timeout=None):
+        """Blockierend warten, bis alle Eskalationen abgeschlossen sind (für Einmal-Scans)"""
+        limit = time.monotonic() + (timeout if timeout is not None else self.grace_period + self.kill_timeout)
+        while self.pending and time.monotonic() < limit:
+            self.poll()
+            if self.pending:
+                time.sleep(0.05)
+        return not self.pending
+
+    def close(self):
+        for entry in list(self.pending.values()):
+            if entry.pidfd is not None:
+                os.close(entry.pidfd)
+        self.pending.clear()
@@ -0,0 +1,327 @@
+#!/usr/bin/env python3
+"""
+🖥️ RESOURCE BACKEND - System-Ressourcen ohne Shell-Scraping
+Linux: /proc/stat, /proc/meminfo, /proc/loadavg, /proc/pressure/* und statvfs
+direkt (Mikrosekunden statt `top -l 1`, das allein ~1 s blockiert).
+macOS: ein `top -l 1 -n 0` wie bisher. Aufgezeichnete Fixtures lassen sich
+als Backend abspielen (Tests ohne das jeweilige System).
+
+Fixture-Format: ein Verzeichnis pro Aufnahme mit nummerierten Snapshots
+    0/stat 0/meminfo 0/loadavg 0/pressure/{cpu,memory,io} 0/statvfs.json   (Linux)
+    0/top.txt 0/statvfs.json                                                 (macOS)
+statvfs.json: {"/": [f_frsize, f_blocks, f_bfree, f_bavail]}
+"""
+
+import os
+import re
+import sys
+import json
+import time
+import shutil
+import subprocess
+from collections import namedtuple
+
+ResourceSample = namedtuple('ResourceSample', [
+    'backend',          # str - linux/macos/fixture:<name>
+    'timestamp',        # float - time.time()
+    'cpu',              # float - belegte CPU in % (alle Kerne; seit letztem Sample)
+    'cpu_user',         # float - davon User-Mode in %
+    'memory',           # float - belegter RAM in % (ohne Caches)
+    'memory_used_gb',   # float
+    'memory_total_gb',  # float
+    'load1',            # float
+    'load5',            # float
+    'load15',           # float
+    'pressure',         # dict - PSI "some avg10" in % pro cpu/memory/io (nur Linux)
+    'disks',            # dict - Pfad -> belegt in % (wie `df`)
+])
+
+_GB = 1024 ** 3
+_PRESSURE = ('cpu', 'memory', 'io')
+_TOP_CPU = re.compile(r'CPU usage:\s*([\d.]+)% user,\s*([\d.]+)% sys,\s*([\d.]+)% idle')
+_TOP_MEM = re.compile(r'PhysMem:\s*([\d.]+)([KMGT]?) used.*?([\d.]+)([KMGT]?) unused')
+_TOP_LOAD = re.compile(r'Load Avg:\s*([\d.]+),\s*([\d.]+),\s*([\d.]+)')
+_UNITS = {'': 1, 'K': 1024, 'M': 1024 ** 2, 'G': _GB, 'T': 1024 ** 4}
+
+
+def _read(path):
+    """Kleine /proc-Datei lesen; None, wenn sie fehlt (z.B. kein PSI-Kernel)"""
+    try:
+        fd = os.open(path, os.O_RDONLY)
+    except OSError:
+        return None
+    try:
+        return os.read(fd, 65536)
+    finally:
+        os.close(fd)
+
+
+def _disk_usage(statvfs, paths):
+    disks = {}
+    for path in paths:
+        try:
+            st = statvfs(path)
+        except OSError:
+            continue
+        used = st.f_blocks - st.f_bfree
+        total = used + st.f_bavail
+        if total:
+            disks[path] = round(used / total * 100, 1)
+    return disks
+
+
+class LinuxResourceBackend:
+    """Liest /proc direkt; CPU% aus Jiffy-Deltas zum vorherigen Sample
+    (erstes Sample: Durchschnitt seit Boot)"""
+
+    name = 'linux'
+
+    def __init__(self, proc_root='/proc', disks=('/',), statvfs=os.statvfs):
+        self.proc_root = proc_root
+        self.disks = tuple(disks)
+        self.statvfs = statvfs
+        self._prev_cpu = None
+
+    def _cpu(self):
+        data = _read(os.path.join(self.proc_root, 'stat'))
+        if not data:
+            return None, None
+        # cpu  user nice system idle iowait irq softirq steal (guest steckt in user)
+        fields = [int(v) for v in data.split(b'\n', 1)[0].split()[1:9]]
+        fields += [0] * (8 - len(fields))
+        idle = fields[3] + fields[4]
+        user = fields[0] + fields[1]
+        total = sum(fields)
+        prev = self._prev_cpu
+        self._prev_cpu = (total, idle, user)
+        if prev is not None and total > prev[0]:
+            total, idle, user = total - prev[0], idle - prev[1], user - prev[2]
+        if total <= 0:
+            return None, None
+        return round((total - idle) / total * 100, 1), round(user / total * 100, 1)
+
+    def _memory(self):
+        data = _read(os.path.join(self.proc_root, 'meminfo'))
+        if not data:
+            return None, None, None
+        info = {}
+        for line in data.splitlines():
+            key, _, value = line.partition(b':')
+            parts = value.split()
+            if parts:
+                info[key] = int(parts[0]) * 1024
+        total = info.get(b'MemTotal')
+        if not total:
+            return None, None, None
+        available = info.get(b'MemAvailable')
+        if available is None:  # Kernel < 3.14
+            available = info.get(b'MemFree', 0) + info.get(b'Buffers', 0) + info.get(b'Cached', 0)
+        used = total - available
+        return round(used / total * 100, 1), round(used / _GB, 2), round(total / _GB, 2)
+
+    def _load(self):
+        data = _read(os.path.join(self.proc_root, 'loadavg'))
+        if not data:
+            return None, None, None
+        return tuple(float(v) for v in data.split()[:3])
+
+    def _pressure(self):
+        pressure = {}
+        for resource in _PRESSURE:
+            data = _read(os.path.join(self.proc_root, 'pressure', resource))
+            if not data:
+                continue
+            for line in data.splitlines():
+                if line.startswith(b'some'):
+                    pressure[resource] = float(line.split(b'avg10=', 1)[1].split()[0])
+        return pressure
+
+    def sample(self):
+        cpu, cpu_user = self._cpu()
+        memory, used_gb, total_gb = self._memory()
+        load1, load5, load15 = self._load()
+        return ResourceSample(self.name, time.time(), cpu, cpu_user, memory, used_gb, total_gb,
+                              load1, load5, load15, self._pressure(), _disk_usage(self.statvfs, self.disks))
+
+
+def run_top():
+    """`top -l 1 -n 0`: ein Aufruf für CPU, RAM und Load (ohne Prozessliste)"""
+    try:
+        result = subprocess.run(['top', '-l', '1', '-n', '0'], capture_output=True, text=True, timeout=5)
+        return result.stdout
+    except (OSError, subprocess.TimeoutExpired):
+        return ''
+
+
+class MacResourceBackend:
+    """Bisheriges Verhalten: `top -l 1` parsen (CPU usage, PhysMem, Load Avg)"""
+
+    name = 'macos'
+
+    def __init__(self, disks=('/',), top=run_top, statvfs=os.statvfs):
+        self.disks = tuple(disks)
+        self.top = top
+        self.statvfs = statvfs
+
+    def sample(self):
+        output = self.top() or ''
+        cpu = cpu_user = memory = used_gb = total_gb = None
+        load = (None, None, None)
+        match = _TOP_CPU.search(output)
+        if match:
+            cpu_user = float(match.group(1))
+            cpu = round(100 - float(match.group(3)), 1)
+        match = _TOP_MEM.search(output)
+        if match:
+            used = float(match.group(1)) * _UNITS[match.group(2)]
+            unused = float(match.group(3)) * _UNITS[match.group(4)]
+            used_gb = round(used / _GB, 2)
+            total_gb = round((used + unused) / _GB, 2)
+            memory = round(used / (used + unused) * 100, 1) if used + unused else None
+        match = _TOP_LOAD.search(output)
+        if match:
+            load = tuple(float(v) for v in match.groups())
+        elif hasattr(os, 'getloadavg'):
+            load = os.getloadavg()
+        return ResourceSample(self.name, time.time(), cpu, cpu_user, memory, used_gb, total_gb,
+                              *load, {}, _disk_usage(self.statvfs, self.disks))
+
+
+class _FixtureStatvfs:
+    """statvfs-Ersatz aus statvfs.json eines Snapshots"""
+
+    Result = namedtuple('Result', ['f_frsize', 'f_blocks', 'f_bfree', 'f_bavail'])
+
+    def __init__(self):
+        self.values = {}
+
+    def load(self, directory):
+        path = os.path.join(directory, 'statvfs.json')
+        self.values = {}
+        if os.path.exists(path):
+            with open(path, 'r') as f:
+                self.values = {k: self.Result(*v) for k, v in json.load(f).items()}
+
+    def __call__(self, path):
+        if path not in self.values:
+            raise FileNotFoundError(path)
+        return self.values[path]
+
+
+class FixtureResourceBackend:
+    """Spielt nummerierte Snapshot-Verzeichnisse nacheinander ab (letzter bleibt stehen)"""
+
+    def __init__(self, path):
+        self.path = path
+        self.name = f'fixture:{os.path.basename(os.path.normpath(path))}'
+        self.snapshots = sorted((d for d in os.listdir(path) if d.isdigit()), key=int)
+        if not self.snapshots:
+            raise FileNotFoundError(f'Keine Snapshots in {path}')
+        self._index = 0
+        self._statvfs = _FixtureStatvfs()
+        first = os.path.join(path, self.snapshots[0])
+        self._statvfs.load(first)
+        disks = tuple(self._statvfs.values) or ('/',)
+        if os.path.exists(os.path.join(first, 'top.txt')):
+            self._backend = MacResourceBackend(disks, top=self._top, statvfs=self._statvfs)
+        else:
+            self._backend = LinuxResourceBackend(first, disks, statvfs=self._statvfs)
+
+    def _current(self):
+        return os.path.join(self.path, self.snapshots[min(self._index, len(self.snapshots) - 1)])
+
+    def _top(self):
+        with open(os.path.join(self._current(), 'top.txt'), 'r') as f:
+            return f.read()
+
+    @property
+    def exhausted(self):
+        return self._index >= len(self.snapshots)
+
+    def sample(self):
+        directory = self._current()
+        self._statvfs.load(directory)
+        if isinstance(self._backend, LinuxResourceBackend):
+            self._backend.proc_root = directory
+        sample = self._backend.sample()._replace(backend=self.name)
+        self._index += 1
+        return sample
+
+
+def open_backend(name='auto', disks=('/',)):
+    """'auto' (Linux wenn /proc/stat lesbar, sonst macOS), 'linux', 'macos' oder Fixture-Pfad"""
+    if name in (None, 'auto'):
+        name = 'linux' if os.path.exists('/proc/stat') else 'macos'
+    if name == 'linux':
+        return LinuxResourceBackend(disks=disks)
+    if name == 'macos':
+        return MacResourceBackend(disks=disks)
+    if os.path.isdir(name):
+        return FixtureResourceBackend(name)
+    raise ValueError(f'Unbekanntes Ressourcen-Backend: {name}')
+
+
+def format_sample(sample):
+    """Kurzbericht (ersetzt die rohe `top`-Ausgabe in Konsole und Reports)"""
+    def value(v, unit=''):
+        return '-' if v is None else f'{v}{unit}'
+    lines = [
+        f"CPU: {value(sample.cpu, '%')} belegt ({value(sample.cpu_user, '%')} User)",
+        f"RAM: {value(sample.memory, '%')} belegt ({value(sample.memory_used_gb)} von "
+        f"{value(sample.memory_total_gb)} GB)",
+        f"Load Avg: {value(sample.load1)}, {value(sample.load5)}, {value(sample.load15)}",
+    ]
+    if sample.pressure:
+        lines.append('Pressure (avg10): ' + ', '.join(f'{k} {v}%' for k, v in sample.pressure.items()))
+    if sample.disks:
+        lines.append('Disk: ' + ', '.join(f'{path} {percent}%' for path, percent in sample.disks.items()))
+    return '\n'.join(lines)
+
+
+def record_fixture(path, count=2, interval=1.0, proc_root='/proc', disks=('/',)):
+    """Linux-Snapshots im Fixture-Format aufzeichnen"""
+    for index in range(count):
+        if index:
+            time.sleep(interval)
+        directory = os.path.join(path, str(index))
+        os.makedirs(os.path.join(directory, 'pressure'), exist_ok=True)
+        for name in ('stat', 'meminfo', 'loadavg') + tuple(f'pressure/{r}' for r in _PRESSURE):
+            source = os.path.join(proc_root, name)
+            if os.path.exists(source):
+                shutil.copyfile(source, os.path.join(directory, name))
+        values = {}
+        for disk in disks:
+            st = os.statvfs(disk)
+            values[disk] = [st.f_frsize, st.f_blocks, st.f_bfree, st.f_bavail]
+        with open(os.path.join(directory, 'statvfs.json'), 'w') as f:
+            json.dump(values, f)
+    return count
+
+
+def benchmark(rounds=10000):
+    backend = open_backend()
+    backend.sample()
+    start = time.perf_counter()
+    for _ in range(rounds):
+        backend.sample()
+    elapsed = time.perf_counter() - start
+    print(f"🖥️  Backend {backend.name}: {elapsed / rounds * 1e6:.1f} µs pro Sample ({rounds:,} Samples)")
+
+
+if __name__ == "__main__":
+    if len(sys.argv) > 1 and sys.argv[1] == 'bench':
+        benchmark()
+    elif len(sys.argv) > 2 and sys.argv[1] == 'record':
+        count = int(sys.argv[3]) if len(sys.argv) > 3 else 2
+        print(f"⏺️  {record_fixture(sys.argv[2], count)} Snapshots gespeichert: {sys.argv[2]}")
+    elif len(sys.argv) > 1 and sys.argv[1] in ('-h', '--help'):
+        print("Usage: python3 resource_backend.py [auto|linux|macos|<fixture-dir>] | record <dir> [anzahl] | bench")
+    else:
+        backend = open_backend(sys.argv[1] if len(sys.argv) > 1 else 'auto')
+        if isinstance(backend, FixtureResourceBackend):
+            while not backend.exhausted:
+                sample = backend.sample()
+                print(f"🖥️  {sample.backend}\n{format_sample(sample)}\n")
+        else:
+            sample = backend.sample()
+            print(f"🖥️  {sample.backend}\n{format_sample(sample)}")
@@ -222,6 +222,39 @@ class SecurityAnalyzer:
         }
 
 
+class MonitorStatus:
+    """Live-Status vom laufenden KI-Sicherheitsmann (Unix-Socket-API, kein eigener Scan)"""
+    
+    def __init__(self, project_root: Path):
+        self.project_root = project_root
+    
+    def get_status(self) -> Dict:
+        """Ping, Alerts der letzten 24h und Ressourcen aus dem Daemon-Snapshot"""
+        sys.path.insert(0, str(self.project_root))
+        try:
+            from daemon_api import DaemonClient, DaemonUnavailable
+        except ImportError:
+            return {'running': False}
+        
+        client = DaemonClient()
+        try:
+            ping = client.request('ping')
+            alerts = client.request('alerts', since=datetime.now().timestamp() - 86400, limit=0)
+            snapshot = client.request('snapshot') or {}
+        except (DaemonUnavailable, RuntimeError):
+            return {'running': False}
+        finally:
+            client.close()
+        
+        return {
+            'running': True,
+            'pid': ping['pid'],
+            'uptime': ping['uptime'],
+            'alerts_24h': len(alerts),
+            'resources': snapshot.get('resources')
+        }
+
+
 class DeveloperStats:
     """Sammelt Entwickler-Statistiken"""
     
@@ -307,6 +340,7 @@ class DashboardSystem:
             'timestamp': datetime.now().isoformat(),
             'repos': {},
             'security': {},
+            'monitor': {},
             'developers': {},
             'summary': {}
         }
@@ -328,6 +362,9 @@ class DashboardSystem:
         security = SecurityAnalyzer(self.project_root)
         dashboard['security'] = security.analyze()
         
+        # KI-Sicherheitsmann (falls er läuft)
+        dashboard['monitor'] = MonitorStatus(self.project_root).get_status()
+        
         # Entwickler-Statistiken
         dev_stats = DeveloperStats(self.project_root)
         dashboard['developers'] = dev_stats.get_stats()
@@ -382,6 +419,15 @@ class DashboardSystem:
         print(f"   Kritische Issues: {security['critical_count']}")
         print(f"   Warnungen: {security['warnings_count']}")
         
+        monitor = dashboard.get('monitor', {})
+        if monitor.get('running'):
+            print(f"🛡️ KI-Sicherheitsmann: läuft (PID {monitor['pid']}), {monitor['alerts_24h']} Alerts in 24h")
+            resources = monitor.get('resources') or {}
+            if resources:
+                print(f"   CPU {resources.get('cpu')}%, RAM {resources.get('memory')}%, Load {resources.get('load1')}")
+        else:
+            print("⚪ KI-Sicherheitsmann: nicht erreichbar")
+        
         print("\n👥 ENTWICKLER:")
         print("-" * 80)
         for dev, stats in dashboard['developers'].items():
@@ -8,15 +8,38 @@ import subprocess
 import json
 import time
 import os
+import sys
 from datetime import datetime
 from collections import defaultdict
 
+from proc_sampler import ProcessSampler
+from keyword_matcher import matcher_for
+from net_sockets import format_endpoint
+from check_scheduler import CheckScheduler, PRIORITY_CRITICAL, PRIORITY_LOW
+from check_overhead import OverheadMeter, format_stats
+from resource_backend import open_backend, format_sample
+from daemon_api import DaemonView
+from system_snapshot import SystemSnapshot, SnapshotCache
+from process_lineage import ProcessLineage, format_match
+
 class SecurityMonitor:
     def __init__(self):
         self.alerts = []
         self.process_history = defaultdict(list)
         self.network_connections = []
         self.suspicious_processes = []
+        self.lineage = ProcessLineage()  # Prozessbaum: wer hat wen gestartet
+        self.sampler = ProcessSampler()
+        self.view = DaemonView(self.sampler)  # Daten vom KI-Sicherheitsmann, sonst lokal
+        self.resources = open_backend()
+        # Ein Snapshot je Report/Abschnitt: Teile werden beim ersten Zugriff erfasst
+        self.snapshots = SnapshotCache({
+            'processes': self.view.sample,
+            'sockets': lambda: tuple(self.view.connections(protocols=('tcp', 'tcp6'), states={'ESTABLISHED'})),
+            'listening': lambda: tuple(self.view.connections(protocols=('tcp', 'tcp6'), states={'LISTEN'},
+                                                             resolve_pids=True)),
+            'resources': self.resources.sample
+        }, ttl=1.0)
         
     def run_command(self, cmd):
         try:
@@ -27,58 +50,57 @@ class SecurityMonitor:
     
     def get_top_processes(self):
         """Top CPU/RAM Prozesse"""
-        cmd = "ps aux | sort -rk 3,3 | head -15"
-        return self.run_command(cmd)
+        return self.snapshots.get()['processes'].top(15, key='cpu')
     
     def get_network_connections(self):
         """Aktive Netzwerkverbindungen"""
-        cmd = "netstat -an | grep ESTABLISHED"
-        return self.run_command(cmd)
+        return self.snapshots.get()['sockets']
     
     def get_listening_ports(self):
         """Offene Ports"""
-        cmd = "lsof -i -P | grep LISTEN"
-        return self.run_command(cmd)
+        return self.snapshots.get()['listening']
     
     def analyze_processes(self):
         """Analysiere Prozesse auf verdächtige Aktivitäten"""
         processes = self.get_top_processes()
         suspicious = []
+        suspicious_keywords = matcher_for(['dartvm', 'flutterfire', 'curl', 'wget', 'nc', 'netcat'])
+        
+        for proc in processes:
+            cpu = proc.cpu
+            mem = proc.mem
+            pid = str(proc.pid)
+            cmd = proc.cmd
+            
+            # ALARM: Hohe CPU-Nutzung
+            if cpu > 50:
+                suspicious.append({
+                    'pid': pid,
+                    'cpu': cpu,
+                    'mem': mem,
+                    'cmd': cmd[:100],
+                    'reason': f'Hohe CPU-Nutzung: {cpu}%'
+                })
+            
+            # ALARM: Verdächtige Prozesse
+            if cpu > 10 and suspicious_keywords.find_all(cmd):
+                suspicious.append({
+                    'pid': pid,
+                    'cpu': cpu,
+                    'mem': mem,
+                    'cmd': cmd[:100],
+                    'reason': 'Verdächtiger Prozess mit hoher CPU'
+                })
         
-        lines = processes.split('\n')[1:]  # Skip header
-        for line in lines:
-            if not line.strip():
-                continue
-            parts = line.split()
-            if len(parts) >= 11:
-                try:
-                    cpu = float(parts[2])
-                    mem = float(parts[3])
-                    pid = parts[1]
-                    cmd = ' '.join(parts[10:])
-                    
-                    # ALARM: Hohe CPU-Nutzung
-                    if cpu > 50:
-                        suspicious.append({
-                            'pid': pid,
-                            'cpu': cpu,
-                            'mem': mem,
-                            'cmd': cmd[:100],
-                            'reason': f'Hohe CPU-Nutzung: {cpu}%'
-                        })
-                    
-                    # ALARM: Verdächtige Prozesse
-                    suspicious_keywords = ['dartvm', 'flutterfire', 'curl', 'wget', 'nc', 'netcat']
-                    if any(kw in cmd.lower() for kw in suspicious_keywords) and cpu > 10:
-                        suspicious.append({
-                            'pid': pid,
-                            'cpu': cpu,
-                            'mem': mem,
-                            'cmd': cmd[:100],
-                            'reason': 'Verdächtiger Prozess mit hoher CPU'
-                        })
-                except:
-                    pass
+        # ALARM: Verdächtige Herkunft (alle Prozesse, nicht nur die Top-15)
+        for match in self.lineage.update(self.snapshots.get()['processes']):
+            suspicious.append({
+                'pid': str(match.proc.pid),
+                'cpu': match.proc.cpu,
+                'mem': match.proc.mem,
+                'cmd': match.proc.cmd[:100],
+                'reason': format_match(match, self.lineage)
+            })
         
         return suspicious
     
@@ -90,45 +112,30 @@ class SecurityMonitor:
         # Bekannte verdächtige IP-Ranges
         suspicious_ranges = []
         
-        lines = connections.split('\n')
-        for line in lines:
-            if 'ESTABLISHED' in line:
-                parts = line.split()
-                if len(parts) >= 4:
-                    # Extrahiere IP
-                    try:
-                        local = parts[3]
-                        remote = parts[4]
-                        if remote and remote != '0.0.0.0':
-                            suspicious.append({
-                                'local': local,
-                                'remote': remote,
-                                'status': 'ESTABLISHED'
-                            })
-                    except:
-                        pass
+        for conn in connections:
+            if conn.remote_ip not in ('0.0.0.0', '::'):
+                suspicious.append({
+                    'local': format_endpoint(conn.local_ip, conn.local_port),
+                    'remote': format_endpoint(conn.remote_ip, conn.remote_port),
+                    'ip': conn.remote_ip,
+                    'status': 'ESTABLISHED'
+                })
         
         return suspicious
     
     def get_system_resources(self):
-        """System-Ressourcen"""
-        cmd = "top -l 1 | grep -E 'CPU usage|PhysMem|Load Avg'"
-        return self.run_command(cmd)
+        """System-Ressourcen (/proc unter Linux, `top -l 1` unter macOS)"""
+        return format_sample(self.snapshots.get()['resources'])
     
-    def generate_report(self):
-        """Generiere Security Report"""
-        timestamp = datetime.now().strftime("%Y-%m-%d %H:%M:%S")
-        
-        print("\n" + "="*80)
-        print(f"🚨 SECURITY MONITOR - {timestamp}")
-        print("="*80)
-        
-        # System-Ressourcen
+    def report_resources(self):
+        """System-Ressourcen ausgeben"""
         print("\n📊 SYSTEM-RESSOURCEN:")
         resources = self.get_system_resources()
         print(resources)
-        
-        # Verdächtige Prozesse
+        return []
+    
+    def report_processes(self):
+        """Verdächtige Prozesse ausgeben (Rückgabe: Alerts für den Scheduler)"""
         print("\n⚠️  VERDÄCHTIGE PROZESSE:")
         suspicious_procs = self.analyze_processes()
         if suspicious_procs:
@@ -139,51 +146,95 @@ class SecurityMonitor:
                 print()
         else:
             print("  ✅ Keine verdächtigen Prozesse gefunden")
-        
-        # Netzwerkverbindungen
+        return suspicious_procs
+    
+    def report_network(self):
+        """Netzwerkverbindungen ausgeben"""
         print("\n🌐 NETZWERKVERBINDUNGEN:")
         network = self.analyze_network()
         unique_ips = set()
         for conn in network[:20]:  # Top 20
             if conn['remote']:
-                ip = conn['remote'].split(':')[0]
-                unique_ips.add(ip)
+                unique_ips.add(conn['ip'])
         
         print(f"  Aktive Verbindungen: {len(network)}")
         print(f"  Eindeutige IPs: {len(unique_ips)}")
         print("  Top IPs:")
         for ip in list(unique_ips)[:10]:
             print(f"    - {ip}")
-        
-        # Offene Ports
+        return []
+    
+    def report_ports(self):
+        """Offene Ports ausgeben"""
         print("\n🔌 OFFENE PORTS:")
         ports = self.get_listening_ports()
-        port_lines = ports.split('\n')[:15]
-        for line in port_lines:
-            if line.strip():
-                print(f"  {line}")
-        
-        # Empfehlungen
+        for conn in ports[:15]:
+            print(f"  {conn.proto:<5} {format_endpoint(conn.local_ip, conn.local_port):<30} PID {conn.pid or '?'}")
+        return []
+    
+    def report_recommendations(self, suspicious_procs):
         print("\n🛡️  SICHERHEITS-EMPFEHLUNGEN:")
         if suspicious_procs:
             print("  🔴 KRITISCH: Verdächtige Prozesse gefunden!")
             print("     → Prozesse beenden: kill -9 <PID>")
             print("     → Firewall aktivieren")
             print("     → System scannen")
+    
+    def generate_report(self):
+        """Generiere Security Report (alle Abschnitte aus einem Snapshot)"""
+        snapshot = self.snapshots.fresh()
+        timestamp = datetime.fromtimestamp(snapshot.timestamp).strftime("%Y-%m-%d %H:%M:%S")
         
         print("\n" + "="*80)
+        print(f"🚨 SECURITY MONITOR - {timestamp}")
+        print("="*80)
+        
+        self.report_resources()
+        suspicious_procs = self.report_processes()
+        self.report_network()
+        self.report_ports()
+        self.report_recommendations(suspicious_procs)
+        
+        print("\n" + "="*80)
+    
+    def scheduled(self, section):
+        """Abschnitt als Scheduler-Check, mit Zeitstempel-Kopfzeile"""
+        def job():
+            self.snapshots.invalidate()
+            print(f"\n── {datetime.now().strftime('%H:%M:%S')} " + "─" * 60)
+            result = section()
+            if section == self.report_processes:
+                self.report_recommendations(result)
+            return result
+        return job
     
-    def monitor_loop(self, interval=5):
-        """Kontinuierliche Überwachung"""
+    def monitor_loop(self, interval=5, cpu_budget=10.0):
+        """Kontinuierliche Überwachung: jeder Abschnitt mit eigener, adaptiver Kadenz
+        (Prozesse alle `interval` Sekunden, nach Funden häufiger; Rest seltener, unter Last gebremst).
+        Über cpu_budget (% eines Kerns Eigenverbrauch) entfallen Netzwerk/Ports vorübergehend."""
         print("🚨 Security Monitor gestartet - Drücke Ctrl+C zum Beenden\n")
+        self.generate_report()
+        meter = OverheadMeter()
+        scheduler = CheckScheduler(meter=meter, cpu_budget=cpu_budget)
+        scheduler.add('processes', self.scheduled(self.report_processes), interval,
+                      PRIORITY_CRITICAL, run_now=False)
+        scheduler.add('resources', self.scheduled(self.report_resources), interval * 2, run_now=False)
+        scheduler.add('network', self.scheduled(self.report_network), interval * 3, PRIORITY_LOW, run_now=False)
+        scheduler.add('ports', self.scheduled(self.report_ports), interval * 12, PRIORITY_LOW, run_now=False)
         try:
-            while True:
-                self.generate_report()
-                time.sleep(interval)
+            scheduler.run()
         except KeyboardInterrupt:
             print("\n\n✅ Monitoring beendet")
+            print(format_stats(meter.stats()))
 
 if __name__ == "__main__":
     monitor = SecurityMonitor()
-    monitor.monitor_loop(interval=5)
+    if len(sys.argv) > 2 and sys.argv[1] == 'save':
+        print(f"📸 Snapshot gespeichert: {monitor.snapshots.get().save(sys.argv[2])}")
+    elif len(sys.argv) > 2 and sys.argv[1] == 'report':
+        # Report aus gespeichertem Snapshot, ohne das Live-System abzufragen
+        monitor.snapshots.pin(SystemSnapshot.load(sys.argv[2]))
+        monitor.generate_report()
+    else:
+        monitor.monitor_loop(interval=5)
 
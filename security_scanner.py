@@ -7,17 +7,51 @@ Vollständiger System-Scan mit Fehler-Erkennung und Log-Analyse
 import subprocess
 import json
 import os
-import re
 import time
 from datetime import datetime
 from pathlib import Path
 from collections import defaultdict, Counter
-import hashlib
+
+from proc_sampler import ProcessSampler
+from keyword_matcher import matcher_for
+from stage_executor import StageExecutor, Stage, OK
+from log_ingest import LogIngester, FileSource, default_sources as default_log_sources
+from log_signatures import load_engine as load_signature_engine
+from fs_walker import ParallelWalker, WalkCache, DEFAULT_EXCLUDES
+from content_scanner import ContentScanner, ContentScanCache, load_ruleset as load_content_ruleset
+from hash_index import open_index
+from resource_backend import open_backend
+from daemon_api import DaemonView
+
+# Deadline pro Stufe in Sekunden (scan_logs: vier `log show`-Abfragen à 15s)
+STAGE_DEADLINES = {
+    'system_resources': 30,
+    'processes': 20,
+    'network': 20,
+    'logs': 75,
+    'file_integrity': 10,
+    'malware_indicators': 60
+}
 
 class SecurityScanner:
-    def __init__(self):
-        self.scan_results = {
-            'timestamp': datetime.now().isoformat(),
+    def __init__(self, max_workers=None, time_budget=90):
+        self.scan_results = {'timestamp': datetime.now().isoformat(), **self.empty_results(security_score=100)}
+        self.report_file = f"SECURITY_SCAN_{datetime.now().strftime('%Y%m%d_%H%M%S')}.md"
+        self.sampler = ProcessSampler()
+        self.view = DaemonView(self.sampler)  # Snapshot vom laufenden KI-Sicherheitsmann, sonst lokal
+        self.resources = open_backend()
+        self.executor = StageExecutor(max_workers, time_budget)
+        self.log_cursor_file = 'log_cursors.json'
+        self.walk_cache_file = 'malware_walk_cache.json'
+        self.walk_excludes = DEFAULT_EXCLUDES
+        self.content_cache_file = 'content_scan_cache.sqlite'
+        self.content_cpu_budget = 20
+        self.hash_index = open_index()  # bekannte Schad-Hashes (geteilt, read-only)
+    
+    @staticmethod
+    def empty_results(security_score=0):
+        """Leeres Ergebnis-Gerüst (Teilergebnisse der Stufen: Score als Delta)"""
+        return {
             'system_info': {},
             'suspicious_processes': [],
             'malware_indicators': [],
@@ -25,10 +59,9 @@ class SecurityScanner:
             'network_threats': [],
             'log_anomalies': [],
             'file_integrity': [],
-            'security_score': 100,
+            'security_score': security_score,
             'recommendations': []
         }
-        self.report_file = f"SECURITY_SCAN_{datetime.now().strftime('%Y%m%d_%H%M%S')}.md"
         
     def run_command(self, cmd, timeout=10):
         """Führe Shell-Befehl aus"""
@@ -46,123 +79,112 @@ class SecurityScanner:
         except Exception as e:
             return "", str(e), -1
     
-    def scan_system_resources(self):
+    def scan_system_resources(self, results=None):
         """Scan System-Ressourcen"""
+        results = self.scan_results if results is None else results
         print("📊 Scanne System-Ressourcen...")
         
-        # CPU & RAM
-        stdout, _, _ = self.run_command("top -l 1 | head -20")
-        self.scan_results['system_info']['top_output'] = stdout
+        # CPU, RAM, Load, Pressure, Disk: ein Sample (/proc bzw. `top -l 1`)
+        sample = self.resources.sample()
+        results['system_info']['resource_backend'] = sample.backend
+        results['system_info']['cpu'] = sample.cpu
+        results['system_info']['memory'] = {
+            'percent': sample.memory, 'used_gb': sample.memory_used_gb, 'total_gb': sample.memory_total_gb
+        }
+        results['system_info']['pressure'] = sample.pressure
+        results['system_info']['disk_space'] = sample.disks
         
         # Load Average
-        stdout, _, _ = self.run_command("uptime")
-        if stdout:
-            load_match = re.search(r'load averages?: ([\d.]+)', stdout)
-            if load_match:
-                load = float(load_match.group(1))
-                self.scan_results['system_info']['load_average'] = load
-                if load > 4.0:
-                    self.scan_results['errors_found'].append({
-                        'type': 'HIGH_LOAD',
-                        'severity': 'CRITICAL',
-                        'message': f'Load Average extrem hoch: {load}',
-                        'recommendation': 'Prozesse mit hoher CPU beenden'
-                    })
-                    self.scan_results['security_score'] -= 20
-        
-        # Disk Space
-        stdout, _, _ = self.run_command("df -h /")
-        self.scan_results['system_info']['disk_space'] = stdout
-        
-        # Memory
-        stdout, _, _ = self.run_command("vm_stat")
-        self.scan_results['system_info']['memory'] = stdout
+        if sample.load1 is not None:
+            load = sample.load1
+            results['system_info']['load_average'] = load
+            if load > 4.0:
+                results['errors_found'].append({
+                    'type': 'HIGH_LOAD',
+                    'severity': 'CRITICAL',
+                    'message': f'Load Average extrem hoch: {load}',
+                    'recommendation': 'Prozesse mit hoher CPU beenden'
+                })
+                results['security_score'] -= 20
     
-    def scan_processes(self):
+    def scan_processes(self, results=None):
         """Scan alle Prozesse auf verdächtige Aktivitäten"""
+        results = self.scan_results if results is None else results
         print("🔍 Scanne Prozesse...")
         
-        stdout, _, _ = self.run_command("ps aux")
+        snapshot = self.view.sample()
+        results['system_info']['process_source'] = self.view.source
         processes = []
-        
-        for line in stdout.split('\n')[1:]:
-            if not line.strip():
-                continue
-            parts = line.split()
-            if len(parts) >= 11:
-                try:
-                    pid = parts[1]
-                    cpu = float(parts[2])
-                    mem = float(parts[3])
-                    cmd = ' '.join(parts[10:])
-                    
-                    process_info = {
+        suspicious_keywords = matcher_for([
+            'dartvm', 'miner', 'crypto', 'bitcoin', 
+            'backdoor', 'trojan', 'virus', 'malware',
+            'keylogger', 'spyware', 'rootkit'
+        ])
+        
+        for proc in snapshot:
+            pid = str(proc.pid)
+            cpu = proc.cpu
+            mem = proc.mem
+            cmd = proc.cmd
+            
+            process_info = {
+                'pid': pid,
+                'cpu': cpu,
+                'mem': mem,
+                'cmd': cmd
+            }
+            processes.append(process_info)
+            
+            # ALARM: Extrem hohe CPU
+            if cpu > 80:
+                results['suspicious_processes'].append({
+                    'pid': pid,
+                    'cpu': cpu,
+                    'mem': mem,
+                    'cmd': cmd[:200],
+                    'reason': f'EXTREM hohe CPU: {cpu}%',
+                    'severity': 'CRITICAL'
+                })
+                results['security_score'] -= 15
+            
+            # ALARM: Verdächtige Prozess-Namen (ein Durchlauf, alle Treffer)
+            if cpu > 10:
+                for keyword in suspicious_keywords.find_all(cmd):
+                    results['suspicious_processes'].append({
                         'pid': pid,
                         'cpu': cpu,
                         'mem': mem,
-                        'cmd': cmd
-                    }
-                    processes.append(process_info)
-                    
-                    # ALARM: Extrem hohe CPU
-                    if cpu > 80:
-                        self.scan_results['suspicious_processes'].append({
-                            'pid': pid,
-                            'cpu': cpu,
-                            'mem': mem,
-                            'cmd': cmd[:200],
-                            'reason': f'EXTREM hohe CPU: {cpu}%',
-                            'severity': 'CRITICAL'
-                        })
-                        self.scan_results['security_score'] -= 15
-                    
-                    # ALARM: Verdächtige Prozess-Namen
-                    suspicious_keywords = [
-                        'dartvm', 'miner', 'crypto', 'bitcoin', 
-                        'backdoor', 'trojan', 'virus', 'malware',
-                        'keylogger', 'spyware', 'rootkit'
-                    ]
-                    cmd_lower = cmd.lower()
-                    for keyword in suspicious_keywords:
-                        if keyword in cmd_lower and cpu > 10:
-                            self.scan_results['suspicious_processes'].append({
-                                'pid': pid,
-                                'cpu': cpu,
-                                'mem': mem,
-                                'cmd': cmd[:200],
-                                'reason': f'Verdächtiges Keyword: {keyword}',
-                                'severity': 'HIGH'
-                            })
-                            self.scan_results['security_score'] -= 10
-                    
-                    # ALARM: Unbekannte/verdächtige Pfade
-                    if cmd.startswith('/') and not any(allowed in cmd for allowed in [
-                        '/System', '/Library', '/usr', '/opt/homebrew',
-                        '/Applications', '/Users', '/private'
-                    ]):
-                        if cpu > 20:
-                            self.scan_results['suspicious_processes'].append({
-                                'pid': pid,
-                                'cpu': cpu,
-                                'mem': mem,
-                                'cmd': cmd[:200],
-                                'reason': 'Unbekannter/verdächtiger Pfad',
-                                'severity': 'MEDIUM'
-                            })
-                            self.scan_results['security_score'] -= 5
-                            
-                except (ValueError, IndexError):
-                    continue
-        
-        self.scan_results['system_info']['total_processes'] = len(processes)
+                        'cmd': cmd[:200],
+                        'reason': f'Verdächtiges Keyword: {keyword}',
+                        'severity': 'HIGH'
+                    })
+                    results['security_score'] -= 10
+            
+            # ALARM: Unbekannte/verdächtige Pfade
+            if cmd.startswith('/') and not any(allowed in cmd for allowed in [
+                '/System', '/Library', '/usr', '/opt/homebrew',
+                '/Applications', '/Users', '/private'
+            ]):
+                if cpu > 20:
+                    results['suspicious_processes'].append({
+                        'pid': pid,
+                        'cpu': cpu,
+                        'mem': mem,
+                        'cmd': cmd[:200],
+                        'reason': 'Unbekannter/verdächtiger Pfad',
+                        'severity': 'MEDIUM'
+                    })
+                    results['security_score'] -= 5
+        
+        results['system_info']['total_processes'] = len(processes)
     
-    def scan_network(self):
+    def scan_network(self, results=None):
         """Scan Netzwerkverbindungen"""
+        results = self.scan_results if results is None else results
         print("🌐 Scanne Netzwerkverbindungen...")
         
-        # Aktive Verbindungen
-        stdout, _, _ = self.run_command("netstat -an | grep ESTABLISHED")
-        connections = stdout.split('\n')
+        # Aktive Verbindungen (direkt aus /proc/net, kein netstat/lsof)
+        connections = self.view.connections(protocols=('tcp', 'tcp6'), states={'ESTABLISHED'})
         
         # Verdächtige IP-Ranges
         suspicious_ranges = [
@@ -172,126 +194,82 @@ class SecurityScanner:
         # Bekannte bösartige IP-Patterns
         malicious_patterns = []
         
-        unique_ips = Counter()
-        for conn in connections:
-            if 'ESTABLISHED' in conn:
-                parts = conn.split()
-                if len(parts) >= 4:
-                    remote = parts[4]
-                    if remote and remote != '0.0.0.0':
-                        ip = remote.split(':')[0]
-                        unique_ips[ip] += 1
+        unique_ips = Counter(
+            conn.remote_ip for conn in connections
+            if conn.remote_ip not in ('0.0.0.0', '::')
+        )
         
         # Viele Verbindungen zu einer IP = verdächtig
         for ip, count in unique_ips.most_common(20):
             if count > 10:
-                self.scan_results['network_threats'].append({
+                results['network_threats'].append({
                     'ip': ip,
                     'connections': count,
                     'reason': f'Viele Verbindungen zu einer IP: {count}',
                     'severity': 'MEDIUM'
                 })
-                self.scan_results['security_score'] -= 3
+                results['security_score'] -= 3
         
         # Offene Ports
-        stdout, _, _ = self.run_command("lsof -i -P | grep LISTEN")
-        listening_ports = stdout.split('\n')
+        listening = self.view.connections(protocols=('tcp', 'tcp6'), states={'LISTEN'}, resolve_pids=True)
         
         # Verdächtige Ports
-        suspicious_ports = [4444, 5555, 6666, 7777, 8888, 9999, 12345, 31337]
-        for line in listening_ports:
-            if 'LISTEN' in line:
-                port_match = re.search(r':(\d+)', line)
-                if port_match:
-                    port = int(port_match.group(1))
-                    if port in suspicious_ports:
-                        self.scan_results['network_threats'].append({
-                            'port': port,
-                            'reason': f'Verdächtiger Port offen: {port}',
-                            'severity': 'HIGH'
-                        })
-                        self.scan_results['security_score'] -= 10
+        suspicious_ports = {4444, 5555, 6666, 7777, 8888, 9999, 12345, 31337}
+        for conn in listening:
+            port = conn.local_port
+            if port in suspicious_ports:
+                results['network_threats'].append({
+                    'port': port,
+                    'pid': conn.pid,
+                    'reason': f'Verdächtiger Port offen: {port}',
+                    'severity': 'HIGH'
+                })
+                results['security_score'] -= 10
         
-        self.scan_results['system_info']['active_connections'] = len(connections)
-        self.scan_results['system_info']['unique_ips'] = len(unique_ips)
+        results['system_info']['active_connections'] = len(connections)
+        results['system_info']['unique_ips'] = len(unique_ips)
     
-    def scan_logs(self):
-        """Analysiere System-Logs auf Fehler und Anomalien"""
+    def scan_logs(self, results=None, save_cursors=True):
+        """Analysiere System-Logs auf Fehler und Anomalien (nur neue Einträge seit dem letzten Scan)
+        save_cursors=False: Cursor nicht speichern, der Aufrufer bekommt den Ingester zurück"""
+        results = self.scan_results if results is None else results
         print("📋 Analysiere System-Logs...")
         
-        # System-Logs (letzte 2 Stunden)
-        log_queries = [
-            {
-                'name': 'System Errors',
-                'query': 'log show --predicate "eventMessage contains \\"error\\" OR eventMessage contains \\"Error\\" OR eventMessage contains \\"ERROR\\"" --last 2h --style compact',
-                'severity': 'HIGH'
-            },
-            {
-                'name': 'Security Events',
-                'query': 'log show --predicate "subsystem == \\"com.apple.security\\" OR subsystem == \\"com.apple.network\\"" --last 2h --style compact',
-                'severity': 'MEDIUM'
-            },
-            {
-                'name': 'Firewall Events',
-                'query': 'log show --predicate "process == \\"socketfilterfw\\"" --last 2h --style compact',
-                'severity': 'MEDIUM'
-            },
-            {
-                'name': 'Kernel Panics',
-                'query': 'log show --predicate "eventMessage contains \\"panic\\" OR eventMessage contains \\"Panic\\"" --last 24h --style compact',
-                'severity': 'CRITICAL'
-            }
-        ]
-        
-        for log_query in log_queries:
-            stdout, stderr, code = self.run_command(log_query['query'], timeout=15)
-            if stdout:
-                lines = stdout.split('\n')
-                error_count = len([l for l in lines if 'error' in l.lower() or 'fail' in l.lower()])
-                
-                if error_count > 0:
-                    self.scan_results['log_anomalies'].append({
-                        'type': log_query['name'],
-                        'errors': error_count,
-                        'severity': log_query['severity'],
-                        'sample': lines[:5]  # Erste 5 Zeilen als Beispiel
-                    })
-                    if log_query['severity'] == 'CRITICAL':
-                        self.scan_results['security_score'] -= 25
-                    elif log_query['severity'] == 'HIGH':
-                        self.scan_results['security_score'] -= 10
-                    else:
-                        self.scan_results['security_score'] -= 5
-        
-        # Spezifische Log-Dateien prüfen
-        log_files = [
-            '/var/log/system.log',
-            '/var/log/install.log',
-            '~/Library/Logs/CrashReporter/'
-        ]
-        
-        for log_path in log_files:
-            expanded_path = os.path.expanduser(log_path)
-            if os.path.exists(expanded_path):
-                try:
-                    if os.path.isfile(expanded_path):
-                        # Letzte 100 Zeilen
-                        stdout, _, _ = self.run_command(f"tail -100 '{expanded_path}'")
-                        if stdout:
-                            error_lines = [l for l in stdout.split('\n') if 'error' in l.lower() or 'fail' in l.lower()]
-                            if error_lines:
-                                self.scan_results['log_anomalies'].append({
-                                    'type': f'Log File: {log_path}',
-                                    'errors': len(error_lines),
-                                    'severity': 'MEDIUM',
-                                    'sample': error_lines[:3]
-                                })
-                                self.scan_results['security_score'] -= 3
-                except:
-                    pass
+        ingester = LogIngester(self.log_cursor_file)
+        signatures = load_signature_engine()
+        for source in default_log_sources():
+            try:
+                tally = signatures.tally().feed(ingester.read(source))
+            except OSError as e:
+                print(f"⚠️  {source.name} übersprungen: {e}")
+                continue
+            if ingester.stats.get(source.key, {}).get('error'):
+                print(f"⚠️  {source.name} übersprungen: {ingester.stats[source.key]['error']}")
+            
+            if tally.matched_lines > 0:
+                results['log_anomalies'].append({
+                    'type': source.name,
+                    'errors': tally.matched_lines,
+                    'severity': source.severity,
+                    'sample': tally.first_matches,  # Erste 5 Treffer als Beispiel
+                    'signatures': tally.summary()
+                })
+                if isinstance(source, FileSource):
+                    results['security_score'] -= 3
+                elif source.severity == 'CRITICAL':
+                    results['security_score'] -= 25
+                elif source.severity == 'HIGH':
+                    results['security_score'] -= 10
+                else:
+                    results['security_score'] -= 5
+        
+        if save_cursors:
+            ingester.save()
+        return ingester
     
-    def scan_file_integrity(self):
+    def scan_file_integrity(self, results=None):
         """Prüfe kritische System-Dateien auf Modifikationen"""
+        results = self.scan_results if results is None else results
         print("🔒 Prüfe Datei-Integrität...")
         
         critical_files = [
@@ -312,18 +290,19 @@ class SecurityScanner:
                     days_ago = (time.time() - mtime) / 86400
                     
                     if days_ago < 7:
-                        self.scan_results['file_integrity'].append({
+                        results['file_integrity'].append({
                             'file': file_path,
                             'modified_days_ago': round(days_ago, 2),
                             'severity': 'MEDIUM',
                             'reason': 'Kritische Datei kürzlich modifiziert'
                         })
-                        self.scan_results['security_score'] -= 5
+                        results['security_score'] -= 5
                 except:
                     pass
     
-    def scan_malware_indicators(self):
+    def scan_malware_indicators(self, results=None):
         """Suche nach Malware-Indikatoren"""
+        results = self.scan_results if results is None else results
         print("🦠 Suche nach Malware-Indikatoren...")
         
         # Verdächtige Dateien in typischen Verstecken
@@ -339,28 +318,65 @@ class SecurityScanner:
         
         suspicious_extensions = ['.sh', '.py', '.pl', '.rb', '.js', '.exe', '.dmg']
         suspicious_names = ['miner', 'crypto', 'backdoor', 'trojan', 'keylog', 'spy']
-        
-        for location in suspicious_locations:
-            expanded = os.path.expanduser(location)
-            if os.path.exists(expanded):
-                try:
-                    for root, dirs, files in os.walk(expanded):
-                        for file in files:
-                            file_path = os.path.join(root, file)
-                            file_lower = file.lower()
-                            
-                            # Prüfe auf verdächtige Namen
-                            if any(sus in file_lower for sus in suspicious_names):
-                                self.scan_results['malware_indicators'].append({
-                                    'file': file_path,
-                                    'reason': 'Verdächtiger Dateiname',
-                                    'severity': 'HIGH'
-                                })
-                                self.scan_results['security_score'] -= 15
-                except PermissionError:
-                    pass
-                except Exception as e:
-                    pass
+        name_matcher = matcher_for(suspicious_names)
+        
+        # Inhalts-Signaturen (umbenannte Miner etc.); Ergebnisse pro Datei gecacht
+        ruleset = load_content_ruleset()
+        content_cache = ContentScanCache(self.content_cache_file)
+        if self.hash_index is not None:
+            self.hash_index.refresh()
+        content = ContentScanner(ruleset, content_cache, cpu_budget=self.content_cpu_budget,
+                                 hash_index=self.hash_index)
+        
+        def match(directory, name):
+            path = os.path.join(directory, name)
+            suspicious_name = name_matcher.search(name)
+            matches = content.scan_file(path)
+            if matches:
+                indicator = content.indicator(path, matches)
+                if suspicious_name:
+                    indicator['reason'] = 'Verdächtiger Dateiname + ' + indicator['reason']
+                    if indicator['severity'] not in ('HIGH', 'CRITICAL'):
+                        indicator['severity'] = 'HIGH'
+                return indicator
+            # Prüfe auf verdächtige Namen
+            if suspicious_name:
+                return {
+                    'file': path,
+                    'reason': 'Verdächtiger Dateiname',
+                    'severity': 'HIGH'
+                }
+            return None
+        
+        # Paralleler Scan; unveränderte Verzeichnisse (mtime) kommen aus dem Cache.
+        # In-place geänderte Dateien darin findet erst der nächtliche Lauf
+        # (python3 content_scanner.py nightly), der jede Datei per stat prüft.
+        index_version = self.hash_index.version if self.hash_index is not None else ''
+        cache = WalkCache(self.walk_cache_file,
+                          version=','.join(suspicious_names) + ':' + ruleset.version + ':' + index_version)
+        walker = ParallelWalker(match, excludes=self.walk_excludes, cache=cache)
+        try:
+            for indicator in walker.walk(suspicious_locations):
+                results['malware_indicators'].append(indicator)
+                results['security_score'] -= 15
+        finally:
+            content_cache.close()
+        content_stats = content.summary()
+        # Vertagte Dateien (CPU-Budget) liegen in neu gelisteten Verzeichnissen:
+        # ohne Speichern werden diese im nächsten Lauf erneut gelistet
+        if not content_stats['deferred']:
+            cache.save()
+        
+        stats = walker.stats
+        results['system_info']['malware_walk'] = stats
+        results['system_info']['content_scan'] = content_stats
+        print(f"   {stats['visited']} Einträge geprüft, {stats['skipped']} unverändert übersprungen, "
+              f"{stats['excluded']} Verzeichnisse ausgeschlossen, {stats['matched']} Treffer "
+              f"({stats['entries_per_second']:,} Einträge/s)")
+        print(f"   Inhalt: {content_stats['scanned']} Dateien gelesen ({content_stats['bytes'] / 1e6:.1f} MB), "
+              f"{content_stats['cached']} aus Cache, {content_stats['deferred']} vertagt, "
+              f"{content_stats['known_bad']} bekannte Schad-Hashes, "
+              f"CPU {content_stats['cpu_seconds']}s")
     
     def generate_recommendations(self):
         """Generiere Sicherheits-Empfehlungen"""
@@ -454,6 +470,8 @@ class SecurityScanner:
             print(f"\n📋 LOG-ANOMALIEN ({len(self.scan_results['log_anomalies'])}):")
             for anomaly in self.scan_results['log_anomalies']:
                 print(f"  ⚠️  {anomaly['type']}: {anomaly['errors']} Fehler gefunden")
+                for name, info in list(anomaly.get('signatures', {}).items())[:5]:
+                    print(f"     [{info['severity']}] {name}: {info['count']}")
                 if anomaly.get('sample'):
                     print(f"     Beispiel: {anomaly['sample'][0][:100]}")
                 print()
@@ -474,6 +492,17 @@ class SecurityScanner:
                 print(f"     → {rec['command']}")
                 print()
         
+        # Laufzeiten der Scan-Stufen
+        if self.scan_results.get('stage_timings'):
+            print(f"\n⏱️  SCAN-STUFEN ({self.scan_results['scan_duration']}s gesamt):")
+            for name, timing in self.scan_results['stage_timings'].items():
+                cpu = f"{timing['cpu']}s" if timing['cpu'] is not None else '-'
+                marker = '✅' if timing['status'] == OK else '⚠️ '
+                print(f"  {marker} {name:<20} Wall: {timing['wall']}s | CPU: {cpu} | {timing['status']}")
+                if timing['error']:
+                    print(f"     Fehler: {timing['error']}")
+            print()
+        
         print("="*80)
         
         # Speichere Report als Markdown
@@ -534,6 +563,8 @@ class SecurityScanner:
                 md_content += f"### {anomaly['type']}\n"
                 md_content += f"- **Fehler gefunden:** {anomaly['errors']}\n"
                 md_content += f"- **Schweregrad:** {anomaly['severity']}\n"
+                for name, info in anomaly.get('signatures', {}).items():
+                    md_content += f"- **Signatur `{name}`:** {info['count']}× ({info['severity']})\n"
                 if anomaly.get('sample'):
                     md_content += f"- **Beispiel:**\n```\n{chr(10).join(anomaly['sample'][:3])}\n```\n\n"
         
@@ -544,6 +575,15 @@ class SecurityScanner:
                 md_content += f"### {i}. [{rec['priority']}] {rec['action']}\n\n"
                 md_content += f"```bash\n{rec['command']}\n```\n\n"
         
+        # Laufzeiten der Scan-Stufen
+        if self.scan_results.get('stage_timings'):
+            md_content += f"## ⏱️ Scan-Stufen ({self.scan_results['scan_duration']}s gesamt)\n\n"
+            md_content += "| Stufe | Wall (s) | CPU (s) | Status |\n|---|---|---|---|\n"
+            for name, timing in self.scan_results['stage_timings'].items():
+                cpu = timing['cpu'] if timing['cpu'] is not None else '-'
+                md_content += f"| {name} | {timing['wall']} | {cpu} | {timing['status']} |\n"
+            md_content += "\n"
+        
         # JSON Export
         json_file = self.report_file.replace('.md', '.json')
         with open(json_file, 'w') as f:
@@ -558,15 +598,22 @@ class SecurityScanner:
         print(f"   📄 {json_file}")
     
     def run_full_scan(self):
-        """Führe vollständigen Security-Scan durch"""
+        """Führe vollständigen Security-Scan durch (unabhängige Stufen parallel)"""
         print("🚨 STARTE ULTIMATIVEN SECURITY SCAN...\n")
         
-        self.scan_system_resources()
-        self.scan_processes()
-        self.scan_network()
-        self.scan_logs()
-        self.scan_file_integrity()
-        self.scan_malware_indicators()
+        stages = [
+            Stage('system_resources', self.scan_system_resources, STAGE_DEADLINES['system_resources']),
+            Stage('processes', self.scan_processes, STAGE_DEADLINES['processes']),
+            Stage('network', self.scan_network, STAGE_DEADLINES['network']),
+            # Cursor erst speichern, wenn das Ergebnis übernommen wird (nicht nach TIMEOUT)
+            Stage('logs', lambda results: self.scan_logs(results, save_cursors=False), STAGE_DEADLINES['logs'],
+                  commit=LogIngester.save),
+            Stage('file_integrity', self.scan_file_integrity, STAGE_DEADLINES['file_integrity']),
+            Stage('malware_indicators', self.scan_malware_indicators, STAGE_DEADLINES['malware_indicators'])
+        ]
+        start = time.perf_counter()
+        self.scan_results['stage_timings'] = self.executor.run(stages, self.scan_results, self.empty_results)
+        self.scan_results['scan_duration'] = round(time.perf_counter() - start, 3)
         self.generate_recommendations()
         self.generate_report()
         
@@ -0,0 +1,112 @@
+#!/usr/bin/env python3
+"""
+⏱️ STAGE EXECUTOR - Unabhängige Scan-Stufen parallel ausführen
+Thread-Pool mit Deadline pro Stufe und globalem Zeitbudget; jede Stufe schreibt
+in ein eigenes Teilergebnis, das in fester Stufen-Reihenfolge gemergt wird
+"""
+
+import time
+from collections import namedtuple
+from concurrent.futures import ThreadPoolExecutor, wait, FIRST_COMPLETED
+
+OK = 'ok'
+TIMEOUT = 'timeout'
+ERROR = 'error'
+SKIPPED = 'skipped'
+
+# func(results) bekommt ein leeres Teilergebnis; deadline in Sekunden ab Start;
+# commit(rückgabe von func) läuft nur, wenn das Teilergebnis gemergt wird (z.B. Cursor speichern)
+Stage = namedtuple('Stage', ['name', 'func', 'deadline', 'commit'], defaults=(None,))
+
+
+def merge_results(target, partial):
+    """Teilergebnis einmischen: Listen anhängen, Dicts aktualisieren, Zahlen addieren"""
+    for key, value in partial.items():
+        if isinstance(value, list):
+            target.setdefault(key, []).extend(value)
+        elif isinstance(value, dict):
+            target.setdefault(key, {}).update(value)
+        elif isinstance(value, (int, float)) and not isinstance(value, bool):
+            target[key] = target.get(key, 0) + value
+        else:
+            target[key] = value
+
+
+class StageExecutor:
+    """Führt Stufen nebenläufig aus und mergt deterministisch
+
+    Threads lassen sich nicht abbrechen: eine Stufe über ihrer Deadline wird als
+    TIMEOUT verbucht und ihr Teilergebnis verworfen, der Thread läuft im
+    Hintergrund aus (Subprozesse haben eigene Timeouts). Seiteneffekte, die
+    nur mit dem Ergebnis gelten dürfen, gehören deshalb in `commit`.
+    """
+
+    def __init__(self, max_workers=None, time_budget=None):
+        self.max_workers = max_workers
+        self.time_budget = time_budget
+
+    def _run_stage(self, stage, make_results):
+        results = make_results()
+        wall_start = time.perf_counter()
+        cpu_start = time.thread_time()
+        error = None
+        value = None
+        try:
+            value = stage.func(results)
+        except Exception as e:
+            error = f'{type(e).__name__}: {e}'
+        return results, value, {
+            'wall': round(time.perf_counter() - wall_start, 3),
+            'cpu': round(time.thread_time() - cpu_start, 3),
+            'status': ERROR if error else OK,
+            'error': error
+        }
+
+    def run(self, stages, target, make_results):
+        """Stufen ausführen, Ergebnisse in `target` mergen; liefert {Name: Timing}"""
+        start = time.monotonic()
+        budget_end = start + self.time_budget if self.time_budget else float('inf')
+        deadlines = {
+            stage.name: min(budget_end, start + stage.deadline if stage.deadline else budget_end)
+            for stage in stages
+        }
+        timings = {}
+        outcomes = {}
+
+        pool = ThreadPoolExecutor(max_workers=self.max_workers or len(stages) or 1,
+                                  thread_name_prefix='scan-stage')
+        try:
+            futures = {pool.submit(self._run_stage, stage, make_results): stage for stage in stages}
+            pending = set(futures)
+            while pending:
+                now = time.monotonic()
+                for future in [f for f in pending if deadlines[futures[f].name] <= now and not f.done()]:
+                    pending.discard(future)
+                    future.cancel()
+                    timings[futures[future].name] = {
+                        'wall': round(now - start, 3), 'cpu': None,
+                        'status': TIMEOUT if future.running() else SKIPPED, 'error': None
+                    }
+                if not pending:
+                    break
+                next_deadline = min(deadlines[futures[f].name] for f in pending)
+                done, pending = wait(pending, timeout=max(0.0, next_deadline - time.monotonic()),
+                                     return_when=FIRST_COMPLETED)
+                for future in done:
+                    outcomes[futures[future].name] = future.result()
+        finally:
+            pool.shutdown(wait=False, cancel_futures=True)
+
+        # Merge in Stufen-Reihenfolge, unabhängig von der Fertigstellungs-Reihenfolge
+        for stage in stages:
+            if stage.name in outcomes:
+                results, value, timing = outcomes[stage.name]
+                if timing['status'] == OK:
+                    merge_results(target, results)
+                    if stage.commit is not None:
+                        try:
+                            stage.commit(value)
+                        except Exception as e:
+                            timing['error'] = f'commit: {type(e).__name__}: {e}'
+                timings[stage.name] = timing
+        return {stage.name: timings[stage.name] for stage in stages}
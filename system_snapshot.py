@@ -0,0 +1,173 @@
+#!/usr/bin/env python3
+"""
+📸 SYSTEM SNAPSHOT - Ein Erfassungszyklus für Checks und Reports
+Prozesse, Sockets und Ressourcen werden pro Snapshot höchstens einmal erfasst
+(beim ersten Zugriff), Check-Ergebnisse hängen am selben Objekt. Reports lesen
+nur noch daraus - ohne erneute Forks, Dateizugriffe oder Hashes. Teile sind
+unveränderlich (ProcessSnapshot, Tupel) und werden ohne Kopie herausgegeben.
+Gespeicherte Snapshots (JSON) lassen sich später ohne Live-System rendern.
+"""
+
+import os
+import sys
+import json
+import time
+import threading
+
+from daemon_api import snapshot_to_api, snapshot_from_api, connections_to_api, connections_from_api
+from resource_backend import ResourceSample
+
+FORMAT_VERSION = 1
+
+# Teil -> (kodieren, dekodieren); alles andere wird als JSON gespeichert
+_CODECS = {
+    'processes': (snapshot_to_api, snapshot_from_api),
+    'sockets': (connections_to_api, lambda data: tuple(connections_from_api(data))),
+    'listening': (connections_to_api, lambda data: tuple(connections_from_api(data))),
+    'resources': (lambda sample: sample._asdict(), lambda data: ResourceSample(**data)),
+}
+
+
+class SystemSnapshot:
+    """Teile (Rohdaten) und Ergebnisse (von Checks) eines Zyklus
+
+    collectors: Teil -> callable(); fehlt ein Teil ohne Collector (z.B. in
+    einem geladenen Snapshot), liefert get() None.
+    """
+
+    def __init__(self, collectors=None, parts=None, timestamp=None, source='live'):
+        self.timestamp = time.time() if timestamp is None else timestamp
+        self.source = source
+        self._collectors = collectors or {}
+        self._parts = dict(parts or {})
+        self._lock = threading.Lock()
+
+    def get(self, name):
+        try:
+            return self._parts[name]
+        except KeyError:
+            pass
+        collector = self._collectors.get(name)
+        if collector is None:
+            return None
+        with self._lock:
+            if name not in self._parts:
+                self._parts[name] = collector()
+        return self._parts[name]
+
+    __getitem__ = get
+
+    def __contains__(self, name):
+        return name in self._parts
+
+    def put(self, name, value):
+        """Check-Ergebnis ablegen (wird mit gespeichert)"""
+        self._parts[name] = value
+
+    def names(self):
+        """Bereits erfasste Teile und Ergebnisse"""
+        return list(self._parts)
+
+    def age(self):
+        return time.time() - self.timestamp
+
+    def collect_all(self):
+        """Alle Teile mit Collector erfassen (vor dem Speichern)"""
+        for name in self._collectors:
+            self.get(name)
+        return self
+
+    def to_dict(self):
+        parts = {}
+        for name, value in self._parts.items():
+            codec = _CODECS.get(name)
+            parts[name] = codec[0](value) if codec else value
+        return {'version': FORMAT_VERSION, 'timestamp': self.timestamp, 'source': self.source, 'parts': parts}
+
+    def save(self, path):
+        """Atomar als JSON schreiben (erfasst vorher alle fehlenden Teile)"""
+        self.collect_all()
+        directory = os.path.dirname(os.path.abspath(path))
+        os.makedirs(directory, exist_ok=True)
+        tmp = f'{path}.tmp'
+        with open(tmp, 'w') as f:
+            json.dump(self.to_dict(), f, default=str)
+        os.replace(tmp, path)
+        return path
+
+    @classmethod
+    def load(cls, path):
+        """Gespeicherten Snapshot laden; ohne Collector, berührt das Live-System nicht"""
+        with open(path, 'r') as f:
+            data = json.load(f)
+        if data.get('version') != FORMAT_VERSION:
+            raise ValueError(f'Unbekanntes Snapshot-Format: {data.get("version")}')
+        parts = {}
+        for name, value in data['parts'].items():
+            codec = _CODECS.get(name)
+            parts[name] = codec[1](value) if codec and value is not None else value
+        return cls(parts=parts, timestamp=data['timestamp'], source=path)
+
+
+class SnapshotCache:
+    """Liefert denselben Snapshot, bis er `ttl` Sekunden alt ist; pin() fixiert einen geladenen"""
+
+    def __init__(self, collectors, ttl=2.0):
+        self.collectors = collectors
+        self.ttl = ttl
+        self.created = 0
+        self._snapshot = None
+        self._pinned = False
+        self._lock = threading.Lock()
+
+    def get(self):
+        with self._lock:
+            if self._snapshot is None or (not self._pinned and self._snapshot.age() >= self.ttl):
+                self._snapshot = SystemSnapshot(self.collectors)
+                self.created += 1
+            return self._snapshot
+
+    def fresh(self):
+        """Neuen Snapshot erzwingen (Beginn eines Zyklus)"""
+        self.invalidate()
+        return self.get()
+
+    def invalidate(self):
+        with self._lock:
+            if not self._pinned:
+                self._snapshot = None
+
+    def pin(self, snapshot):
+        with self._lock:
+            self._snapshot = snapshot
+            self._pinned = True
+
+
+if __name__ == "__main__":
+    if len(sys.argv) < 2:
+        print("Usage: python3 system_snapshot.py <snapshot.json>  |  save <snapshot.json>")
+        sys.exit(1)
+
+    if sys.argv[1] == 'save' and len(sys.argv) > 2:
+        from proc_sampler import ProcessSampler
+        from net_sockets import read_connections
+        from resource_backend import open_backend
+
+        sampler, backend = ProcessSampler(), open_backend()
+        snapshot = SystemSnapshot({
+            'processes': sampler.sample,
+            'sockets': lambda: tuple(read_connections(protocols=('tcp', 'tcp6'), states={'ESTABLISHED'},
+                                                      resolve_pids=True)),
+            'listening': lambda: tuple(read_connections(protocols=('tcp', 'tcp6'), states={'LISTEN'},
+                                                        resolve_pids=True)),
+            'resources': backend.sample,
+        })
+        print(f"📸 Snapshot gespeichert: {snapshot.save(sys.argv[2])}")
+        sys.exit(0)
+
+    snapshot = SystemSnapshot.load(sys.argv[1])
+    print(f"📸 {sys.argv[1]} - {time.ctime(snapshot.timestamp)}")
+    for name in snapshot.names():
+        value = snapshot.get(name)
+        size = len(value) if hasattr(value, '__len__') else '-'
+        print(f"  {name:<18} {type(value).__name__:<16} {size}")
@@ -0,0 +1,61 @@
+#!/usr/bin/env python3
+"""
+🧪 Tests für file_watcher - gelöschte/neu angelegte Verzeichnisse
+"""
+
+import os
+import sys
+import shutil
+import tempfile
+import unittest
+
+from file_watcher import InotifyWatcher
+
+
+@unittest.skipUnless(sys.platform.startswith('linux'), 'inotify nur unter Linux')
+class InotifyRecreateTest(unittest.TestCase):
+
+    def setUp(self):
+        self.root = tempfile.mkdtemp()
+        self.dir = os.path.join(self.root, 'ssh')
+        self.keys = os.path.join(self.dir, 'authorized_keys')
+        os.mkdir(self.dir)
+        self.write('alt')
+        self.watcher = InotifyWatcher([os.path.join(self.dir, '*'), self.keys], coalesce_window=0.05)
+
+    def tearDown(self):
+        self.watcher.close()
+        shutil.rmtree(self.root, ignore_errors=True)
+
+    def write(self, text):
+        with open(self.keys, 'w') as f:
+            f.write(text)
+
+    def test_recreated_before_events_are_read(self):
+        shutil.rmtree(self.dir)
+        os.mkdir(self.dir)
+        self.write('neu')
+        self.assertIn(self.keys, self.watcher.changes(timeout=1.0))
+        # Watch muss auf dem neuen Verzeichnis liegen
+        self.write('nochmal')
+        self.assertIn(self.keys, self.watcher.changes(timeout=1.0))
+
+    def test_recreated_after_delete_was_seen(self):
+        shutil.rmtree(self.dir)
+        self.assertIn(self.keys, self.watcher.changes(timeout=1.0))
+        os.mkdir(self.dir)
+        self.write('neu')
+        self.assertIn(self.keys, self.watcher.changes(timeout=1.0))
+        self.write('nochmal')
+        self.assertIn(self.keys, self.watcher.changes(timeout=1.0))
+
+    def test_directory_moved_away(self):
+        os.rename(self.dir, os.path.join(self.root, 'alt'))
+        self.assertIn(self.keys, self.watcher.changes(timeout=1.0))
+        os.mkdir(self.dir)
+        self.write('neu')
+        self.assertIn(self.keys, self.watcher.changes(timeout=1.0))
+
+
+if __name__ == '__main__':
+    unittest.main()
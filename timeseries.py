@@ -0,0 +1,228 @@
+#!/usr/bin/env python3
+"""
+📈 TIMESERIES - Eingebetteter Zeitreihen-Speicher für Ressourcen-Metriken
+Ring-Buffer im Speicher für die letzten Roh-Samples, dazu eine Datei aus
+festen Records (per mmap beschrieben) mit drei Auflösungen: 1 s, 1 min, 1 h.
+Jedes Sample aktualisiert alle Stufen (count/sum/min/max pro Bucket), die
+Dateigröße ist durch die Slot-Anzahl fest begrenzt - unabhängig von der Laufzeit.
+"""
+
+import os
+import sys
+import json
+import mmap
+import time
+import math
+import struct
+import threading
+from collections import deque
+
+# (Auflösung in Sekunden, Slots): 1 h in Sekunden, 7 Tage in Minuten, 1 Jahr in Stunden
+DEFAULT_TIERS = ((1, 3600), (60, 7 * 24 * 60), (3600, 365 * 24))
+
+_MAGIC = b'KITSDB1\n'
+_HEADER = struct.Struct('<8sII')  # magic, Länge des JSON-Layouts, reserviert
+_HEADER_SPACE = 4096  # Header + Layout, danach beginnen die Records
+_STAMP = struct.Struct('<q')
+_CELL = struct.Struct('<Iddd')  # count, sum, min, max pro Metrik
+
+
+class TimeSeriesStore:
+    """Metriken fester Namen; add() schreibt in Ring-Buffer und alle Stufen
+
+    Abfragen nutzen die feinste Quelle, die das Zeitfenster abdeckt: erst den
+    Ring-Buffer (exakte Roh-Werte), dann die Stufen der Datei. p95 & Co. über
+    gröbere Stufen werden aus den Bucket-Mittelwerten berechnet.
+    """
+
+    def __init__(self, path, metrics, tiers=DEFAULT_TIERS, ring_size=3600):
+        self.path = str(path)
+        self.metrics = list(metrics)
+        self.tiers = [tuple(t) for t in tiers]
+        self.ring = deque(maxlen=ring_size)
+        self._lock = threading.Lock()
+        self._record = struct.Struct('<q' + 'Iddd' * len(self.metrics))
+        self._layout = {'metrics': self.metrics, 'tiers': self.tiers}
+        self._offsets = []
+        offset = _HEADER_SPACE
+        for _, slots in self.tiers:
+            self._offsets.append(offset)
+            offset += slots * self._record.size
+        self.size = offset
+        self._open()
+
+    def _open(self):
+        directory = os.path.dirname(self.path)
+        if directory:
+            os.makedirs(directory, exist_ok=True)
+        layout = json.dumps(self._layout).encode('utf-8')
+        fd = os.open(self.path, os.O_RDWR | os.O_CREAT, 0o600)
+        try:
+            header = os.pread(fd, _HEADER.size, 0)
+            valid = False
+            if len(header) == _HEADER.size and os.fstat(fd).st_size == self.size:
+                magic, length, _ = _HEADER.unpack(header)
+                valid = magic == _MAGIC and os.pread(fd, length, _HEADER.size) == layout
+            if not valid:
+                # Neue Datei oder anderes Layout (Metriken/Stufen geändert): neu anlegen
+                os.ftruncate(fd, 0)
+                os.ftruncate(fd, self.size)
+                os.pwrite(fd, _HEADER.pack(_MAGIC, len(layout), 0) + layout, 0)
+            self._map = mmap.mmap(fd, self.size)
+        finally:
+            os.close(fd)
+
+    def close(self):
+        with self._lock:
+            if self._map is not None:
+                self._map.flush()
+                self._map.close()
+                self._map = None
+
+    def flush(self):
+        with self._lock:
+            self._map.flush()
+
+    def add(self, values, ts=None):
+        """Sample {metrik: wert} speichern; unbekannte Metriken und None werden ignoriert"""
+        ts = time.time() if ts is None else ts
+        values = {m: float(v) for m, v in values.items() if m in self.metrics and v is not None}
+        if not values:
+            return
+        with self._lock:
+            self.ring.append((ts, values))
+            for (resolution, slots), base in zip(self.tiers, self._offsets):
+                bucket = int(ts // resolution) * resolution
+                offset = base + (bucket // resolution % slots) * self._record.size
+                stamp = _STAMP.unpack_from(self._map, offset)[0]
+                if stamp != bucket:
+                    # Slot gehört zu einem älteren Umlauf: überschreiben
+                    self._record.pack_into(self._map, offset, bucket,
+                                           *([0, 0.0, math.inf, -math.inf] * len(self.metrics)))
+                for index, metric in enumerate(self.metrics):
+                    value = values.get(metric)
+                    if value is None:
+                        continue
+                    cell = offset + _STAMP.size + index * _CELL.size
+                    count, total, low, high = _CELL.unpack_from(self._map, cell)
+                    _CELL.pack_into(self._map, cell, count + 1, total + value, min(low, value), max(high, value))
+
+    def _tier_for(self, start, now):
+        """Feinste Stufe, deren Aufbewahrung bis `start` zurückreicht"""
+        for index, (resolution, slots) in enumerate(self.tiers):
+            if now - start <= resolution * slots:
+                return index
+        return len(self.tiers) - 1
+
+    def _read_tier(self, index, metric, start, end):
+        resolution, slots = self.tiers[index]
+        column = self.metrics.index(metric)
+        base = self._offsets[index]
+        first = int(start // resolution) * resolution
+        last = int(end // resolution) * resolution
+        if (last - first) // resolution >= slots:
+            first = last - (slots - 1) * resolution
+        points = []
+        for bucket in range(first, last + 1, resolution):
+            offset = base + (bucket // resolution % slots) * self._record.size
+            if _STAMP.unpack_from(self._map, offset)[0] != bucket:
+                continue
+            count, total, low, high = _CELL.unpack_from(self._map, offset + _STAMP.size + column * _CELL.size)
+            if count:
+                points.append({'ts': bucket, 'avg': total / count, 'min': low, 'max': high, 'count': count})
+        return points
+
+    def query(self, metric, start, end=None, resolution=None):
+        """Punkte im Zeitraum: [{'ts', 'avg', 'min', 'max', 'count'}], älteste zuerst
+
+        resolution: 0 = Roh-Samples aus dem Ring-Buffer, sonst Sekunden einer
+        Stufe; None wählt automatisch.
+        """
+        if metric not in self.metrics:
+            raise KeyError(f'Unbekannte Metrik: {metric}')
+        now = time.time()
+        end = now if end is None else end
+        with self._lock:
+            if resolution is None and self.ring and self.ring[0][0] <= start:
+                resolution = 0
+            if resolution == 0:
+                return [{'ts': ts, 'avg': v[metric], 'min': v[metric], 'max': v[metric], 'count': 1}
+                        for ts, v in self.ring if start <= ts <= end and metric in v]
+            if resolution is None:
+                index = self._tier_for(start, now)
+            else:
+                index = [r for r, _ in self.tiers].index(resolution)
+            return self._read_tier(index, metric, start, end)
+
+    def aggregate(self, metric, window, end=None, resolution=None):
+        """Kennzahlen über die letzten `window` Sekunden: avg, min, max, count, p50, p95, p99"""
+        end = time.time() if end is None else end
+        points = self.query(metric, end - window, end, resolution)
+        if not points:
+            return None
+        count = sum(p['count'] for p in points)
+        averages = sorted(p['avg'] for p in points)
+        return {
+            'avg': sum(p['avg'] * p['count'] for p in points) / count,
+            'min': min(p['min'] for p in points),
+            'max': max(p['max'] for p in points),
+            'count': count,
+            'p50': percentile(averages, 50),
+            'p95': percentile(averages, 95),
+            'p99': percentile(averages, 99),
+        }
+
+
+def percentile(sorted_values, q):
+    """Nearest-Rank-Perzentil einer sortierten Liste"""
+    if not sorted_values:
+        return None
+    rank = max(1, math.ceil(q / 100 * len(sorted_values)))
+    return sorted_values[rank - 1]
+
+
+def benchmark(samples=200000):
+    import tempfile
+    with tempfile.TemporaryDirectory() as tmp:
+        store = TimeSeriesStore(os.path.join(tmp, 'bench.tsdb'), ['cpu', 'memory', 'load'])
+        now = time.time()
+        start = time.perf_counter()
+        for i in range(samples):
+            store.add({'cpu': i % 100, 'memory': 50.0, 'load': 1.5}, ts=now - samples + i)
+        add_time = time.perf_counter() - start
+        start = time.perf_counter()
+        stats = store.aggregate('cpu', 7 * 86400, end=now)
+        query_time = time.perf_counter() - start
+        print(f"📈 {samples:,} Samples: {samples / add_time:,.0f} add/s, "
+              f"7-Tage-Abfrage in {query_time * 1000:.1f} ms (p95 {stats['p95']:.1f}), "
+              f"Datei {store.size / 1e6:.1f} MB")
+        store.close()
+
+
+if __name__ == "__main__":
+    if len(sys.argv) > 1 and sys.argv[1] == 'bench':
+        benchmark()
+        sys.exit(0)
+    if len(sys.argv) < 2:
+        print("Usage: python3 timeseries.py <datei.tsdb> [--window SEKUNDEN] | bench")
+        sys.exit(1)
+
+    window = 3600
+    if '--window' in sys.argv:
+        window = float(sys.argv[sys.argv.index('--window') + 1])
+    with open(sys.argv[1], 'rb') as f:
+        magic, length, _ = _HEADER.unpack(f.read(_HEADER.size))
+        if magic != _MAGIC:
+            print(f"❌ Keine Zeitreihen-Datei: {sys.argv[1]}")
+            sys.exit(1)
+        layout = json.loads(f.read(length))
+    store = TimeSeriesStore(sys.argv[1], layout['metrics'], layout['tiers'])
+    print(f"📈 {sys.argv[1]} - letzte {window:g}s")
+    for metric in store.metrics:
+        stats = store.aggregate(metric, window)
+        if stats is None:
+            print(f"  {metric:<10} keine Daten")
+            continue
+        print(f"  {metric:<10} avg {stats['avg']:>8.2f}  min {stats['min']:>8.2f}  max {stats['max']:>8.2f}  "
+              f"p95 {stats['p95']:>8.2f}  ({stats['count']} Samples)")
+    store.close()
@@ -9,41 +9,117 @@ import json
 import os
 import re
 import time
-import hashlib
 from datetime import datetime
 from pathlib import Path
-from collections import defaultdict, Counter
-import threading
+from collections import defaultdict, Counter, deque
 import signal
 import sys
 
+from proc_sampler import ProcessSampler
+from proc_diff import ProcessTableDiffer, EXITED
+from keyword_matcher import WatchedKeywordList
+from cpu_sampler import IntervalCpuSampler, CPU_MODE_INTERVAL
+from net_sockets import read_connections, format_endpoint
+from proc_events import open_event_source, EXEC, EXIT
+from file_watcher import open_watcher, critical_paths, expand_paths
+from integrity_engine import IntegrityEngine, iter_files, TOUCHED, MODIFIED, HASH_CHANGED
+from integrity_store import IntegrityStore, build_baseline, print_progress
+from process_terminator import TerminationScheduler, KILLED, FAILED
+from event_log import EventLog, flush_on_signals
+from hash_index import open_index, DigestCache, executable_path, DEFAULT_INDEX_FILE
+from check_overhead import OverheadMeter, format_stats
+from daemon_api import DaemonView
+from system_snapshot import SystemSnapshot, SnapshotCache
+from process_lineage import ProcessLineage, format_match
+from alert_pipeline import AlertPipeline, RESOLVED, format_event, webhook_sink
+
+REPORT_DIR = 'security_reports'
+SNAPSHOT_FILE = 'last_snapshot.json'
+
 class UltimateSecurityTool:
-    def __init__(self):
+    def __init__(self, overrides=None):
         self.config = {
             'cpu_threshold': 50.0,  # CPU-Alarm bei >50%
             'ram_threshold_gb': 1.0,  # RAM-Alarm bei >1GB
             'auto_terminate_cpu': 90.0,  # Auto-Terminate bei >90%
             'auto_terminate_duration': 300,  # 5 Minuten
-            'log_file': 'security_monitor.log',
-            'report_dir': 'security_reports',
+            'cpu_mode': 'lifetime',  # 'interval' = echte CPU% seit letztem Zyklus
+            'log_file': 'security_monitor.log',  # JSON-Lines, ein Event pro Zeile
+            'log_max_bytes': 10 * 1024 * 1024,  # Rotation ab 10 MB ...
+            'log_rotate_interval': 86400,  # ... oder nach 24h (Sekunden)
+            'log_backups': 5,  # Anzahl rotierter .gz-Dateien
+            'report_dir': REPORT_DIR,
             'whitelist_file': 'process_whitelist.json',
             'blacklist_file': 'process_blacklist.json',
             'firewall_rules_file': 'firewall_rules.json',
-            'file_integrity_db': 'file_integrity.db.json'
+            'file_integrity_db': 'file_integrity.db.json',  # Legacy-JSON (Import/Export)
+            'file_integrity_store': 'file_integrity.sqlite',
+            'integrity_paths': [],  # Zusätzliche Dateien/Muster (z.B. '/etc/ssh/*')
+            'integrity_dirs': [],  # Ganze Verzeichnisse rekursiv (z.B. '/usr/bin', '~/.ssh')
+            'integrity_algorithm': 'sha256',  # 'sha256' oder 'blake2b'
+            'integrity_full_interval': 300,  # Sekunden zwischen stat-Vollprüfungen
+            'terminate_grace_period': 2.0,  # Sekunden zwischen SIGTERM und SIGKILL
+            'known_bad_index': DEFAULT_INDEX_FILE,  # Index bekannter Schad-Hashes (hash_index.py)
+            'cpu_budget_percent': 10.0,  # Eigenverbrauch (% eines Kerns), darüber Budget-Modus
+            'stats_file': 'monitor_stats.json',  # Overhead pro Check (check_overhead.py)
+            'snapshot_ttl': 2.0,  # Sekunden, die ein Erfassungs-Snapshot für Checks + Report gilt
+            'snapshot_file': SNAPSHOT_FILE,  # Letzter Scan (Report ohne Live-System: 'report')
+            'alert_window': 300,  # Sekunden ohne Wiederholung, bis ein Vorfall als erledigt gilt
+            'alert_reminder_interval': 3600,  # Erinnerung an weiterhin aktive Vorfälle
+            'alert_history': 1000,  # Ring-Buffer der letzten Events
+            'slack_webhook': os.environ.get('SLACK_WEBHOOK_URL'),  # Optional: Übergänge nach Slack
+            'lineage_rules': None  # Herkunfts-Regeln (None = Standard aus process_lineage.py)
         }
+        self.config.update(overrides or {})  # z.B. Replay: Log/Store/Config in ein Temp-Verzeichnis
         
         self.running = True
         self.monitoring = False
-        self.process_history = defaultdict(list)
+        self.process_history = ProcessTableDiffer()
+        self.lineage = ProcessLineage(self.config['lineage_rules'])  # Prozessbaum aus den Diff-Events
+        self.high_cpu_since = {}  # (pid, start_time) -> Zeitpunkt
         self.network_connections = []
         self.blocked_ips = set()
-        self.blocked_processes = set()
+        self.blocked_processes = set()  # (pid, start_time)
+        self.event_keys = {}  # pid -> (pid, start_time) aus exec-Events
+        self.event_source = None
+        self.file_watcher = None
         self.file_hashes = {}
-        self.alerts = []
+        self.alerts = deque(maxlen=self.config['alert_history'])
+        sinks = [self.handle_alert_events]
+        if self.config['slack_webhook']:
+            sinks.append(webhook_sink(self.config['slack_webhook']))
+        self.alert_pipeline = AlertPipeline(window=self.config['alert_window'],
+                                            reminder_interval=self.config['alert_reminder_interval'],
+                                            history=self.config['alert_history'], sinks=sinks)
+        self.meter = OverheadMeter()
+        self.view = None  # DaemonView im Scan-Modus: Daten vom laufenden KI-Sicherheitsmann
+        self.snapshots = SnapshotCache({
+            'processes': lambda: (self.view or self.sampler).sample(),
+            'sockets': lambda: tuple((self.view.connections if self.view is not None else read_connections)(
+                protocols=('tcp', 'tcp6'), states={'ESTABLISHED'}, resolve_pids=True))
+        }, ttl=self.config['snapshot_ttl'])
+        self.last_snapshot = None  # Snapshot des letzten Zyklus inkl. Check-Ergebnisse
+        self.integrity = IntegrityEngine(self.config['integrity_algorithm'])
+        self.hash_index = open_index(self.config['known_bad_index'])
+        self.exe_digests = DigestCache()  # SHA-256 pro Binärdatei, einmal je (dev, inode, size, mtime)
+        self.sampler = ProcessSampler()
+        self.cpu_sampler = IntervalCpuSampler()
+        self.event_log = EventLog(self.config['log_file'],
+                                  max_bytes=self.config['log_max_bytes'],
+                                  max_age=self.config['log_rotate_interval'],
+                                  backups=self.config['log_backups'])
         
         # Lade Konfiguration
         self.load_config()
         
+        # Beendigungen laufen asynchron (TERM -> Frist -> KILL), der Monitor blockiert nicht
+        self.terminator = TerminationScheduler(self.config['terminate_grace_period'],
+                                               audit=self.audit_termination)
+        
+        # Blacklist-Matcher wird nur bei Änderung von process_blacklist.json neu kompiliert
+        self.blacklist_source = WatchedKeywordList(self.config['blacklist_file'], fallback=self.blacklist)
+        self.blacklist_matcher = None  # zuletzt angewandter Matcher (neu gebaut -> Vollprüfung)
+        
     def load_config(self):
         """Lade Konfiguration und Whitelists"""
         # Whitelist (erlaubte Prozesse)
@@ -85,12 +161,13 @@ class UltimateSecurityTool:
             }
             self.save_firewall_rules()
         
-        # File Integrity Database
-        if os.path.exists(self.config['file_integrity_db']):
-            with open(self.config['file_integrity_db'], 'r') as f:
-                self.file_hashes = json.load(f)
-        else:
-            self.init_file_integrity()
+        # File Integrity Database (SQLite; bestehendes JSON wird einmalig importiert)
+        self.file_hashes = IntegrityStore(self.config['file_integrity_store'])
+        if not len(self.file_hashes):
+            if os.path.exists(self.config['file_integrity_db']):
+                self.file_hashes.import_json(self.config['file_integrity_db'])
+            else:
+                self.init_file_integrity()
     
     def save_whitelist(self):
         """Speichere Whitelist"""
@@ -108,37 +185,19 @@ class UltimateSecurityTool:
             json.dump(self.firewall_rules, f, indent=2)
     
     def save_file_integrity(self):
-        """Speichere File Integrity Database"""
-        with open(self.config['file_integrity_db'], 'w') as f:
-            json.dump(self.file_hashes, f, indent=2)
+        """Speichere File Integrity Database (offene Änderungen in einem Commit)"""
+        self.file_hashes.commit()
     
     def init_file_integrity(self):
-        """Initialisiere File Integrity Monitoring"""
-        critical_files = [
-            '/etc/hosts',
-            '/etc/passwd',
-            '/etc/sudoers',
-            os.path.expanduser('~/.ssh/authorized_keys'),
-            os.path.expanduser('~/.bashrc'),
-            os.path.expanduser('~/.zshrc'),
-            os.path.expanduser('~/.ssh/config')
-        ]
-        
-        for file_path in critical_files:
-            expanded = os.path.expanduser(file_path)
-            if os.path.exists(expanded):
-                try:
-                    with open(expanded, 'rb') as f:
-                        content = f.read()
-                        file_hash = hashlib.sha256(content).hexdigest()
-                        self.file_hashes[file_path] = {
-                            'hash': file_hash,
-                            'mtime': os.path.getmtime(expanded),
-                            'size': os.path.getsize(expanded)
-                        }
-                except:
-                    pass
-        
+        """Initialisiere File Integrity Monitoring (parallel gehasht)"""
+        files = expand_paths(critical_paths(self.config['integrity_paths']))
+        files.extend(iter_files(self.config['integrity_dirs']))
+        
+        build_baseline(
+            self.file_hashes, files,
+            algorithm=self.config['integrity_algorithm'],
+            progress=print_progress if len(files) > 1000 else None
+        )
         self.save_file_integrity()
     
     def run_command(self, cmd, timeout=10):
@@ -158,7 +217,30 @@ class UltimateSecurityTool:
             return "", str(e), -1
     
     def log_event(self, level, message, data=None):
-        """Protokolliere Event"""
+        """Protokolliere Event; WARNING/CRITICAL laufen durch die Alert-Pipeline
+        (Wiederholungen desselben Vorfalls im Fenster werden unterdrückt). Es sind
+        Einmal-Events ohne Check-Zuordnung: sie werden nie als erledigt gemeldet."""
+        if level in ('WARNING', 'CRITICAL'):
+            self.alert_pipeline.process([{
+                'type': message.split(':')[0],
+                'severity': level,
+                'subject': re.sub(r'\s*\(\d+\)$', '', message),  # Zähler am Ende gehören nicht zum Betreff
+                'message': message,
+                'data': data
+            }])
+            return
+        self.record_event(level, message, data)
+    
+    def handle_alert_events(self, events):
+        """Sink der Alert-Pipeline: nur Übergänge werden protokolliert"""
+        for event in events:
+            level = 'INFO' if event['state'] == RESOLVED else event['severity']
+            data = dict(event['data'] or {}, state=event['state'], count=event['count'],
+                        fingerprint=event['fingerprint'])
+            self.record_event(level, format_event(event), data)
+    
+    def record_event(self, level, message, data=None):
+        """Event in Ring-Buffer, Log und Konsole schreiben"""
         timestamp = datetime.now().isoformat()
         event = {
             'timestamp': timestamp,
@@ -169,13 +251,8 @@ class UltimateSecurityTool:
         
         self.alerts.append(event)
         
-        # Log to file
-        log_entry = f"[{timestamp}] [{level}] {message}\n"
-        if data:
-            log_entry += f"  Data: {json.dumps(data, indent=2)}\n"
-        
-        with open(self.config['log_file'], 'a') as f:
-            f.write(log_entry)
+        # Log to file (gepuffert, eine JSON-Zeile pro Event)
+        self.event_log.write(level, message, data)
         
         # Console output
         if level == 'CRITICAL':
@@ -185,170 +262,242 @@ class UltimateSecurityTool:
         elif level == 'INFO':
             print(f"ℹ️  [{timestamp}] {message}")
     
-    def check_processes(self):
-        """Überwache alle Prozesse"""
-        stdout, _, _ = self.run_command("ps aux")
+    def check_processes(self, cycle=None):
+        """Überwache Prozesse (Regeln laufen nur auf dem Delta seit dem letzten Zyklus)"""
+        snapshot = (cycle or self.snapshots.get())['processes']
+        if self.config['cpu_mode'] == CPU_MODE_INTERVAL:
+            snapshot = self.cpu_sampler.update(snapshot)
+        events = self.process_history.update(snapshot)
+        blacklist = self.blacklist_source.matcher()
         
         suspicious = []
         high_cpu = []
         
-        for line in stdout.split('\n')[1:]:
-            if not line.strip():
-                continue
+        # Blacklist geändert: einmal alle laufenden Prozesse prüfen, nicht nur das Delta
+        if self.blacklist_matcher is not None and blacklist is not self.blacklist_matcher:
+            delta = {event.key for event in events}
+            for proc in snapshot:
+                key = (proc.pid, proc.start_time)
+                if key not in delta:
+                    self.check_blacklist(proc, key, blacklist, suspicious)
+        self.blacklist_matcher = blacklist
+        
+        for event in events:
+            key = event.key
             
-            parts = line.split()
-            if len(parts) < 11:
+            # Beendete Prozesse aus dem Zustand entfernen (PID kann wiederverwendet werden)
+            if event.kind == EXITED:
+                self.blocked_processes.discard(key)
+                self.high_cpu_since.pop(key, None)
                 continue
             
-            try:
-                pid = parts[1]
-                cpu = float(parts[2])
-                mem = float(parts[3])
-                mem_mb = float(parts[5]) / 1024  # KB to MB
-                cmd = ' '.join(parts[10:])
-                cmd_lower = cmd.lower()
-                
-                # Blacklist-Check
-                if any(blocked in cmd_lower for blocked in self.blacklist):
-                    if pid not in self.blocked_processes:
-                        self.log_event('CRITICAL', f'Blacklisted process detected: {cmd}', {
-                            'pid': pid,
-                            'cpu': cpu,
-                            'mem': mem_mb
-                        })
-                        self.terminate_process(pid, 'Blacklisted process')
-                        self.blocked_processes.add(pid)
-                        suspicious.append({
-                            'pid': pid,
-                            'cmd': cmd,
-                            'reason': 'Blacklisted',
-                            'severity': 'CRITICAL'
-                        })
-                
-                # CPU-Check
-                if cpu > self.config['auto_terminate_cpu']:
-                    high_cpu.append({
+            proc = event.proc
+            pid = str(proc.pid)
+            cpu = proc.cpu
+            mem_mb = proc.rss_kb / 1024  # KB to MB
+            cmd = proc.cmd
+            
+            # Blacklist-Check (ein Durchlauf, alle Treffer)
+            self.check_blacklist(proc, key, blacklist, suspicious)
+            
+            # CPU-Check: merke, seit wann der Prozess über der Schwelle liegt
+            if cpu > self.config['auto_terminate_cpu']:
+                self.high_cpu_since.setdefault(key, snapshot.timestamp)
+            
+            # RAM-Check
+            if mem_mb > (self.config['ram_threshold_gb'] * 1024):
+                if cpu > 10:  # Nur bei aktiver CPU
+                    self.log_event('WARNING', f'High RAM usage: {cmd}', {
+                        'pid': pid,
+                        'ram_mb': mem_mb,
+                        'cpu': cpu
+                    })
+            
+            # Verdächtige Pfade
+            if cmd.startswith('/') and not any(allowed in cmd for allowed in [
+                '/System', '/Library', '/usr', '/opt/homebrew',
+                '/Applications', '/Users', '/private', '/var'
+            ]):
+                if cpu > 20:
+                    self.log_event('WARNING', f'Suspicious path: {cmd}', {
+                        'pid': pid,
+                        'cpu': cpu
+                    })
+                    suspicious.append({
                         'pid': pid,
-                        'cpu': cpu,
                         'cmd': cmd,
-                        'duration': self.get_process_duration(pid)
+                        'reason': 'Suspicious path',
+                        'severity': 'MEDIUM'
                     })
-                    
-                    # Auto-Terminate bei >90% CPU für >5 Minuten
-                    if pid in self.process_history:
-                        duration = time.time() - self.process_history[pid][0]
-                        if duration > self.config['auto_terminate_duration']:
-                            self.log_event('CRITICAL', f'Auto-terminating high CPU process: {cmd}', {
-                                'pid': pid,
-                                'cpu': cpu,
-                                'duration': duration
-                            })
-                            self.terminate_process(pid, 'High CPU for extended period')
-                            suspicious.append({
-                                'pid': pid,
-                                'cmd': cmd,
-                                'reason': f'High CPU ({cpu}%) for {duration}s',
-                                'severity': 'CRITICAL'
-                            })
-                
-                # RAM-Check
-                if mem_mb > (self.config['ram_threshold_gb'] * 1024):
-                    if cpu > 10:  # Nur bei aktiver CPU
-                        self.log_event('WARNING', f'High RAM usage: {cmd}', {
-                            'pid': pid,
-                            'ram_mb': mem_mb,
-                            'cpu': cpu
-                        })
-                
-                # Verdächtige Pfade
-                if cmd.startswith('/') and not any(allowed in cmd for allowed in [
-                    '/System', '/Library', '/usr', '/opt/homebrew',
-                    '/Applications', '/Users', '/private', '/var'
-                ]):
-                    if cpu > 20:
-                        self.log_event('WARNING', f'Suspicious path: {cmd}', {
-                            'pid': pid,
-                            'cpu': cpu
-                        })
-                        suspicious.append({
-                            'pid': pid,
-                            'cmd': cmd,
-                            'reason': 'Suspicious path',
-                            'severity': 'MEDIUM'
-                        })
-                
-                # Track process history
-                if pid not in self.process_history:
-                    self.process_history[pid] = [time.time(), cmd]
-                
-            except (ValueError, IndexError):
+        
+        # Herkunft: Index übernimmt dieselben Events, Treffer werden über die Alert-Pipeline dedupliziert
+        for match in self.lineage.apply(events):
+            self.report_lineage(match)
+            suspicious.append({
+                'pid': str(match.proc.pid),
+                'cmd': match.proc.cmd,
+                'reason': f'Lineage: {match.rule.name}',
+                'severity': 'CRITICAL' if match.rule.severity == 'ALERT' else 'MEDIUM'
+            })
+        
+        # High-CPU-Prozesse: kleine Menge, wird jeden Zyklus mit aktuellen Werten geprüft
+        for key, since in list(self.high_cpu_since.items()):
+            proc = snapshot.get(key[0])
+            if proc is None or proc.start_time != key[1] or proc.cpu <= self.config['auto_terminate_cpu']:
+                del self.high_cpu_since[key]
                 continue
+            
+            pid = str(proc.pid)
+            duration = snapshot.timestamp - since
+            high_cpu.append({
+                'pid': pid,
+                'cpu': proc.cpu,
+                'cmd': proc.cmd,
+                'duration': self.get_process_duration(key)
+            })
+            
+            # Auto-Terminate bei >90% CPU für >5 Minuten
+            if duration > self.config['auto_terminate_duration'] and key not in self.blocked_processes:
+                self.log_event('CRITICAL', f'Auto-terminating high CPU process: {proc.cmd}', {
+                    'pid': pid,
+                    'cpu': proc.cpu,
+                    'duration': duration
+                })
+                self.terminate_process(pid, 'High CPU for extended period', key[1])
+                self.blocked_processes.add(key)
+                suspicious.append({
+                    'pid': pid,
+                    'cmd': proc.cmd,
+                    'reason': f'High CPU ({proc.cpu}%) for {duration}s',
+                    'severity': 'CRITICAL'
+                })
         
         return suspicious, high_cpu
     
-    def get_process_duration(self, pid):
-        """Ermittle Prozess-Dauer"""
-        if pid in self.process_history:
-            return time.time() - self.process_history[pid][0]
-        return 0
+    def get_process_duration(self, key):
+        """Ermittle Prozess-Dauer seit erster Sichtung ((pid, start_time)-Schlüssel)"""
+        return self.process_history.age(key)
+    
+    def handle_process_event(self, event):
+        """Blacklist-Regel direkt beim exec auswerten (erwischt auch kurzlebige Prozesse)"""
+        if event.kind == EXIT:
+            self.blocked_processes.discard(self.event_keys.pop(event.pid, None))
+            return
+        if event.kind != EXEC or not event.cmd:
+            return
+        
+        key = (event.pid, event.start_time)
+        if self.hash_index is not None and key not in self.blocked_processes:
+            exe = executable_path(event.pid, event.cmd)
+            digest = self.exe_digests.digest(exe) if exe else None
+            if digest and digest in self.hash_index:
+                self.log_event('CRITICAL', f'Known malware executed: {event.cmd}', {
+                    'pid': str(event.pid),
+                    'ppid': event.ppid,
+                    'sha256': digest
+                })
+                self.terminate_process(str(event.pid), 'Known malware hash', event.start_time)
+                self.blocked_processes.add(key)
+                self.event_keys[event.pid] = key
+                return
+        
+        # Herkunft sofort beim exec prüfen (kurzlebige Shells sieht kein Zyklus)
+        for match in self.lineage.check(event.pid, event.ppid, event.cmd):
+            self.report_lineage(match)
+        
+        hits = self.blacklist_source.matcher().find_all(event.cmd)
+        if hits and key not in self.blocked_processes:
+            self.log_event('CRITICAL', f'Blacklisted process detected: {event.cmd}', {
+                'pid': str(event.pid),
+                'ppid': event.ppid,
+                'keywords': hits,
+                'source': self.event_source.name if self.event_source else 'event'
+            })
+            self.terminate_process(str(event.pid), 'Blacklisted process', event.start_time)
+            self.blocked_processes.add(key)
+            self.event_keys[event.pid] = key
+    
+    def report_lineage(self, match):
+        """Treffer einer Herkunfts-Regel melden (gleiche Meldung aus Zyklus und exec-Event)"""
+        self.log_event('CRITICAL' if match.rule.severity == 'ALERT' else 'WARNING', format_match(match), {
+            'pid': str(match.proc.pid),
+            'rule': match.rule.name,
+            'ancestor_pid': match.ancestor.pid,
+            'depth': match.depth
+        })
     
-    def terminate_process(self, pid, reason):
-        """Beende Prozess sicher"""
+    def terminate_process(self, pid, reason, start_time=None):
+        """Beende Prozess sicher (SIGTERM sofort, SIGKILL nach Frist - nicht blockierend)"""
         try:
-            # Erst SIGTERM (sanft)
-            self.run_command(f"kill -TERM {pid}")
-            time.sleep(2)
-            
-            # Prüfe ob noch läuft
-            stdout, _, _ = self.run_command(f"ps -p {pid}")
-            if pid in stdout:
-                # Dann SIGKILL (hart)
-                self.run_command(f"kill -9 {pid}")
-                self.log_event('INFO', f'Force-killed process {pid}: {reason}')
-            else:
-                self.log_event('INFO', f'Terminated process {pid}: {reason}')
+            self.terminator.request(pid, reason, start_time)
         except Exception as e:
             self.log_event('WARNING', f'Failed to terminate process {pid}: {e}')
     
-    def check_network(self):
+    def audit_termination(self, record):
+        """Abgeschlossene Beendigung mit Zeitstempeln protokollieren"""
+        data = dict(record)
+        for field in ('requested_at', 'term_at', 'kill_at', 'confirmed_at'):
+            if data[field] is not None:
+                data[field] = datetime.fromtimestamp(data[field]).isoformat()
+        pid, reason = record['pid'], record['reason']
+        if record['outcome'] == FAILED:
+            self.log_event('WARNING', f'Failed to terminate process {pid}: {record["error"]}', data)
+        elif record['outcome'] == KILLED:
+            self.log_event('INFO', f'Force-killed process {pid}: {reason}', data)
+        else:
+            self.log_event('INFO', f'Terminated process {pid}: {reason}', data)
+    
+    def check_blacklist(self, proc, key, blacklist, suspicious):
+        """Blacklist auf einen Prozess anwenden; Treffer werden beendet und in `suspicious` gemeldet"""
+        hits = blacklist.find_all(proc.cmd)
+        if not hits or key in self.blocked_processes:
+            return
+        pid = str(proc.pid)
+        self.log_event('CRITICAL', f'Blacklisted process detected: {proc.cmd}', {
+            'pid': pid,
+            'cpu': proc.cpu,
+            'mem': proc.rss_kb / 1024,
+            'keywords': hits
+        })
+        self.terminate_process(pid, 'Blacklisted process', key[1])
+        self.blocked_processes.add(key)
+        suspicious.append({
+            'pid': pid,
+            'cmd': proc.cmd,
+            'reason': 'Blacklisted',
+            'severity': 'CRITICAL'
+        })
+    
+    def check_network(self, cycle=None):
         """Überwache Netzwerk-Verbindungen"""
-        stdout, _, _ = self.run_command("netstat -an | grep ESTABLISHED")
-        
         connections = []
         suspicious_ips = []
+        allowed_ports = set(self.firewall_rules['allowed_ports'])
         
-        for line in stdout.split('\n'):
-            if 'ESTABLISHED' in line:
-                parts = line.split()
-                if len(parts) >= 4:
-                    try:
-                        local = parts[3]
-                        remote = parts[4]
-                        
-                        if remote and remote != '0.0.0.0':
-                            ip = remote.split(':')[0]
-                            port = remote.split(':')[1] if ':' in remote else None
-                            
-                            connections.append({
-                                'local': local,
-                                'remote': remote,
-                                'ip': ip,
-                                'port': port
-                            })
-                            
-                            # Prüfe auf blockierte IPs
-                            if ip in self.blocked_ips:
-                                self.log_event('WARNING', f'Blocked IP attempting connection: {ip}')
-                                # Blockiere Verbindung
-                                self.block_connection(ip)
-                            
-                            # Prüfe auf verdächtige Ports
-                            if port and int(port) not in self.firewall_rules['allowed_ports']:
-                                if int(port) > 1024:  # Nicht-System-Ports
-                                    self.log_event('WARNING', f'Suspicious port: {port} from {ip}')
-                                    suspicious_ips.append(ip)
-                    except:
-                        pass
+        for conn in (cycle or self.snapshots.get())['sockets']:
+            ip = conn.remote_ip
+            port = conn.remote_port
+            if ip in ('0.0.0.0', '::'):
+                continue
+            
+            connections.append({
+                'local': format_endpoint(conn.local_ip, conn.local_port),
+                'remote': format_endpoint(ip, port),
+                'ip': ip,
+                'port': port,
+                'pid': conn.pid
+            })
+            
+            # Prüfe auf blockierte IPs
+            if ip in self.blocked_ips:
+                self.log_event('WARNING', f'Blocked IP attempting connection: {ip}')
+                # Blockiere Verbindung
+                self.block_connection(ip)
+            
+            # Prüfe auf verdächtige Ports
+            if port not in allowed_ports and port > 1024:  # Nicht-System-Ports
+                self.log_event('WARNING', f'Suspicious port: {port} from {ip}', {'pid': conn.pid})
+                suspicious_ips.append(ip)
         
         # Zähle Verbindungen pro IP
         ip_counts = Counter(conn['ip'] for conn in connections)
@@ -369,42 +518,68 @@ class UltimateSecurityTool:
         except:
             pass
     
-    def check_file_integrity(self):
-        """Prüfe Datei-Integrität"""
+    def check_file_integrity(self, paths=None):
+        """Prüfe Datei-Integrität (paths: nur diese Dateien, z.B. vom File-Watcher gemeldet)"""
         changes = []
         
-        for file_path, stored_info in self.file_hashes.items():
+        if paths is None:
+            targets = self.file_hashes.items()
+        else:
+            targets = [(path, self.file_hashes.get(path)) for path in sorted(paths)]
+        
+        for file_path, stored_info in targets:
             expanded = os.path.expanduser(file_path)
-            if os.path.exists(expanded):
+            if not os.path.exists(expanded):
+                if stored_info is not None:
+                    self.log_event('WARNING', f'Monitored file removed: {file_path}')
+                    changes.append({
+                        'file': file_path,
+                        'type': 'REMOVED',
+                        'severity': 'WARNING'
+                    })
+                    del self.file_hashes[file_path]
+            elif stored_info is None:
+                # Neue Datei in überwachtem Pfad (z.B. ~/.ssh/authorized_keys angelegt)
                 try:
-                    with open(expanded, 'rb') as f:
-                        content = f.read()
-                        current_hash = hashlib.sha256(content).hexdigest()
-                        current_mtime = os.path.getmtime(expanded)
-                        current_size = os.path.getsize(expanded)
+                    entry = self.integrity.baseline_entry(expanded)
+                    self.file_hashes[file_path] = entry
+                    self.log_event('WARNING', f'New file in monitored path: {file_path}')
+                    changes.append({
+                        'file': file_path,
+                        'type': 'CREATED',
+                        'severity': 'WARNING'
+                    })
+                    changes.extend(self.check_known_bad(file_path, entry))
+                except Exception as e:
+                    self.log_event('WARNING', f'Failed to check file {file_path}: {e}')
+            else:
+                try:
+                    # Hash nur bei geändertem (dev, inode, size, mtime_ns, ctime_ns)
+                    status, current = self.integrity.compare(expanded, stored_info)
                     
                     # Hash geändert = KRITISCH
-                    if current_hash != stored_info['hash']:
+                    if status == HASH_CHANGED:
                         self.log_event('CRITICAL', f'File integrity violation: {file_path}', {
                             'old_hash': stored_info['hash'][:16],
-                            'new_hash': current_hash[:16],
+                            'new_hash': current['hash'][:16],
                             'old_size': stored_info['size'],
-                            'new_size': current_size
+                            'new_size': current['size']
                         })
                         changes.append({
                             'file': file_path,
                             'type': 'HASH_CHANGED',
                             'severity': 'CRITICAL'
                         })
+                        changes.extend(self.check_known_bad(file_path, current))
                         
                         # Automatische Wiederherstellung (wenn Backup vorhanden)
                         self.restore_file(file_path)
                     
                     # Mtime geändert = WARNUNG
-                    elif current_mtime != stored_info['mtime']:
+                    elif status == MODIFIED:
                         self.log_event('WARNING', f'File modified: {file_path}', {
                             'old_mtime': stored_info['mtime'],
-                            'new_mtime': current_mtime
+                            'new_mtime': current['mtime']
                         })
                         changes.append({
                             'file': file_path,
@@ -413,18 +588,32 @@ class UltimateSecurityTool:
                         })
                         
                         # Update hash
-                        self.file_hashes[file_path] = {
-                            'hash': current_hash,
-                            'mtime': current_mtime,
-                            'size': current_size
-                        }
-                        self.save_file_integrity()
+                        self.file_hashes[file_path] = current
+                    
+                    # Nur Metadaten (Inode/ctime) anders, Inhalt gleich: stat-Cache nachziehen
+                    elif status == TOUCHED:
+                        self.file_hashes[file_path] = current
                 
                 except Exception as e:
                     self.log_event('WARNING', f'Failed to check file {file_path}: {e}')
         
+        # Alle Baseline-Updates dieses Durchlaufs in einem Commit
+        self.save_file_integrity()
         return changes
     
+    def check_known_bad(self, file_path, entry):
+        """Neu berechneten Hash gegen den Index bekannter Schad-Hashes prüfen (nur SHA-256)"""
+        if self.hash_index is None or entry.get('algorithm', 'sha256') != 'sha256':
+            return []
+        if entry['hash'] not in self.hash_index:
+            return []
+        self.log_event('CRITICAL', f'Known malware hash: {file_path}', {'sha256': entry['hash']})
+        return [{
+            'file': file_path,
+            'type': 'KNOWN_MALWARE',
+            'severity': 'CRITICAL'
+        }]
+    
     def restore_file(self, file_path):
         """Stelle Datei wieder her (wenn Backup vorhanden)"""
         # TODO: Implementiere Backup-Wiederherstellung
@@ -444,69 +633,29 @@ class UltimateSecurityTool:
         
         self.log_event('INFO', 'Firewall configured')
     
-    def generate_report(self):
-        """Generiere Security-Report"""
-        timestamp = datetime.now().strftime("%Y%m%d_%H%M%S")
-        report_file = f"{self.config['report_dir']}/security_report_{timestamp}.md"
-        
-        os.makedirs(self.config['report_dir'], exist_ok=True)
-        
-        # Sammle Daten
-        suspicious_procs, high_cpu = self.check_processes()
-        connections, suspicious_ips = self.check_network()
-        file_changes = self.check_file_integrity()
-        
-        # Erstelle Report
-        report = f"""# 🛡️ SECURITY REPORT
-
-**Zeitpunkt:** {datetime.now().isoformat()}
-**Status:** {'🔴 KRITISCH' if suspicious_procs or file_changes else '✅ SICHER'}
-
-## 📊 Übersicht
-
-- **Verdächtige Prozesse:** {len(suspicious_procs)}
-- **High CPU Prozesse:** {len(high_cpu)}
-- **Aktive Verbindungen:** {len(connections)}
-- **Verdächtige IPs:** {len(suspicious_ips)}
-- **Datei-Änderungen:** {len(file_changes)}
-- **Alerts:** {len(self.alerts)}
-
-## 🔴 Verdächtige Prozesse
-
-"""
-        
-        for proc in suspicious_procs:
-            report += f"- **PID {proc['pid']}:** {proc['cmd'][:100]}\n"
-            report += f"  - Grund: {proc['reason']}\n"
-            report += f"  - Schweregrad: {proc['severity']}\n\n"
-        
-        if not suspicious_procs:
-            report += "✅ Keine verdächtigen Prozesse\n\n"
-        
-        report += "## 🌐 Netzwerk\n\n"
-        report += f"- **Aktive Verbindungen:** {len(connections)}\n"
-        report += f"- **Verdächtige IPs:** {len(suspicious_ips)}\n\n"
-        
-        if suspicious_ips:
-            for ip in set(suspicious_ips):
-                report += f"- ⚠️  {ip}\n"
-        
-        report += "\n## 🔒 Datei-Integrität\n\n"
-        
-        for change in file_changes:
-            report += f"- **{change['file']}:** {change['type']} ({change['severity']})\n"
-        
-        if not file_changes:
-            report += "✅ Keine Änderungen\n\n"
-        
-        report += "\n## 📋 Alerts\n\n"
-        for alert in self.alerts[-20:]:  # Letzte 20
-            report += f"- [{alert['level']}] {alert['message']}\n"
-        
-        # Speichere Report
-        with open(report_file, 'w') as f:
-            f.write(report)
-        
+    def run_checks(self, cycle):
+        """Fehlende Check-Ergebnisse im Snapshot ergänzen (jeder Check höchstens einmal pro Snapshot)"""
+        if 'suspicious_procs' not in cycle:
+            suspicious_procs, high_cpu = self.check_processes(cycle)
+            cycle.put('suspicious_procs', suspicious_procs)
+            cycle.put('high_cpu', high_cpu)
+        if 'connections' not in cycle:
+            connections, suspicious_ips = self.check_network(cycle)
+            cycle.put('connections', connections)
+            cycle.put('suspicious_ips', suspicious_ips)
+        if 'file_changes' not in cycle:
+            cycle.put('file_changes', self.check_file_integrity())
+        self.last_snapshot = cycle
+        return cycle
+    
+    def generate_report(self, cycle=None):
+        """Generiere Security-Report aus dem Snapshot des letzten Zyklus (nur Fehlendes wird nachgeholt)"""
+        cycle = self.run_checks(cycle or self.last_snapshot or self.snapshots.fresh())
+        cycle.put('alerts', list(self.alerts)[-20:])
+        if self.meter.checks:
+            cycle.put('overhead', format_stats(self.meter.stats()))
+        
+        report_file = write_report(cycle, self.config['report_dir'])
         self.log_event('INFO', f'Report generated: {report_file}')
         return report_file
     
@@ -516,18 +665,62 @@ class UltimateSecurityTool:
         self.setup_firewall()
         
         self.monitoring = True
+        self.event_source = open_event_source(self.sampler)
+        self.log_event('INFO', f'Process event source: {self.event_source.name}')
+        self.file_watcher = open_watcher(
+            critical_paths(self.config['integrity_paths']) + list(self.file_hashes) +
+            [os.path.join(os.path.expanduser(d), '*') for d in self.config['integrity_dirs']]
+        )
+        last_full_check = time.monotonic()
+        self.log_event('INFO', f'File watcher: {self.file_watcher.name}')
         
         try:
             while self.running:
-                # Prozesse prüfen
-                suspicious_procs, high_cpu = self.check_processes()
+                # Neu gebauten Hash-Index übernehmen (stat, remap nur bei Änderung)
+                if self.hash_index is not None:
+                    self.hash_index.refresh()
+                
+                # Budget-Modus: eigener CPU-Verbrauch über dem Limit
+                over_budget = self.meter.usage_percent() > self.config['cpu_budget_percent']
+                
+                # Ein Snapshot pro Zyklus; Checks und Report lesen daraus
+                cycle = self.snapshots.fresh()
+                
+                # Prozesse prüfen (immer)
+                with self.meter.measure('processes'):
+                    suspicious_procs, high_cpu = self.check_processes(cycle)
+                cycle.put('suspicious_procs', suspicious_procs)
+                cycle.put('high_cpu', high_cpu)
                 
-                # Netzwerk prüfen
-                connections, suspicious_ips = self.check_network()
+                # Netzwerk prüfen (im Budget-Modus übersprungen)
+                if over_budget:
+                    self.meter.note('network', 'skipped')
+                    connections, suspicious_ips = [], []
+                else:
+                    with self.meter.measure('network'):
+                        connections, suspicious_ips = self.check_network(cycle)
+                # Leere Ergebnisse statt fehlender: der Report holt den Check nicht nach
+                cycle.put('connections', connections)
+                cycle.put('suspicious_ips', suspicious_ips)
                 
-                # Datei-Integrität prüfen (alle 60 Sekunden)
-                if int(time.time()) % 60 == 0:
-                    file_changes = self.check_file_integrity()
+                # Datei-Integrität: nur vom Watcher gemeldete Dateien neu hashen
+                file_changes = []
+                changed_files = self.file_watcher.changes()
+                if changed_files:
+                    with self.meter.measure('integrity_changes'):
+                        file_changes = self.check_file_integrity(changed_files)
+                
+                # Regelmäßige Vollprüfung (stat-gesteuert, hasht nur Abweichungen),
+                # im Budget-Modus um ein weiteres Intervall verschoben
+                if time.monotonic() - last_full_check >= self.config['integrity_full_interval']:
+                    if over_budget:
+                        self.meter.note('integrity_full', 'degraded')
+                    else:
+                        with self.meter.measure('integrity_full'):
+                            file_changes += self.check_file_integrity()
+                    last_full_check = time.monotonic()
+                cycle.put('file_changes', file_changes)
+                self.last_snapshot = cycle
                 
                 # Alerts ausgeben
                 if suspicious_procs:
@@ -535,22 +728,41 @@ class UltimateSecurityTool:
                         if proc['severity'] == 'CRITICAL':
                             print(f"🔴 KRITISCH: {proc['cmd'][:80]}")
                 
-                time.sleep(interval)
+                # Bis zum nächsten Voll-Scan: exec/exit-Events sofort auswerten statt schlafen,
+                # laufende Beendigungen zu ihren Deadlines eskalieren
+                deadline = time.monotonic() + interval
+                while time.monotonic() < deadline:
+                    until = min(deadline, self.terminator.next_deadline() or deadline)
+                    with self.meter.measure('events'):  # Wall-Zeit enthält das Warten auf Events
+                        for event in self.event_source.events(until):
+                            self.handle_process_event(event)
+                        self.terminator.poll()
+                
+                self.alert_pipeline.expire()  # Einmal-Events nach dem Fenster vergessen
+                self.meter.write(self.config['stats_file'])
         
         except KeyboardInterrupt:
             self.log_event('INFO', 'Monitoring stopped by user')
         finally:
             self.monitoring = False
+            self.event_source.close()
+            self.file_watcher.close()
+            self.terminator.wait()
+            self.terminator.close()
             self.generate_report()
             self.log_event('INFO', 'Monitoring stopped')
     
     def run_scan(self):
         """Führe einmaligen Security-Scan durch"""
         self.log_event('INFO', 'Running security scan...')
+        self.view = DaemonView(self.sampler)
         
-        suspicious_procs, high_cpu = self.check_processes()
-        connections, suspicious_ips = self.check_network()
-        file_changes = self.check_file_integrity()
+        cycle = self.run_checks(self.snapshots.fresh())
+        self.log_event('INFO', f'Process data source: {self.view.source}')
+        suspicious_procs, high_cpu = cycle['suspicious_procs'], cycle['high_cpu']
+        connections, suspicious_ips = cycle['connections'], cycle['suspicious_ips']
+        file_changes = cycle['file_changes']
+        self.terminator.wait()
         
         print("\n" + "="*80)
         print("🛡️  ULTIMATE SECURITY SCAN")
@@ -573,10 +785,82 @@ class UltimateSecurityTool:
             for change in file_changes:
                 print(f"  {change['file']}: {change['type']}")
         
-        report_file = self.generate_report()
+        report_file = self.generate_report(cycle)
+        cycle.save(self.config['snapshot_file'])
         print(f"\n💾 Report gespeichert: {report_file}")
+        print(f"📸 Snapshot gespeichert: {self.config['snapshot_file']}")
         print("="*80 + "\n")
 
+def render_report(cycle):
+    """Markdown-Report nur aus den Ergebnissen eines Snapshots (kein Zugriff auf das Live-System)"""
+    suspicious_procs = cycle.get('suspicious_procs') or []
+    high_cpu = cycle.get('high_cpu') or []
+    connections = cycle.get('connections') or []
+    suspicious_ips = cycle.get('suspicious_ips') or []
+    file_changes = cycle.get('file_changes') or []
+    alerts = cycle.get('alerts') or []
+    
+    report = f"""# 🛡️ SECURITY REPORT
+
+**Zeitpunkt:** {datetime.fromtimestamp(cycle.timestamp).isoformat()}
+**Status:** {'🔴 KRITISCH' if suspicious_procs or file_changes else '✅ SICHER'}
+
+## 📊 Übersicht
+
+- **Verdächtige Prozesse:** {len(suspicious_procs)}
+- **High CPU Prozesse:** {len(high_cpu)}
+- **Aktive Verbindungen:** {len(connections)}
+- **Verdächtige IPs:** {len(suspicious_ips)}
+- **Datei-Änderungen:** {len(file_changes)}
+- **Alerts:** {len(alerts)}
+
+## 🔴 Verdächtige Prozesse
+
+"""
+    
+    for proc in suspicious_procs:
+        report += f"- **PID {proc['pid']}:** {proc['cmd'][:100]}\n"
+        report += f"  - Grund: {proc['reason']}\n"
+        report += f"  - Schweregrad: {proc['severity']}\n\n"
+    
+    if not suspicious_procs:
+        report += "✅ Keine verdächtigen Prozesse\n\n"
+    
+    report += "## 🌐 Netzwerk\n\n"
+    report += f"- **Aktive Verbindungen:** {len(connections)}\n"
+    report += f"- **Verdächtige IPs:** {len(suspicious_ips)}\n\n"
+    
+    if suspicious_ips:
+        for ip in set(suspicious_ips):
+            report += f"- ⚠️  {ip}\n"
+    
+    report += "\n## 🔒 Datei-Integrität\n\n"
+    
+    for change in file_changes:
+        report += f"- **{change['file']}:** {change['type']} ({change['severity']})\n"
+    
+    if not file_changes:
+        report += "✅ Keine Änderungen\n\n"
+    
+    report += "\n## 📋 Alerts\n\n"
+    for alert in alerts:
+        report += f"- [{alert['level']}] {alert['message']}\n"
+    
+    if cycle.get('overhead'):
+        report += "\n## 📏 Eigener Overhead\n\n```\n"
+        report += cycle.get('overhead') + "\n```\n"
+    
+    return report
+
+def write_report(cycle, report_dir=REPORT_DIR):
+    """Report eines Snapshots als security_report_<Zeitstempel>.md speichern"""
+    timestamp = datetime.fromtimestamp(cycle.timestamp).strftime("%Y%m%d_%H%M%S")
+    report_file = f"{report_dir}/security_report_{timestamp}.md"
+    os.makedirs(report_dir, exist_ok=True)
+    with open(report_file, 'w') as f:
+        f.write(render_report(cycle))
+    return report_file
+
 def signal_handler(sig, frame):
     """Handle SIGINT (Ctrl+C)"""
     print("\n\n🛑 Stoppe Security Monitor...")
@@ -584,6 +868,13 @@ def signal_handler(sig, frame):
 
 if __name__ == "__main__":
     signal.signal(signal.SIGINT, signal_handler)
+    flush_on_signals()
+    
+    # Report aus gespeichertem Snapshot: ohne Tool-Initialisierung, ohne Live-System
+    if len(sys.argv) > 1 and sys.argv[1] == 'report':
+        snapshot_file = sys.argv[2] if len(sys.argv) > 2 else SNAPSHOT_FILE
+        print(f"💾 Report gespeichert: {write_report(SystemSnapshot.load(snapshot_file))}")
+        sys.exit(0)
     
     tool = UltimateSecurityTool()
     
@@ -593,7 +884,7 @@ if __name__ == "__main__":
         elif sys.argv[1] == 'monitor':
             tool.monitor_loop()
         else:
-            print("Usage: python3 ultimate_security_tool.py [scan|monitor]")
+            print("Usage: python3 ultimate_security_tool.py [scan|monitor|report [snapshot.json]]")
     else:
         # Default: Scan
         tool.run_scan()